@@ -2,7 +2,35 @@
 Create and test a fraction class via user inputs.
 A fraction is defined by its numerator and its denominator.
 """
+import fractions
+import functools
+import itertools
 import math
+import operator
+import os
+import re
+import sys
+import time
+from collections import Counter, OrderedDict, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from decimal import Decimal
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_HASH_MODULUS = sys.hash_info.modulus
+_HASH_INF = sys.hash_info.inf
+_INT64_MAX = 2 ** 63 - 1
+_REDUCE_BITS = 1024
+
+_intern_cache = None
+_instrumentation = None
+_max_denominator = None
+# Looked up at each call, so that the instrumentation can count the gcd invocations
+_gcd = math.gcd
 
 
 class Fraction:
@@ -13,28 +41,86 @@ class Fraction:
     This class allows fraction manipulations through several operations.
     """
 
-    def __init__(self, numerator: int = 0, denominator: int = 1):
+    __slots__ = ('__numerator', '__denominator')
+
+    def __new__(cls, numerator: int = 0, denominator: int = 1):
         """This builds a fraction based on some numerator and denominator.
 
+        When interning is enabled, a shared instance is returned for the values already seen,
+        the terms being checked first so that the interning never changes the outcome.
+
         PRE : - numerator: an int
               - denominator: a non-null int
         POST : set the following attributes :
                - numerator : the reduced numerator of the fraction
                - denominator : the reduced denominator of the fraction
         RAISES : - ZeroDivisionError: denominator is null
+                 - TypeError: numerator or denominator is not an integer
         """
+        if type(numerator) is not int or type(denominator) is not int:
+            # As math.gcd does: the integer-like terms are converted, the others are refused
+            numerator, denominator = operator.index(numerator), operator.index(denominator)
         if denominator == 0:
             raise ZeroDivisionError("The denominator of a fraction can't be null.")
 
-        abs_numerator = abs(numerator)
-        if numerator / denominator < 0:
-            numerator = -abs_numerator
-        else:
-            numerator = abs_numerator
+        cache = _intern_cache if cls is Fraction else None
+        if cache is not None:
+            fraction = cache.get(numerator, denominator)
+            if fraction is not None:
+                return fraction
+
+        key = (numerator, denominator)
+        if denominator < 0:
+            numerator, denominator = -numerator, -denominator
+
+        gcd = _gcd(numerator, denominator)
+        fraction = object.__new__(cls)
+        fraction.__numerator = numerator // gcd
+        fraction.__denominator = denominator // gcd
+
+        if cache is not None:
+            cache.store(key, fraction)
+        return fraction
+
+    @classmethod
+    def _from_reduced(cls, numerator: int, denominator: int):
+        """Build a fraction from a numerator and a denominator already in reduced form
+
+        This internal constructor skips the sign normalization and the gcd reduction of the constructor.
+
+        PRE : - numerator: an int
+              - denominator: a positive int, coprime with the numerator
+        POST : a fraction with exactly this numerator and this denominator
+        """
+        cache = _intern_cache if cls is Fraction else None
+        if cache is not None:
+            fraction = cache.get(numerator, denominator)
+            if fraction is not None:
+                return fraction
+
+        fraction = object.__new__(cls)
+        fraction.__numerator = numerator
+        fraction.__denominator = denominator
+
+        if cache is not None:
+            cache.store((numerator, denominator), fraction)
+        return fraction
+
+    @staticmethod
+    def _from_result(numerator: int, denominator: int):
+        """Build the result of an operator from its reduced terms
+
+        Every operator builds its result with it: in a bounded_denominator context,
+        the result is replaced by its closest fraction with a bounded denominator.
+        The values that are only rebuilt, as by unpickling or decoding, keep their exact terms.
 
-        gcd = math.gcd(numerator, denominator)
-        self.__numerator = numerator // gcd
-        self.__denominator = abs(denominator) // gcd
+        PRE : - numerator: an int
+              - denominator: a positive int, coprime with the numerator
+        POST : the fraction numerator/denominator, or its closest fraction in a bounded_denominator context
+        """
+        if _max_denominator is not None and denominator > _max_denominator:
+            numerator, denominator = _closest_terms(numerator, denominator, _max_denominator)
+        return Fraction._from_reduced(numerator, denominator)
 
     @property
     def numerator(self) -> int:
@@ -57,20 +143,274 @@ class Fraction:
     # ------------------ Static methods ------------------
 
     @staticmethod
-    def __set_fraction_param(other):
-        """Verify if another value is an integer or a fraction and transform it in a fraction
+    def __operand_terms(other):
+        """Return the reduced terms of another operand, without building a temporary fraction
 
-         PRE : - other: an integer or a fraction
-         POST : the fractionated other value
-         RAISES : - ValueError: other is nor an integer or a fraction
-         """
+        Floats and decimals are converted exactly with their integer ratio.
+
+        PRE : - other: an integer, a fraction, a float, a fractions.Fraction or a decimal.Decimal
+        POST : the (numerator, denominator) tuple of the reduced value of other,
+               or None if other is not supported
+        RAISES : - ValueError: other is an infinite or a nan float or decimal
+        """
+        if isinstance(other, Fraction):
+            return other.__numerator, other.__denominator
         if isinstance(other, int):
-            other = Fraction(other)
+            return other, 1
+        if isinstance(other, fractions.Fraction):
+            return other.numerator, other.denominator
+        if isinstance(other, (float, Decimal)):
+            try:
+                return other.as_integer_ratio()
+            except (OverflowError, ValueError):
+                raise ValueError(f'{other} has no fraction value.') from None
+        return None
 
-        if not isinstance(other, Fraction):
-            raise ValueError()
+    @staticmethod
+    def __sum_terms(numerator1: int, denominator1: int, numerator2: int, denominator2: int):
+        """Sum two reduced fractions given by their terms, keeping the intermediate integers small
+
+        The gcd is taken on the denominators before multiplying them, so that the products
+        stay close to the size of the reduced result.
+
+        PRE : - numerator1, numerator2: ints
+              - denominator1, denominator2: positive ints, coprime with their numerator
+        POST : the reduced fraction numerator1/denominator1 + numerator2/denominator2
+        """
+        gcd = _gcd(denominator1, denominator2)
+        if gcd == 1:
+            return Fraction._from_result(numerator1 * denominator2 + numerator2 * denominator1,
+                                         denominator1 * denominator2)
+
+        quotient1 = denominator1 // gcd
+        numerator = numerator1 * (denominator2 // gcd) + numerator2 * quotient1
+        # Only a divisor of gcd can still be shared by the numerator and the denominator
+        gcd2 = _gcd(numerator, gcd)
+        if gcd2 == 1:
+            return Fraction._from_result(numerator, quotient1 * denominator2)
+        return Fraction._from_result(numerator // gcd2, quotient1 * (denominator2 // gcd2))
+
+    @staticmethod
+    def __product_terms(numerator1: int, denominator1: int, numerator2: int, denominator2: int):
+        """Multiply two reduced fractions given by their terms, cancelling before multiplying
+
+        PRE : - numerator1, numerator2: ints
+              - denominator1, denominator2: non-null ints, coprime with their numerator
+        POST : the reduced fraction numerator1/denominator1 * numerator2/denominator2
+        RAISES : - ZeroDivisionError: the product of the denominators is null
+        """
+        if denominator1 == 0 or denominator2 == 0:
+            raise ZeroDivisionError("The denominator of a fraction can't be null.")
+
+        gcd1 = _gcd(numerator1, denominator2)
+        if gcd1 > 1:
+            numerator1 //= gcd1
+            denominator2 //= gcd1
+        gcd2 = _gcd(numerator2, denominator1)
+        if gcd2 > 1:
+            numerator2 //= gcd2
+            denominator1 //= gcd2
+
+        numerator = numerator1 * numerator2
+        denominator = denominator1 * denominator2
+        if denominator < 0:
+            numerator, denominator = -numerator, -denominator
+        return Fraction._from_result(numerator, denominator)
+
+    # ------------------ Interning ------------------
+
+    @staticmethod
+    def enable_interning(max_size: int = 1024, small_limit: int = 32):
+        """Enable the sharing of the instances of common fractions
+
+        Fractions are immutable, so that the constructor can return a shared instance instead of
+        building a new one. The fractions with small terms come from a preallocated table,
+        the other ones from a cache evicting the least recently used fractions.
+
+        PRE : - max_size: a positive int, the maximum number of fractions kept by the cache
+              - small_limit: a positive int, the greatest absolute value of the terms in the table
+        POST : the constructor returns shared instances until disable_interning is called
+        """
+        global _intern_cache
+        _intern_cache = _InternCache(max_size, small_limit)
+
+    @staticmethod
+    def disable_interning():
+        """Disable the sharing of the instances of common fractions
+
+        PRE : -
+        POST : the constructor builds a new instance for each fraction, the cache is released
+        """
+        global _intern_cache
+        _intern_cache = None
+
+    @staticmethod
+    def clear_interning():
+        """Empty the cache of the shared fractions and reset its statistics
+
+        PRE : -
+        POST : the cache only holds the preallocated table, hits and misses are 0
+        """
+        if _intern_cache is not None:
+            _intern_cache.clear()
+
+    @staticmethod
+    def interning_stats() -> dict:
+        """Return the statistics of the sharing of the instances of fractions
+
+        PRE : -
+        POST : a dict with the number of hits, of misses, the size of the table and of the cache,
+               and the maximum size of the cache; an empty dict if interning is disabled
+        """
+        if _intern_cache is None:
+            return {}
+        return _intern_cache.stats()
+
+    # ------------------ Instrumentation ------------------
+
+    @staticmethod
+    def enable_stats():
+        """Enable the instrumentation of the operations on fractions
+
+        The operators of the class are replaced by wrappers counting the constructions,
+        the gcd invocations, the calls, the cumulative time and the bit lengths of the results.
+        The original operators are restored by disable_stats, so that the disabled
+        instrumentation costs nothing.
+
+        PRE : -
+        POST : the operations are instrumented, the previous statistics are kept if already enabled
+        """
+        global _instrumentation, _gcd
+        if _instrumentation is None:
+            _instrumentation = _Instrumentation()
+            _gcd = _instrumentation.counting_gcd
+
+    @staticmethod
+    def disable_stats():
+        """Disable the instrumentation of the operations on fractions
 
-        return other
+        PRE : -
+        POST : the original operators are restored, the statistics stay available
+        """
+        global _instrumentation, _gcd
+        if _instrumentation is not None:
+            _instrumentation.restore()
+            _instrumentation = None
+            _gcd = math.gcd
+
+    @staticmethod
+    @contextmanager
+    def instrumented():
+        """Return a context manager instrumenting the operations on fractions within its block
+
+        PRE : -
+        POST : the operations are instrumented in the block, and restored after it
+               unless the instrumentation was already enabled before
+        """
+        enabled = _instrumentation is not None
+        Fraction.enable_stats()
+        try:
+            yield
+        finally:
+            if not enabled:
+                Fraction.disable_stats()
+
+    @staticmethod
+    def stats() -> dict:
+        """Return a snapshot of the statistics of the instrumentation
+
+        PRE : -
+        POST : a dict of plain dicts with the following items :
+               - constructions : the number of built fractions by operator or by call site
+               - gcd_calls : the number of gcd invocations by operator or by call site
+               - calls : the number of calls by operator
+               - seconds : the cumulative time by operator, including the nested operators
+               - numerator_bits, denominator_bits : by operator, the number of results
+                 by power of 2 bounding the bit length of their terms
+        """
+        return _Instrumentation.snapshot()
+
+    @staticmethod
+    def reset_stats():
+        """Reset the statistics of the instrumentation
+
+        PRE : -
+        POST : all the counters are empty
+        """
+        _Instrumentation.reset()
+
+    # ------------------ Reductions ------------------
+
+    @staticmethod
+    def __reduce_terms(iterable, combine, empty: tuple):
+        """Reduce an iterable of fractions with deferred normalization and a balanced tree
+
+        The terms are accumulated without gcd until the accumulator exceeds _REDUCE_BITS bits.
+        Such accumulators are then merged two by two with the accumulators of same level,
+        like the digits of a binary counter, so that the merged operands have similar sizes.
+
+        PRE : - iterable: an iterable of integers, fractions, floats, fractions.Fraction or decimal.Decimal,
+                      consumed lazily
+              - combine: a function combining two (numerator, denominator) pairs without reduction
+              - empty: the (numerator, denominator) pair of the neutral element
+        POST : the reduced fraction combining all the terms
+        RAISES : - ValueError: a term is not a supported number, or is infinite or nan
+        """
+        def reduced(terms):
+            gcd = _gcd(*terms)
+            return terms[0] // gcd, terms[1] // gcd
+
+        stack = []
+        accumulator = empty
+        for term in iterable:
+            terms = Fraction.__operand_terms(term)
+            if terms is None:
+                raise ValueError()
+            accumulator = combine(accumulator, terms)
+
+            if accumulator[1].bit_length() > _REDUCE_BITS or accumulator[0].bit_length() > _REDUCE_BITS:
+                accumulator = reduced(accumulator)
+                if accumulator[1].bit_length() > _REDUCE_BITS:
+                    level = 0
+                    while stack and stack[-1][0] == level:
+                        accumulator = reduced(combine(stack.pop()[1], accumulator))
+                        level += 1
+                    stack.append((level, accumulator))
+                    accumulator = empty
+
+        while stack:
+            accumulator = combine(stack.pop()[1], accumulator)
+        return Fraction._from_result(*reduced(accumulator))
+
+    @staticmethod
+    def sum(iterable):
+        """Return the exact sum of fractions
+
+        PRE : - iterable: an iterable of integers, fractions, floats, fractions.Fraction or decimal.Decimal,
+                      consumed lazily
+        POST : the reduced sum of the terms, Fraction() for no term
+        RAISES : - ValueError: a term is not a supported number, or is infinite or nan
+        """
+        def combine(first, second):
+            if first[1] == second[1]:
+                return first[0] + second[0], first[1]
+            return first[0] * second[1] + second[0] * first[1], first[1] * second[1]
+
+        return Fraction.__reduce_terms(iterable, combine, (0, 1))
+
+    @staticmethod
+    def prod(iterable):
+        """Return the exact product of fractions
+
+        PRE : - iterable: an iterable of integers, fractions, floats, fractions.Fraction or decimal.Decimal,
+                      consumed lazily
+        POST : the reduced product of the terms, Fraction(1) for no term
+        RAISES : - ValueError: a term is not a supported number, or is infinite or nan
+        """
+        def combine(first, second):
+            return first[0] * second[0], first[1] * second[1]
+
+        return Fraction.__reduce_terms(iterable, combine, (1, 1))
 
     # ------------------ Textual representations ------------------
 
@@ -100,70 +440,210 @@ class Fraction:
         POST : the fraction as a mixed number; the sum of the integer part and the fraction part
         """
         int_part = self.numerator // self.denominator
-        fraction_part = Fraction(self.numerator % self.denominator, self.denominator)
+        fraction_part = Fraction._from_reduced(self.numerator % self.denominator, self.denominator)
         return f'{int_part} + {fraction_part}'
 
+    @staticmethod
+    def from_string(text: str):
+        """Build a fraction from one of its textual representations
+
+        PRE : - text: a fraction as given by str, repr or as_mixed_number (EX: '-5/2', '<Fraction: -5/2>',
+                '-3 + 1/2'), an integer or a decimal literal (EX: '-2.5', '25e-1')
+        POST : the fraction represented by text
+        RAISES : - ValueError: text does not represent a fraction
+        """
+        numerator, denominator = _parse_terms(text)
+        if denominator == 0:
+            raise ValueError("The denominator of a fraction can't be null.")
+        return Fraction(numerator, denominator)
+
+    # ------------------ Binary representations ------------------
+
+    def to_bytes(self) -> bytes:
+        """Return the compact binary representation of the fraction
+
+        PRE : -
+        POST : the zigzag varint of the numerator followed by the varint of the denominator
+        """
+        buffer = bytearray()
+        _write_varint(buffer, _zigzag(self.__numerator))
+        _write_varint(buffer, self.__denominator)
+        return bytes(buffer)
+
+    @staticmethod
+    def from_bytes(data):
+        """Build a fraction from its compact binary representation
+
+        PRE : - data: a bytes-like object, as given by to_bytes
+        POST : the fraction represented by data
+        RAISES : - ValueError: data is truncated, has trailing bytes or terms that are not reduced
+        """
+        view = memoryview(data)
+        numerator, position = _read_varint(view, 0)
+        denominator, position = _read_varint(view, position)
+        if position != len(view):
+            raise ValueError('Trailing bytes after the fraction.')
+        return _from_terms(_unzigzag(numerator), denominator)
+
+    def __reduce__(self):
+        """Return the data needed to pickle the fraction
+
+        PRE : -
+        POST : a function rebuilding the fraction without reduction and its reduced terms
+        """
+        return _restore, (self.__numerator, self.__denominator)
+
     # ------------------ Operators overloading ------------------
 
     def __add__(self, other):
         """Overloading of the + operator for fractions
 
-         PRE : - other: an integer or a fraction
-         POST : a fraction that sums the current fraction and the other fraction
-         RAISES : - ValueError: other is nor an integer or a fraction
-         """
-        other = self.__set_fraction_param(other)
+        PRE : - other: an integer, a fraction, a float, a fractions.Fraction or a decimal.Decimal
+        POST : a fraction that sums the current fraction and the other value
+        RAISES : - TypeError: other is not a supported number
+                 - ValueError: other is an infinite or a nan float or decimal
+        """
+        if isinstance(other, int):
+            # Adding a multiple of the denominator keeps the numerator coprime with it
+            return Fraction._from_result(self.__numerator + other * self.__denominator, self.__denominator)
+
+        terms = self.__operand_terms(other)
+        if terms is None:
+            return NotImplemented
+        return self.__sum_terms(self.__numerator, self.__denominator, *terms)
 
-        numerator = self.numerator * other.denominator + other.numerator * self.denominator
-        denominator = self.denominator * other.denominator
-        return Fraction(numerator, denominator)
+    def __radd__(self, other):
+        """Overloading of the reflected + operator for fractions
+
+        PRE : - other: an integer, a float, a fractions.Fraction or a decimal.Decimal
+        POST : a fraction that sums the other value and the current fraction
+        RAISES : - TypeError: other is not a supported number
+                 - ValueError: other is an infinite or a nan float or decimal
+        """
+        return self.__add__(other)
 
     def __sub__(self, other):
         """Overloading of the - operator for fractions
 
-        PRE : - other: an integer or a fraction
-        POST : a fraction that subtracts the current fraction and the other fraction
-        RAISES : - ValueError: other is nor an integer or a fraction
+        PRE : - other: an integer, a fraction, a float, a fractions.Fraction or a decimal.Decimal
+        POST : a fraction that subtracts the other value from the current fraction
+        RAISES : - TypeError: other is not a supported number
+                 - ValueError: other is an infinite or a nan float or decimal
         """
-        other = self.__set_fraction_param(other)
+        if isinstance(other, int):
+            return Fraction._from_result(self.__numerator - other * self.__denominator, self.__denominator)
 
-        numerator = self.numerator * other.denominator - other.numerator * self.denominator
-        denominator = self.denominator * other.denominator
-        return Fraction(numerator, denominator)
+        terms = self.__operand_terms(other)
+        if terms is None:
+            return NotImplemented
+        return self.__sum_terms(self.__numerator, self.__denominator, -terms[0], terms[1])
+
+    def __rsub__(self, other):
+        """Overloading of the reflected - operator for fractions
+
+        PRE : - other: an integer, a float, a fractions.Fraction or a decimal.Decimal
+        POST : a fraction that subtracts the current fraction from the other value
+        RAISES : - TypeError: other is not a supported number
+                 - ValueError: other is an infinite or a nan float or decimal
+        """
+        if isinstance(other, int):
+            return Fraction._from_result(other * self.__denominator - self.__numerator, self.__denominator)
+
+        terms = self.__operand_terms(other)
+        if terms is None:
+            return NotImplemented
+        return self.__sum_terms(*terms, -self.__numerator, self.__denominator)
 
     def __mul__(self, other):
         """Overloading of the * operator for fractions
 
-        PRE : - other: an integer or a fraction
-        POST : a fraction that multiplies the current fraction and the other fraction
-        RAISES : - ValueError: other is nor an integer or a fraction
+        PRE : - other: an integer, a fraction, a float, a fractions.Fraction or a decimal.Decimal
+        POST : a fraction that multiplies the current fraction and the other value
+        RAISES : - TypeError: other is not a supported number
+                 - ValueError: other is an infinite or a nan float or decimal
         """
-        other = self.__set_fraction_param(other)
-
-        numerator = self.numerator * other.numerator
-        denominator = self.denominator * other.denominator
-        return Fraction(numerator, denominator)
+        terms = self.__operand_terms(other)
+        if terms is None:
+            return NotImplemented
+        return self.__product_terms(self.__numerator, self.__denominator, *terms)
+
+    def __rmul__(self, other):
+        """Overloading of the reflected * operator for fractions
+
+        PRE : - other: an integer, a float, a fractions.Fraction or a decimal.Decimal
+        POST : a fraction that multiplies the other value and the current fraction
+        RAISES : - TypeError: other is not a supported number
+                 - ValueError: other is an infinite or a nan float or decimal
+        """
+        return self.__mul__(other)
 
     def __truediv__(self, other):
         """Overloading of the / operator for fractions
 
-        PRE : - other: an integer or a fraction
-        POST : a fraction that truly divides the current fraction and the other fraction
-        RAISES : - ValueError: other is nor an integer or a fraction
+        PRE : - other: an integer, a fraction, a float, a fractions.Fraction or a decimal.Decimal
+        POST : a fraction that truly divides the current fraction by the other value
+        RAISES : - TypeError: other is not a supported number
+                 - ValueError: other is an infinite or a nan float or decimal
+                 - ZeroDivisionError: other is null
         """
-        other = self.__set_fraction_param(other)
-
-        numerator = self.numerator * other.denominator
-        denominator = self.denominator * other.numerator
-        return Fraction(numerator, denominator)
-
-    def __pow__(self, other: int):
-        """Overloading of the ** operator for fractions
-
-        PRE : - other: an integer
-        POST : - the current fraction powered by another integer
+        terms = self.__operand_terms(other)
+        if terms is None:
+            return NotImplemented
+        return self.__product_terms(self.__numerator, self.__denominator, terms[1], terms[0])
+
+    def __rtruediv__(self, other):
+        """Overloading of the reflected / operator for fractions
+
+        PRE : - other: an integer, a float, a fractions.Fraction or a decimal.Decimal
+        POST : a fraction that truly divides the other value by the current fraction
+        RAISES : - TypeError: other is not a supported number
+                 - ValueError: other is an infinite or a nan float or decimal
+                 - ZeroDivisionError: the current fraction is null
         """
+        terms = self.__operand_terms(other)
+        if terms is None:
+            return NotImplemented
+        return self.__product_terms(*terms, self.__denominator, self.__numerator)
+
+    # Fractions are immutable: the in-place operators build a new fraction
+    __iadd__ = __add__
+    __isub__ = __sub__
+    __imul__ = __mul__
+    __itruediv__ = __truediv__
+
+    def __pow__(self, other, modulo: int = None):
+        """Overloading of the ** operator and of the pow function for fractions
+
+        With a fraction exponent p/q, the q-th roots of the numerator and of the denominator
+        are computed exactly before powering them by p.
+        With a modulo m, the result is the integer n * d**-1 powered modulo m,
+        where d**-1 is the modular inverse of the denominator.
+
+        PRE : - other: an integer, or a fraction if modulo is None
+              - modulo: a non-null integer, or None
+        POST : - the current fraction powered by the other value,
+                 or an integer in [0, |modulo|[ if modulo is given,
+                 or NotImplemented if other is not a supported exponent
+        RAISES : - ValueError: the root is not rational,
+                               or the powered value is not invertible modulo modulo
+                 - ZeroDivisionError: the current fraction is null and other is negative
+        """
+        if modulo is not None:
+            if not isinstance(other, int):
+                return NotImplemented
+            return pow(self.numerator, other, modulo) * pow(self.denominator, -other, modulo) % modulo
+
+        if isinstance(other, Fraction):
+            if other.is_integer():
+                other = other.numerator
+            else:
+                return self.__root(other.denominator) ** other.numerator
+        elif not isinstance(other, int):
+            return NotImplemented
+
         if other != 0 and self.is_zero():
+            if other < 0:
+                raise ZeroDivisionError("The denominator of a fraction can't be null.")
             return Fraction()
 
         numerator = self.numerator
@@ -172,10 +652,46 @@ class Fraction:
         if other < 0:
             numerator, denominator = denominator, numerator
             other *= -1
+            if denominator < 0:
+                numerator, denominator = -numerator, -denominator
 
+        # Powers of coprime integers stay coprime: no reduction is needed
         numerator **= other
         denominator **= other
-        return Fraction(numerator, denominator)
+        return Fraction._from_result(numerator, denominator)
+
+    def __rpow__(self, other):
+        """Overloading of the reflected ** operator for fractions
+
+        PRE : - other: an integer, a float, a fractions.Fraction or a decimal.Decimal
+        POST : the other value powered by the current fraction
+        RAISES : - TypeError: other is not a supported number
+                 - ValueError: the root is not rational
+        """
+        terms = self.__operand_terms(other)
+        if terms is None:
+            return NotImplemented
+        return Fraction._from_reduced(*terms) ** self
+
+    def __root(self, degree: int):
+        """Return the exact root of the fraction
+
+        PRE : - degree: a positive int
+        POST : the fraction whose power by degree is the current fraction
+        RAISES : - ValueError: the root of the fraction is not rational
+        """
+        if self.numerator < 0 and degree % 2 == 0:
+            raise ValueError(f'The root of degree {degree} of {self} is not real.')
+
+        numerator = _integer_root(abs(self.numerator), degree)
+        denominator = _integer_root(self.denominator, degree)
+        if numerator ** degree != abs(self.numerator) or denominator ** degree != self.denominator:
+            raise ValueError(f'The root of degree {degree} of {self} is not rational.')
+
+        # Roots of coprime integers stay coprime: no reduction is needed
+        if self.numerator < 0:
+            numerator = -numerator
+        return Fraction._from_reduced(numerator, denominator)
 
     def __float__(self) -> float:
         """Returns the decimal value of the fraction
@@ -185,53 +701,196 @@ class Fraction:
         """
         return self.numerator / self.denominator
 
+    def __bool__(self) -> bool:
+        """Return the truth value of the fraction
+
+        PRE : -
+        POST : False if the fraction is null, True otherwise
+        """
+        return self.__numerator != 0
+
+    def __int__(self) -> int:
+        """Return the integer part of the fraction
+
+        PRE : -
+        POST : the fraction truncated towards zero
+        """
+        return self.__trunc__()
+
+    def __trunc__(self) -> int:
+        """Overloading of the math.trunc function for fractions
+
+        PRE : -
+        POST : the fraction rounded towards zero
+        """
+        if self.__numerator < 0:
+            return -(-self.__numerator // self.__denominator)
+        return self.__numerator // self.__denominator
+
+    def __floor__(self) -> int:
+        """Overloading of the math.floor function for fractions
+
+        PRE : -
+        POST : the greatest integer lower or equal to the fraction
+        """
+        return self.__numerator // self.__denominator
+
+    def __ceil__(self) -> int:
+        """Overloading of the math.ceil function for fractions
+
+        PRE : -
+        POST : the least integer greater or equal to the fraction
+        """
+        return -(-self.__numerator // self.__denominator)
+
+    def __round__(self, ndigits: int = None):
+        """Overloading of the round function for fractions
+
+        The halves are rounded to the even neighbour, as for the ints and the floats.
+
+        PRE : - ndigits: an int, or None
+        POST : the int closest to the fraction if ndigits is None, otherwise the fraction
+               closest to the fraction with ndigits decimal digits, or a multiple of 10**-ndigits
+        """
+        if ndigits is None:
+            floor, remainder = divmod(self.__numerator, self.__denominator)
+            if remainder * 2 < self.__denominator or remainder * 2 == self.__denominator and floor % 2 == 0:
+                return floor
+            return floor + 1
+        shift = 10 ** abs(ndigits)
+        if ndigits > 0:
+            return Fraction(round(self * shift), shift)
+        return Fraction(round(self / shift) * shift)
+
     def __abs__(self):
         """Returns the absolute value of the fraction
 
         PRE : -
         POST : the absolute value of the fraction
         """
-        return Fraction(abs(self.numerator), self.denominator)
+        return Fraction._from_result(abs(self.numerator), self.denominator)
+
+    def __neg__(self):
+        """Overloading of the unary - operator for fractions
+
+        PRE : -
+        POST : the opposite of the fraction
+        """
+        return Fraction._from_result(-self.numerator, self.denominator)
+
+    def __pos__(self):
+        """Overloading of the unary + operator for fractions
+
+        PRE : -
+        POST : the fraction itself, as fractions are immutable
+        """
+        return self
+
+    def __hash__(self) -> int:
+        """Return the hash of the fraction
+
+        The hash is consistent with the hash of the integers and of the floats of same value,
+        so that equal values share the same dict key or set member.
+
+        PRE : -
+        POST : the hash value of the fraction
+        """
+        try:
+            inverse = pow(self.__denominator, -1, _HASH_MODULUS)
+        except ValueError:
+            # The denominator is a multiple of the modulus and has no inverse
+            hash_value = _HASH_INF
+        else:
+            hash_value = hash(hash(abs(self.__numerator)) * inverse)
+        result = hash_value if self.__numerator >= 0 else -hash_value
+        return -2 if result == -1 else result
+
+    def __cross_terms(self, other):
+        """Return two values whose comparison matches the comparison of the fraction and another value
+
+        The comparison is done exactly with integer cross-multiplication, without float conversion.
+
+        PRE : - other: an integer, a fraction, a float, a fractions.Fraction or a decimal.Decimal
+        POST : a (left, right) tuple of numbers to compare, or None if other is not supported
+        """
+        if isinstance(other, Fraction):
+            if self.__denominator == other.__denominator:
+                return self.__numerator, other.__numerator
+            return self.__numerator * other.__denominator, other.__numerator * self.__denominator
+
+        if isinstance(other, int):
+            if self.__denominator == 1:
+                return self.__numerator, other
+            return self.__numerator, other * self.__denominator
+
+        if isinstance(other, float) and not math.isfinite(other):
+            # Any fraction compares to an infinite or a nan float as 0 does
+            return 0, other
+        if isinstance(other, Decimal) and not other.is_finite():
+            return 0, float(other)
+
+        terms = self.__operand_terms(other)
+        if terms is None:
+            return None
+        return self.__numerator * terms[1], terms[0] * self.__denominator
 
     def __eq__(self, other) -> bool:
         """Overloading of the == operator for fractions
 
-        PRE : - other: a fraction, an integer or a float
+        PRE : - other: an integer, a fraction, a float, a fractions.Fraction or a decimal.Decimal
         POST : the equality between the current fraction and the other value
         """
-        return float(self) == float(other)
+        if isinstance(other, Fraction):
+            return self.__numerator == other.__numerator and self.__denominator == other.__denominator
+
+        terms = self.__cross_terms(other)
+        if terms is None:
+            return NotImplemented
+        return terms[0] == terms[1]
 
     def __gt__(self, other) -> bool:
         """Overloading of the > operator for fractions
 
-        PRE : - other: an integer or a fraction
-        POST : the current fraction is greater than the other fraction
+        PRE : - other: an integer, a fraction, a float, a fractions.Fraction or a decimal.Decimal
+        POST : the current fraction is greater than the other value
         """
-        return float(self) > float(other)
+        terms = self.__cross_terms(other)
+        if terms is None:
+            return NotImplemented
+        return terms[0] > terms[1]
 
     def __ge__(self, other) -> bool:
         """Overloading of the >= operator for fractions
 
-        PRE : - other: an integer or a fraction
-        POST : the current fraction equals or is greater than the other fraction
+        PRE : - other: an integer, a fraction, a float, a fractions.Fraction or a decimal.Decimal
+        POST : the current fraction equals or is greater than the other value
         """
-        return float(self) >= float(other)
+        terms = self.__cross_terms(other)
+        if terms is None:
+            return NotImplemented
+        return terms[0] >= terms[1]
 
     def __lt__(self, other) -> bool:
         """Overloading of the < operator for fractions
 
-        PRE : - other: an integer or a fraction
-        POST : the current fraction is lower than the other fraction
+        PRE : - other: an integer, a fraction, a float, a fractions.Fraction or a decimal.Decimal
+        POST : the current fraction is lower than the other value
         """
-        return float(self) < float(other)
+        terms = self.__cross_terms(other)
+        if terms is None:
+            return NotImplemented
+        return terms[0] < terms[1]
 
     def __le__(self, other) -> bool:
         """Overloading of the <= operator for fractions
 
-        PRE : - other: an integer or a fraction
-        POST : the current fraction equals or is lower than the other fraction
+        PRE : - other: an integer, a fraction, a float, a fractions.Fraction or a decimal.Decimal
+        POST : the current fraction equals or is lower than the other value
         """
-        return float(self) <= float(other)
+        terms = self.__cross_terms(other)
+        if terms is None:
+            return NotImplemented
+        return terms[0] <= terms[1]
 
     # ------------------ Properties checking  ------------------
 
@@ -257,7 +916,7 @@ class Fraction:
         PRE : -
         POST : the absolute value of the fraction is < 1
         """
-        return abs(float(self)) < 1
+        return abs(self.numerator) < self.denominator
 
     def is_unit(self) -> bool:
         """Check if a fraction's numerator is 1 in its reduced form
@@ -270,13 +929,1461 @@ class Fraction:
     def is_adjacent_to(self, other) -> bool:
         """Check if two fractions differ by a unit fraction
 
-        Two fractions are adjacents if the absolute value of the difference them is a unit fraction
+        Two fractions are adjacents if the absolute value of the difference them is a unit fraction.
+        The difference of n1/d1 and n2/d2 is D/(d1*d2) with the determinant D = n1*d2 - n2*d1,
+        so that it is a unit fraction if and only if D is not null and divides d1*d2:
+        the check needs no temporary fraction and no gcd.
+
+        PRE : - other: a fraction or an integer
+        POST : the absolute value of the difference between the fractions is a unit fraction
+        RAISES : - TypeError: other is not a supported number
+        """
+        terms = self.__operand_terms(other)
+        if terms is None:
+            raise TypeError(f'Unsupported operand: {other!r}')
+
+        determinant = abs(self.__numerator * terms[1] - terms[0] * self.__denominator)
+        return determinant != 0 and self.__denominator * terms[1] % determinant == 0
+
+    # ------------------ Rational approximations ------------------
+
+    def continued_fraction(self):
+        """Generate the partial quotients of the continued fraction expansion of the fraction
+
+        PRE : -
+        POST : the integers a0, a1, ..., an such that the fraction is a0 + 1/(a1 + 1/(... + 1/an)),
+               a0 being the floor of the fraction and the next ones being positive
+        """
+        numerator, denominator = self.numerator, self.denominator
+        while denominator:
+            quotient, remainder = divmod(numerator, denominator)
+            yield quotient
+            numerator, denominator = denominator, remainder
+
+    def convergents(self):
+        """Generate the convergents of the continued fraction expansion of the fraction
+
+        PRE : -
+        POST : the successive best approximations of the fraction, the last one being the fraction itself
+        """
+        previous_numerator, previous_denominator = 0, 1
+        numerator, denominator = 1, 0
+        for quotient in self.continued_fraction():
+            previous_numerator, numerator = numerator, quotient * numerator + previous_numerator
+            previous_denominator, denominator = denominator, quotient * denominator + previous_denominator
+            # Convergents are always in reduced form
+            yield Fraction._from_reduced(numerator, denominator)
+
+    def limit_denominator(self, max_denominator: int):
+        """Return the closest fraction with a bounded denominator
+
+        PRE : - max_denominator: a positive int
+        POST : the closest fraction whose denominator is lower or equal to max_denominator,
+               the one with the smallest denominator in case of tie
+        RAISES : - ValueError: max_denominator is lower than 1
+        """
+        if max_denominator < 1:
+            raise ValueError('The maximum denominator must be at least 1.')
+        if self.denominator <= max_denominator:
+            return self
+        return Fraction._from_reduced(*_closest_terms(self.numerator, self.denominator, max_denominator))
+
+    @staticmethod
+    @contextmanager
+    def bounded_denominator(max_denominator: int):
+        """Return a context manager bounding the denominator of the results of the operators
+
+        In its block, the result of each operator is replaced by its closest fraction
+        with a denominator lower or equal to max_denominator, so that the size
+        of the operands stays flat over long computations.
+
+        PRE : - max_denominator: a positive int
+        POST : the results of the operators are bounded in the block, the previous bound is restored after it
+        RAISES : - ValueError: max_denominator is lower than 1
+        """
+        global _max_denominator
+        if max_denominator < 1:
+            raise ValueError('The maximum denominator must be at least 1.')
+
+        previous = _max_denominator
+        _max_denominator = max_denominator
+        try:
+            yield
+        finally:
+            _max_denominator = previous
+
+    # ------------------ Positional expansions ------------------
+
+    def __preperiod(self, base: int) -> int:
+        """Return the number of digits before the repeating part of the expansion of the fraction
+
+        PRE : - base: an int >= 2
+        POST : the smallest k such that the factors of the denominator shared with base divide base**k
+        """
+        coprime = self.denominator
+        gcd = _gcd(coprime, base)
+        while gcd > 1:
+            coprime //= gcd
+            gcd = _gcd(coprime, base)
+
+        shared = self.denominator // coprime
+        preperiod = 0
+        power = 1
+        while power % shared:
+            power *= base
+            preperiod += 1
+        return preperiod
+
+    def digits(self, base: int = 10):
+        """Generate lazily the digits of the absolute value of the fraction after the radix point
+
+        The digits are computed by long division, one at a time: the expansion can be read
+        to any precision in constant memory. The generator stops after the last non-null
+        digit of a finite expansion, and never stops for a repeating one.
+
+        PRE : - base: an int >= 2
+        POST : the successive digits, as ints in [0, base[
+        RAISES : - ValueError: base is lower than 2
+        """
+        if base < 2:
+            raise ValueError('The base must be at least 2.')
+
+        remainder = abs(self.numerator) % self.denominator
+        while remainder:
+            digit, remainder = divmod(remainder * base, self.denominator)
+            yield digit
+
+    def to_decimal_string(self, max_digits: int = None) -> str:
+        """Return the decimal expansion of the fraction, its repeating part between parentheses
+
+        The repeating part starts after the preperiod given by the factors 2 and 5 of the denominator,
+        and ends when the remainder of the long division comes back to its value at its start:
+        no expansion is stored to detect it.
+        EX: '-2.5', '0.1(6)', '0.(142857)', '3'
+
+        PRE : - max_digits: a positive int, the maximum number of digits after the decimal point, or None
+        POST : the decimal expansion; if it needs more than max_digits digits,
+               its first max_digits digits followed by '...'
+        """
+        sign = '-' if self.numerator < 0 else ''
+        int_part, remainder = divmod(abs(self.numerator), self.denominator)
+        if not remainder:
+            return f'{sign}{int_part}'
+
+        preperiod = self.__preperiod(10)
+        digits = []
+
+        def truncated() -> bool:
+            return max_digits is not None and len(digits) >= max_digits
+
+        for _ in range(preperiod):
+            if truncated():
+                return f"{sign}{int_part}.{''.join(digits)}..."
+            digit, remainder = divmod(remainder * 10, self.denominator)
+            digits.append(str(digit))
+        if not remainder:
+            return f"{sign}{int_part}.{''.join(digits)}"
+
+        period_start = remainder
+        while True:
+            if truncated():
+                return f"{sign}{int_part}.{''.join(digits)}..."
+            digit, remainder = divmod(remainder * 10, self.denominator)
+            digits.append(str(digit))
+            if remainder == period_start:
+                break
+        return f"{sign}{int_part}.{''.join(digits[:preperiod])}({''.join(digits[preperiod:])})"
+
+
+def _closest_terms(numerator: int, denominator: int, max_denominator: int) -> tuple:
+    """Return the terms of the closest fraction with a bounded denominator
+
+    The Stern-Brocot tree is walked down towards the fraction by whole runs of mediants,
+    each run being given by a partial quotient of the continued fraction expansion.
+    The walk stops when the next convergent has a too big denominator: the answer is then
+    the last convergent or the last semiconvergent with a bounded denominator.
+    Only integer arithmetic is used.
+
+    PRE : - numerator: an int
+          - denominator: a positive int, coprime with numerator and greater than max_denominator
+          - max_denominator: a positive int
+    POST : the reduced (numerator, denominator) tuple of the closest fraction,
+           the one with the smallest denominator in case of tie
+    """
+    previous_numerator, previous_denominator, current_numerator, current_denominator = 0, 1, 1, 0
+    dividend, divisor = numerator, denominator
+    while True:
+        quotient = dividend // divisor
+        next_denominator = previous_denominator + quotient * current_denominator
+        if next_denominator > max_denominator:
+            break
+        previous_numerator, previous_denominator, current_numerator, current_denominator = (
+            current_numerator, current_denominator, previous_numerator + quotient * current_numerator,
+            next_denominator)
+        dividend, divisor = divisor, dividend - quotient * divisor
+
+    steps = (max_denominator - previous_denominator) // current_denominator
+    semiconvergent = (previous_numerator + steps * current_numerator, previous_denominator + steps * current_denominator)
+    convergent = (current_numerator, current_denominator)
+
+    # Compare |p/q - numerator/denominator| exactly: |p * denominator - numerator * q| / q
+    def distance(terms: tuple) -> tuple:
+        return abs(terms[0] * denominator - numerator * terms[1]), terms[1]
+
+    distance1, scale1 = distance(convergent)
+    distance2, scale2 = distance(semiconvergent)
+    return convergent if distance1 * scale2 <= distance2 * scale1 else semiconvergent
+
+
+def _integer_root(value: int, degree: int) -> int:
+    """Return the integer part of the root of an integer
+
+    The root is computed with the Newton method on integers, without float approximation.
+
+    PRE : - value: a positive or null int
+          - degree: a positive int
+    POST : the greatest integer whose power by degree is lower or equal to value
+    """
+    if value < 2 or degree == 1:
+        return value
+    if degree == 2:
+        return math.isqrt(value)
+
+    root = 1 << -(-value.bit_length() // degree)
+    while True:
+        next_root = ((degree - 1) * root + value // root ** (degree - 1)) // degree
+        if next_root >= root:
+            return root
+        root = next_root
+
+
+class _InternCache:
+    """Class storing the shared instances of common fractions
+
+    The fractions are indexed by the terms given to build them, reduced or not.
+    """
+
+    __slots__ = ('table', 'recent', 'max_size', 'hits', 'misses')
+
+    def __init__(self, max_size: int, small_limit: int):
+        """This builds the preallocated table of the fractions with small terms and an empty cache.
+
+        PRE : - max_size: a positive int, the maximum number of fractions kept by the cache
+              - small_limit: a positive int, the greatest absolute value of the terms in the table
+        POST : set the table, the cache, its maximum size and null statistics
+        """
+        reduced = {}
+        self.table = {}
+        for numerator in range(-small_limit, small_limit + 1):
+            for denominator in range(-small_limit, small_limit + 1):
+                if denominator:
+                    sign = -1 if denominator < 0 else 1
+                    gcd = _gcd(numerator, denominator)
+                    terms = (sign * numerator // gcd, sign * denominator // gcd)
+                    if terms not in reduced:
+                        reduced[terms] = Fraction._from_reduced(*terms)
+                    self.table[(numerator, denominator)] = reduced[terms]
+
+        self.recent = OrderedDict()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, numerator, denominator):
+        """Return the shared fraction built from some terms
+
+        PRE : - numerator, denominator: the terms given to build the fraction
+        POST : the shared fraction, or None if it is not stored
+        """
+        key = (numerator, denominator)
+        fraction = self.table.get(key)
+        if fraction is None:
+            fraction = self.recent.get(key)
+            if fraction is None:
+                self.misses += 1
+                return None
+            self.recent.move_to_end(key)
+        self.hits += 1
+        return fraction
+
+    def store(self, key: tuple, fraction):
+        """Store a fraction as the most recently used one, evicting the least recently used one if full
+
+        PRE : - key: the (numerator, denominator) terms given to build the fraction
+              - fraction: the fraction built from these terms
+        POST : the fraction is stored
+        """
+        self.recent[key] = fraction
+        if len(self.recent) > self.max_size:
+            self.recent.popitem(last=False)
+
+    def clear(self):
+        """Empty the cache and reset the statistics
+
+        PRE : -
+        POST : the cache is empty, hits and misses are 0
+        """
+        self.recent.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        """Return the statistics of the cache
+
+        PRE : -
+        POST : a dict with hits, misses, table_size, cache_size and max_size
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'table_size': len(self.table),
+                'cache_size': len(self.recent), 'max_size': self.max_size}
+
+
+# ------------------ Instrumentation ------------------
+
+_INSTRUMENTED_OPERATORS = (
+    '__add__', '__radd__', '__iadd__', '__sub__', '__rsub__', '__isub__', '__mul__', '__rmul__', '__imul__',
+    '__truediv__', '__rtruediv__', '__itruediv__', '__pow__', '__rpow__', '__abs__', '__neg__',
+    '__eq__', '__lt__', '__le__', '__gt__', '__ge__', '__hash__',
+    'as_mixed_number', 'is_adjacent_to', 'from_string', 'from_bytes', 'sum', 'prod',
+)
+
+
+def _bits_bucket(value: int) -> int:
+    """Return the power of 2 bounding the bit length of an integer
+
+    PRE : - value: an int
+    POST : the smallest power of 2 greater or equal to the bit length of value, 0 for 0
+    """
+    bits = value.bit_length()
+    return 1 << (bits - 1).bit_length() if bits else 0
+
+
+class _Instrumentation:
+    """Class instrumenting the operations of the fraction class
+
+    The statistics are class attributes, so that they survive the disabling of the instrumentation.
+    """
+
+    constructions = Counter()
+    gcd_calls = Counter()
+    calls = Counter()
+    seconds = Counter()
+    numerator_bits = defaultdict(Counter)
+    denominator_bits = defaultdict(Counter)
 
-        PRE : - other: a fraction
-        POST : ?
+    def __init__(self):
+        """This replaces the operators and the constructors of the fraction class by instrumented wrappers.
+
+        PRE : -
+        POST : set the following attributes :
+               - originals : the replaced attributes of the fraction class, by name
+               - current : the stack of the names of the running operators and constructions sites
+        """
+        self.originals = {}
+        self.current = []
+
+        for name in _INSTRUMENTED_OPERATORS:
+            self.__replace(name, self.__operator_wrapper)
+        self.__replace('__new__', self.__construction_wrapper)
+        self.__replace('_from_reduced', self.__construction_wrapper)
+
+    def __replace(self, name: str, wrapper_factory):
+        """Replace an attribute of the fraction class by a wrapper, keeping its kind of method
+
+        PRE : - name: the name of a function, static method or class method of the fraction class
+              - wrapper_factory: a function building the wrapper from the name and the function
+        POST : the original attribute is stored in originals
+        """
+        original = Fraction.__dict__[name]
+        self.originals[name] = original
+        if isinstance(original, staticmethod):
+            setattr(Fraction, name, staticmethod(wrapper_factory(name, original.__func__)))
+        elif isinstance(original, classmethod):
+            setattr(Fraction, name, classmethod(wrapper_factory(name, original.__func__)))
+        else:
+            setattr(Fraction, name, wrapper_factory(name, original))
+
+    def restore(self):
+        """Restore the original attributes of the fraction class
+
+        PRE : -
+        POST : the fraction class is not instrumented anymore
+        """
+        for name, original in self.originals.items():
+            setattr(Fraction, name, original)
+
+    def site(self) -> str:
+        """Return the name of the running operator, or the call site outside of the fraction class
+
+        PRE : -
+        POST : the name of the innermost running operator, or 'file:line' of the caller
+        """
+        if self.current:
+            return self.current[-1]
+        frame = sys._getframe(2)
+        return f'{os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno}'
+
+    def counting_gcd(self, *integers) -> int:
+        """Return the gcd of integers, counting the invocation
+
+        PRE : - integers: ints
+        POST : the gcd of the integers
+        """
+        _Instrumentation.gcd_calls[self.site()] += 1
+        return math.gcd(*integers)
+
+    def __operator_wrapper(self, name: str, function):
+        """Return a wrapper of an operator counting its calls, its time and the bit lengths of its result
+
+        PRE : - name: the name of the operator
+              - function: the operator
+        POST : the wrapper
+        """
+        current = self.current
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            current.append(name)
+            start = time.perf_counter()
+            try:
+                result = function(*args, **kwargs)
+            finally:
+                _Instrumentation.seconds[name] += time.perf_counter() - start
+                _Instrumentation.calls[name] += 1
+                current.pop()
+            if isinstance(result, Fraction):
+                _Instrumentation.numerator_bits[name][_bits_bucket(result.numerator)] += 1
+                _Instrumentation.denominator_bits[name][_bits_bucket(result.denominator)] += 1
+            return result
+
+        return wrapper
+
+    def __construction_wrapper(self, name: str, function):
+        """Return a wrapper of a constructor counting the constructions by operator or by call site
+
+        PRE : - name: the name of the constructor
+              - function: the constructor
+        POST : the wrapper
+        """
+        current = self.current
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            site = self.site()
+            _Instrumentation.constructions[site] += 1
+            # The gcd invocations of the constructor are counted for the same site
+            current.append(site)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                current.pop()
+
+        return wrapper
+
+    @staticmethod
+    def snapshot() -> dict:
+        """Return a copy of the statistics as plain dicts
+
+        PRE : -
+        POST : the statistics, as described by Fraction.stats
+        """
+        return {
+            'constructions': dict(_Instrumentation.constructions),
+            'gcd_calls': dict(_Instrumentation.gcd_calls),
+            'calls': dict(_Instrumentation.calls),
+            'seconds': dict(_Instrumentation.seconds),
+            'numerator_bits': {name: dict(buckets) for name, buckets in _Instrumentation.numerator_bits.items()},
+            'denominator_bits': {name: dict(buckets) for name, buckets in _Instrumentation.denominator_bits.items()},
+        }
+
+    @staticmethod
+    def reset():
+        """Empty all the statistics
+
+        PRE : -
+        POST : all the counters are empty
+        """
+        for counter in (_Instrumentation.constructions, _Instrumentation.gcd_calls, _Instrumentation.calls,
+                        _Instrumentation.seconds, _Instrumentation.numerator_bits,
+                        _Instrumentation.denominator_bits):
+            counter.clear()
+
+
+def format_stats(stats: dict) -> str:
+    """Return a textual dump of statistics of the instrumentation, one sorted line by counter
+
+    The lines are sorted, so that the dumps of two runs can be compared with a diff tool.
+
+    PRE : - stats: statistics as returned by Fraction.stats
+    POST : the lines 'section key value', the bit lengths buckets being written as key:<=bits
+    """
+    lines = []
+    for section, counters in stats.items():
+        for key, value in counters.items():
+            if isinstance(value, dict):
+                lines.extend(f'{section} {key}:<={bucket} {count}' for bucket, count in value.items())
+            elif isinstance(value, float):
+                lines.append(f'{section} {key} {value:.6f}')
+            else:
+                lines.append(f'{section} {key} {value}')
+    return '\n'.join(sorted(lines)) + '\n'
+
+
+# ------------------ Parsing ------------------
+
+_TEXT_PATTERN = re.compile(r"""
+    \s*(?:
+        <Fraction:\s*(?P<repr_numerator>[+-]?\d+)\s*/\s*(?P<repr_denominator>[+-]?\d+)\s*>
+        | (?P<integer>[+-]?\d+)\s*\+\s*(?P<mixed_numerator>[+-]?\d+)\s*/\s*(?P<mixed_denominator>[+-]?\d+)
+        | (?P<sign>[+-]?)(?P<units>\d*)(?:\.(?P<decimals>\d*))?(?:[eE](?P<exponent>[+-]?\d+))?
+    )\s*$
+""", re.VERBOSE)
+
+
+def _parse_terms(text: str) -> tuple:
+    """Return the terms of the fraction represented by a text, not reduced
+
+    PRE : - text: a textual representation accepted by Fraction.from_string
+    POST : the (numerator, denominator) tuple of the fraction, the denominator may be null or negative
+    RAISES : - ValueError: text does not represent a fraction
+    """
+    # Fast path for the most common form n/d
+    numerator, slash, denominator = text.partition('/')
+    if slash:
+        try:
+            return int(numerator), int(denominator)
+        except ValueError:
+            pass
+
+    match = _TEXT_PATTERN.match(text)
+    if match is None:
+        raise ValueError(f'Invalid fraction: {text.strip()!r}')
+
+    if match['repr_numerator'] is not None:
+        return int(match['repr_numerator']), int(match['repr_denominator'])
+
+    if match['integer'] is not None:
+        denominator = int(match['mixed_denominator'])
+        return int(match['integer']) * denominator + int(match['mixed_numerator']), denominator
+
+    units = match['units']
+    decimals = match['decimals'] or ''
+    if not units and not decimals:
+        raise ValueError(f'Invalid fraction: {text.strip()!r}')
+    numerator = int(units + decimals)
+    if match['sign'] == '-':
+        numerator = -numerator
+    exponent = int(match['exponent'] or 0) - len(decimals)
+    if exponent >= 0:
+        return numerator * 10 ** exponent, 1
+    return numerator, 10 ** -exponent
+
+
+def _read_lines(source, chunk_size: int):
+    """Read the lines of a text file or of a path by large chunks
+
+    PRE : - source: a path, or a file object opened in text or binary mode
+          - chunk_size: a positive int, the number of characters read at once
+    POST : the lines of the file, without their end of line
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as file:
+            yield from _read_lines(file, chunk_size)
+        return
+
+    remainder = ''
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        if isinstance(chunk, bytes):
+            chunk = chunk.decode('ascii')
+        lines = (remainder + chunk).split('\n')
+        remainder = lines.pop()
+        yield from lines
+    if remainder:
+        yield remainder
+
+
+def parse_many(source, batch_size: int = None, chunk_size: int = 1 << 20):
+    """Parse a file of fractions, one textual representation per line
+
+    The file is read by large chunks and parsed lazily. Blank lines are skipped.
+
+    PRE : - source: a path, or a file object opened in text or binary mode
+          - batch_size: a positive int, or None
+          - chunk_size: a positive int, the number of characters read at once
+    POST : the fractions of the file in order, or if batch_size is given,
+           (numerators, denominators) tuples of parallel lists of at most batch_size reduced terms
+    RAISES : - ValueError: a line does not represent a fraction, with its line number
+    """
+    numerators = []
+    denominators = []
+    for line_number, line in enumerate(_read_lines(source, chunk_size), 1):
+        if not line or line.isspace():
+            continue
+
+        try:
+            numerator, denominator = _parse_terms(line)
+        except ValueError as error:
+            raise ValueError(f'Line {line_number}: {error}') from None
+        if denominator == 0:
+            raise ValueError(f"Line {line_number}: The denominator of a fraction can't be null.")
+
+        if denominator < 0:
+            numerator, denominator = -numerator, -denominator
+        gcd = _gcd(numerator, denominator)
+        if batch_size is None:
+            yield Fraction._from_reduced(numerator // gcd, denominator // gcd)
+        else:
+            numerators.append(numerator // gcd)
+            denominators.append(denominator // gcd)
+            if len(numerators) == batch_size:
+                yield numerators, denominators
+                numerators = []
+                denominators = []
+
+    if numerators:
+        yield numerators, denominators
+
+
+# ------------------ Binary serialization ------------------
+#
+# A fraction is stored as the zigzag varint of its reduced numerator followed by
+# the varint of its positive denominator. A varint stores an unsigned integer
+# by groups of 7 bits, least significant first, the high bit of each byte
+# telling whether another byte follows. The zigzag transform maps the signed
+# integers 0, -1, 1, -2, ... to the unsigned integers 0, 1, 2, 3, ...
+#
+# A stream of fractions is a sequence of length-prefixed blocks:
+#   - a kind byte: _PLAIN_BLOCK or _SHARED_DENOMINATOR_BLOCK
+#   - the varint of the number of fractions of the block
+#   - the varint of the length in bytes of the payload, then the payload
+# The payload of a plain block is the sequence of the fractions as above.
+# The payload of a shared denominator block is the varint of a common
+# denominator followed by the zigzag varints of the numerators over it.
+
+_PLAIN_BLOCK = 0
+_SHARED_DENOMINATOR_BLOCK = 1
+
+
+def _zigzag(value: int) -> int:
+    """Map a signed integer to an unsigned integer, small absolute values giving small results
+
+    PRE : - value: an int
+    POST : 2 * value for a positive or null value, -2 * value - 1 for a negative one
+    """
+    return value << 1 if value >= 0 else (-value << 1) - 1
+
+
+def _unzigzag(value: int) -> int:
+    """Map back an unsigned integer to the signed integer given to _zigzag
+
+    PRE : - value: a positive or null int
+    POST : the signed integer
+    """
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+def _write_varint(buffer: bytearray, value: int):
+    """Append the varint of an unsigned integer to a buffer
+
+    PRE : - buffer: a bytearray
+          - value: a positive or null int
+    POST : the bytes of the varint are appended to buffer
+    """
+    while value >= 0x80:
+        buffer.append((value & 0x7f) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(view, position: int) -> tuple:
+    """Read a varint from a buffer
+
+    PRE : - view: a memoryview of bytes
+          - position: the index of the first byte of the varint
+    POST : the (value, position) tuple of the unsigned integer and of the index following the varint
+    RAISES : - ValueError: the varint is truncated
+    """
+    value = 0
+    shift = 0
+    try:
+        byte = view[position]
+        while byte & 0x80:
+            value |= (byte & 0x7f) << shift
+            shift += 7
+            position += 1
+            byte = view[position]
+    except IndexError:
+        raise ValueError('Truncated varint.') from None
+    return value | (byte << shift), position + 1
+
+
+def _from_terms(numerator: int, denominator: int):
+    """Build a fraction from decoded terms, without reducing them
+
+    The terms come from outside data: they are checked, as _from_reduced trusts them.
+
+    PRE : - numerator: an int
+          - denominator: an int
+    POST : the fraction numerator/denominator
+    RAISES : - ValueError: the denominator is not positive or is not coprime with the numerator
+    """
+    if denominator <= 0:
+        raise ValueError("The denominator of a fraction can't be null or negative.")
+    if math.gcd(numerator, denominator) != 1:
+        raise ValueError(f'The terms {numerator}/{denominator} are not reduced.')
+    return Fraction._from_reduced(numerator, denominator)
+
+
+def _restore(numerator: int, denominator: int):
+    """Rebuild a pickled fraction
+
+    PRE : - numerator: an int
+          - denominator: a positive int, coprime with the numerator
+    POST : the fraction numerator/denominator
+    RAISES : - ValueError: the terms are not reduced
+    """
+    return _from_terms(numerator, denominator)
+
+
+def _encode_block(buffer: bytearray, fractions_block: list, shared_denominator: bool):
+    """Append a block of fractions to a buffer
+
+    The shared denominator encoding stores the numerators over the lcm of the denominators.
+    It is used when it can't make the block bigger: when the lcm is at most 7 bits longer
+    than the smallest denominator, as each numerator then grows by at most one byte
+    while its denominator is not stored anymore.
+
+    PRE : - buffer: a bytearray
+          - fractions_block: a non-empty list of fractions
+          - shared_denominator: the shared denominator encoding is allowed
+    POST : the block is appended to buffer
+    """
+    payload = bytearray()
+    if shared_denominator:
+        # The lcm is accumulated until it goes over the budget of 7 bits
+        budget = min(fraction.denominator for fraction in fractions_block).bit_length() + 7
+        denominator = 1
+        for fraction in fractions_block:
+            denominator = math.lcm(denominator, fraction.denominator)
+            if denominator.bit_length() > budget:
+                shared_denominator = False
+                break
+    if shared_denominator:
+        kind = _SHARED_DENOMINATOR_BLOCK
+        _write_varint(payload, denominator)
+        for fraction in fractions_block:
+            _write_varint(payload, _zigzag(fraction.numerator * (denominator // fraction.denominator)))
+    else:
+        kind = _PLAIN_BLOCK
+        for fraction in fractions_block:
+            _write_varint(payload, _zigzag(fraction.numerator))
+            _write_varint(payload, fraction.denominator)
+
+    buffer.append(kind)
+    _write_varint(buffer, len(fractions_block))
+    _write_varint(buffer, len(payload))
+    buffer += payload
+
+
+def write_fractions(file, fractions_iterable, block_size: int = 4096, shared_denominator: bool = True) -> int:
+    """Write fractions to a binary file in the compact binary format
+
+    PRE : - file: a file object opened in binary write mode
+          - fractions_iterable: an iterable of fractions, consumed lazily
+          - block_size: a positive int, the maximum number of fractions by block
+          - shared_denominator: the blocks may store their numerators over a common denominator
+    POST : the fractions are written by blocks, the number of written bytes is returned
+    """
+    written = 0
+    block = []
+    for fraction in fractions_iterable:
+        block.append(fraction)
+        if len(block) == block_size:
+            buffer = bytearray()
+            _encode_block(buffer, block, shared_denominator)
+            written += file.write(buffer)
+            block = []
+    if block:
+        buffer = bytearray()
+        _encode_block(buffer, block, shared_denominator)
+        written += file.write(buffer)
+    return written
+
+
+def iter_fractions(buffer):
+    """Decode lazily the fractions of a buffer in the compact binary format
+
+    The buffer is read through a memoryview, without copy: it may be a bytes object or a mmap.
+
+    PRE : - buffer: a bytes-like object, as written by write_fractions
+    POST : the fractions of the buffer, in order
+    RAISES : - ValueError: the buffer is not in the compact binary format
+    """
+    view = memoryview(buffer)
+    position = 0
+    while position < len(view):
+        kind = view[position]
+        count, position = _read_varint(view, position + 1)
+        length, position = _read_varint(view, position)
+        end = position + length
+        if end > len(view):
+            raise ValueError('Truncated block.')
+
+        if kind == _SHARED_DENOMINATOR_BLOCK:
+            denominator, position = _read_varint(view, position)
+            if denominator == 0:
+                raise ValueError("The denominator of a fraction can't be null.")
+            for _ in range(count):
+                numerator, position = _read_varint(view, position)
+                yield Fraction(_unzigzag(numerator), denominator)
+        elif kind == _PLAIN_BLOCK:
+            for _ in range(count):
+                numerator, position = _read_varint(view, position)
+                denominator, position = _read_varint(view, position)
+                yield _from_terms(_unzigzag(numerator), denominator)
+        else:
+            raise ValueError(f'Unknown block kind {kind}.')
+
+        if position != end:
+            raise ValueError('Inconsistent block length.')
+
+
+# ------------------ Parallel reduction ------------------
+
+def _reduce_chunk(operation, terms: list) -> tuple:
+    """Reduce a chunk of fractions given by their terms, in a worker process
+
+    The sums and the products are computed by Fraction.sum and Fraction.prod.
+
+    PRE : - operation: a picklable function combining two fractions
+          - terms: a non-empty list of (numerator, denominator) tuples of reduced fractions
+    POST : the (numerator, denominator) tuple of the reduced chunk
+    """
+    chunk = [Fraction._from_reduced(numerator, denominator) for numerator, denominator in terms]
+    if operation is operator.add:
+        result = Fraction.sum(chunk)
+    elif operation is operator.mul:
+        result = Fraction.prod(chunk)
+    else:
+        result = functools.reduce(operation, chunk)
+    return result.numerator, result.denominator
+
+
+def parallel_reduce(operation, iterable, workers: int = None, chunk_size: int = 10000, initial=None):
+    """Reduce fractions with an associative operation on several processes
+
+    The iterable is consumed lazily by chunks, with a bounded number of chunks in flight.
+    Each chunk is reduced in a worker process, the fractions being transferred as tuples of terms.
+    The partial results are combined in order as a balanced tree, like the digits of a binary counter,
+    so that the result only depends on the chunk size, not on the number of workers.
+
+    PRE : - operation: an associative picklable function combining two fractions, EX: operator.add
+          - iterable: an iterable of fractions or integers
+          - workers: a positive int, the number of processes, None for the number of CPUs
+          - chunk_size: a positive int, the number of fractions reduced at once by a worker
+          - initial: a fraction placed before the terms, or None
+    POST : the reduction of initial and of the terms, in order
+    RAISES : - ValueError: a term is nor an integer or a fraction,
+                           or the iterable is empty without initial value
+    """
+    def to_terms(term) -> tuple:
+        if isinstance(term, int):
+            return term, 1
+        if isinstance(term, Fraction):
+            return term.numerator, term.denominator
+        raise ValueError()
+
+    def chunks():
+        iterator = iter(iterable)
+        while True:
+            chunk = [to_terms(term) for term in itertools.islice(iterator, chunk_size)]
+            if not chunk:
+                return
+            yield chunk
+
+    stack = []
+
+    def push(partial: tuple):
+        level = 0
+        result = Fraction._from_reduced(*partial)
+        while stack and stack[-1][0] == level:
+            result = operation(stack.pop()[1], result)
+            level += 1
+        stack.append((level, result))
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk in chunks():
+            push(_reduce_chunk(operation, chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for chunk in chunks():
+                pending.append(executor.submit(_reduce_chunk, operation, chunk))
+                if len(pending) >= 2 * workers:
+                    push(pending.popleft().result())
+            while pending:
+                push(pending.popleft().result())
+
+    if not stack:
+        if initial is None:
+            raise ValueError('parallel_reduce() of an empty iterable with no initial value')
+        return initial
+
+    result = stack.pop()[1]
+    while stack:
+        result = operation(stack.pop()[1], result)
+    return result if initial is None else operation(initial, result)
+
+
+# ------------------ Batch of fractions ------------------
+
+def _magnitude(values) -> int:
+    """Return the greatest absolute value of an array of integers
+
+    PRE : - values: a one-dimensional array of integers
+    POST : the greatest absolute value, 0 for an empty array
+    """
+    return int(np.max(np.abs(values))) if len(values) else 0
+
+
+def _to_array(values):
+    """Build an int64 array from integers, or an object array if they overflow int64
+
+    PRE : - values: an iterable of integers
+    POST : a one-dimensional array of the integers
+    """
+    if isinstance(values, np.ndarray) and values.dtype.kind == 'i':
+        return values.astype(np.int64)
+
+    values = [int(value) for value in values]
+    try:
+        return np.array(values, dtype=np.int64)
+    except OverflowError:
+        return np.array(values, dtype=object)
+
+
+def _narrowed(values):
+    """Convert an object array back to int64 when all its integers fit
+
+    PRE : - values: a one-dimensional array of integers
+    POST : the same integers, as an int64 array if possible
+    """
+    if values.dtype == object and _magnitude(values) <= _INT64_MAX:
+        return values.astype(np.int64)
+    return values
+
+
+def _widened(bound: int, *arrays):
+    """Convert arrays to object arrays if an operation on them may overflow int64
+
+    PRE : - bound: an upper bound of the absolute value of the results of the operation
+          - arrays: one-dimensional arrays of integers
+    POST : the arrays, as object arrays if bound overflows int64
+    """
+    if bound <= _INT64_MAX:
+        return arrays
+    return tuple(array.astype(object) for array in arrays)
+
+
+def _normalized(numerators, denominators):
+    """Reduce arrays of numerators and denominators with a batched gcd
+
+    PRE : - numerators, denominators: one-dimensional arrays of integers of same length
+    POST : the reduced numerators and the positive reduced denominators
+    RAISES : - ZeroDivisionError: a denominator is null
+    """
+    if np.any(denominators == 0):
+        raise ZeroDivisionError("The denominator of a fraction can't be null.")
+
+    negative = denominators < 0
+    if np.any(negative):
+        numerators = np.where(negative, -numerators, numerators)
+        denominators = np.where(negative, -denominators, denominators)
+
+    gcd = np.gcd(numerators, denominators)
+    return _narrowed(numerators // gcd), _narrowed(denominators // gcd)
+
+
+class FractionArray:
+    """Class representing an array of fractions and vectorized operations on it
+
+    The numerators and the denominators are stored as parallel NumPy int64 arrays,
+    or as object arrays of Python integers when they overflow int64.
+    Every operation gives the same results as the Fraction class, element by element.
+    """
+
+    __slots__ = ('__numerators', '__denominators')
+
+    def __init__(self, numerators, denominators=None):
+        """This builds an array of fractions based on some numerators and denominators.
+
+        PRE : - numerators: an iterable of ints
+              - denominators: an iterable of non-null ints of same length, or None for integers
+        POST : set the following attributes :
+               - numerators : the reduced numerators of the fractions
+               - denominators : the reduced denominators of the fractions
+        RAISES : - ImportError: NumPy is not installed
+                 - ValueError: numerators and denominators have different lengths
+                 - ZeroDivisionError: a denominator is null
+        """
+        if np is None:
+            raise ImportError('FractionArray requires NumPy.')
+
+        numerators = _to_array(numerators)
+        if denominators is None:
+            denominators = np.ones(len(numerators), dtype=np.int64)
+        else:
+            denominators = _to_array(denominators)
+        if len(numerators) != len(denominators):
+            raise ValueError('The numerators and the denominators must have the same length.')
+
+        self.__numerators, self.__denominators = _normalized(numerators, denominators)
+
+    @classmethod
+    def _from_reduced(cls, numerators, denominators):
+        """Build an array of fractions from arrays already in reduced form
+
+        PRE : - numerators: a one-dimensional array of ints
+              - denominators: an array of positive ints of same length, coprime with the numerators
+        POST : an array of fractions with exactly these numerators and denominators
+        """
+        array = object.__new__(cls)
+        array.__numerators = numerators
+        array.__denominators = denominators
+        return array
+
+    @classmethod
+    def from_fractions(cls, fractions):
+        """Build an array of fractions from fractions
+
+        PRE : - fractions: an iterable of fractions or integers
+        POST : an array holding the values of the fractions
+        """
+        numerators = []
+        denominators = []
+        for fraction in fractions:
+            if isinstance(fraction, int):
+                fraction = Fraction(fraction)
+            numerators.append(fraction.numerator)
+            denominators.append(fraction.denominator)
+        return cls._from_reduced(_to_array(numerators), _to_array(denominators))
+
+    def to_fractions(self) -> list:
+        """Convert the array into a list of fractions
+
+        PRE : -
+        POST : the list of the fractions of the array
+        """
+        return [Fraction._from_reduced(int(numerator), int(denominator))
+                for numerator, denominator in zip(self.__numerators, self.__denominators)]
+
+    @property
+    def numerators(self):
+        """Get the numerators of the fractions
+
+        PRE : -
+        POST : Return a copy of the array of the reduced numerators
+        """
+        return self.__numerators.copy()
+
+    @property
+    def denominators(self):
+        """Get the denominators of the fractions
+
+        PRE : -
+        POST : Return a copy of the array of the reduced denominators
+        """
+        return self.__denominators.copy()
+
+    # ------------------ Container protocol ------------------
+
+    def __len__(self) -> int:
+        """Return the number of fractions of the array
+
+        PRE : -
+        POST : the number of fractions
+        """
+        return len(self.__numerators)
+
+    def __getitem__(self, index):
+        """Return a fraction of the array, or a sub-array
+
+        PRE : - index: an integer, a slice, an array of indices or a boolean mask
+        POST : the fraction at this integer index, or an array of the selected fractions
+        """
+        if isinstance(index, (int, np.integer)):
+            return Fraction._from_reduced(int(self.__numerators[index]), int(self.__denominators[index]))
+        return FractionArray._from_reduced(self.__numerators[index], self.__denominators[index])
+
+    def __iter__(self):
+        """Iterate over the fractions of the array
+
+        PRE : -
+        POST : the fractions of the array, in order
+        """
+        return iter(self.to_fractions())
+
+    # ------------------ Textual representations ------------------
+
+    def __str__(self) -> str:
+        """Return a textual representation of the reduced fractions of the array
+
+        PRE : -
+        POST : the fractions separated by commas, between brackets
+               EX: [.../..., .../...]
+        """
+        return '[' + ', '.join(f'{numerator}/{denominator}' for numerator, denominator
+                               in zip(self.__numerators, self.__denominators)) + ']'
+
+    def __repr__(self) -> str:
+        """Return the textual representation of the reduced fractions of the array
+
+        PRE : -
+        POST : the classname and the fractions
+               EX: <FractionArray: [.../..., .../...]>
+        """
+        return f'<FractionArray: {self}>'
+
+    # ------------------ Operators overloading ------------------
+
+    def __operand_terms(self, other):
+        """Return the numerators and the denominators of another operand
+
+        PRE : - other: an array of fractions of same length, a fraction or an integer
+        POST : the arrays of numerators and denominators of other, broadcastable to the array
+        RAISES : - ValueError: other is nor an array of fractions, a fraction or an integer
+                               or has a different length
+        """
+        if isinstance(other, FractionArray):
+            if len(other) != len(self):
+                raise ValueError('The arrays of fractions must have the same length.')
+            return other.__numerators, other.__denominators
+        if isinstance(other, int):
+            other = Fraction(other)
+        if not isinstance(other, Fraction):
+            raise ValueError()
+        return _to_array([other.numerator]), _to_array([other.denominator])
+
+    def __sum_terms(self, numerators, denominators):
+        """Sum the array and other fractions given by their terms
+
+        PRE : - numerators, denominators: the reduced terms of the other fractions
+        POST : the array of the sums
+        """
+        bound = max(_magnitude(self.__numerators) * _magnitude(denominators)
+                    + _magnitude(numerators) * _magnitude(self.__denominators),
+                    _magnitude(self.__denominators) * _magnitude(denominators))
+        numerators1, denominators1, numerators2, denominators2 = _widened(
+            bound, self.__numerators, self.__denominators, numerators, denominators)
+        return FractionArray._from_reduced(*_normalized(numerators1 * denominators2 + numerators2 * denominators1,
+                                                        denominators1 * denominators2))
+
+    def __product_terms(self, numerators, denominators):
+        """Multiply the array and other fractions given by their terms
+
+        PRE : - numerators, denominators: the terms of the other fractions, denominators may be negative
+        POST : the array of the products
+        RAISES : - ZeroDivisionError: a denominator of the product is null
+        """
+        bound = max(_magnitude(self.__numerators) * _magnitude(numerators),
+                    _magnitude(self.__denominators) * _magnitude(denominators))
+        numerators1, denominators1, numerators2, denominators2 = _widened(
+            bound, self.__numerators, self.__denominators, numerators, denominators)
+        return FractionArray._from_reduced(*_normalized(numerators1 * numerators2, denominators1 * denominators2))
+
+    def __cross_terms(self, other):
+        """Return two arrays whose elementwise comparison matches the comparison of the fractions
+
+        PRE : - other: an array of fractions of same length, a fraction or an integer
+        POST : a (left, right) tuple of arrays of integers to compare
+        """
+        numerators, denominators = self.__operand_terms(other)
+        bound = max(_magnitude(self.__numerators) * _magnitude(denominators),
+                    _magnitude(numerators) * _magnitude(self.__denominators))
+        numerators1, denominators1, numerators2, denominators2 = _widened(
+            bound, self.__numerators, self.__denominators, numerators, denominators)
+        return numerators1 * denominators2, numerators2 * denominators1
+
+    def __add__(self, other):
+        """Overloading of the + operator for arrays of fractions
+
+        PRE : - other: an array of fractions of same length, a fraction or an integer
+        POST : the array of the elementwise sums
+        RAISES : - ValueError: other is nor an array of fractions, a fraction or an integer
+        """
+        return self.__sum_terms(*self.__operand_terms(other))
+
+    def __radd__(self, other):
+        """Overloading of the reflected + operator for arrays of fractions
+
+        PRE : - other: a fraction or an integer
+        POST : the array of the elementwise sums
+        """
+        return self + other
+
+    def __sub__(self, other):
+        """Overloading of the - operator for arrays of fractions
+
+        PRE : - other: an array of fractions of same length, a fraction or an integer
+        POST : the array of the elementwise differences
+        RAISES : - ValueError: other is nor an array of fractions, a fraction or an integer
+        """
+        numerators, denominators = self.__operand_terms(other)
+        return self.__sum_terms(-numerators, denominators)
+
+    def __rsub__(self, other):
+        """Overloading of the reflected - operator for arrays of fractions
+
+        PRE : - other: a fraction or an integer
+        POST : the array of the elementwise differences
+        """
+        return -self + other
+
+    def __mul__(self, other):
+        """Overloading of the * operator for arrays of fractions
+
+        PRE : - other: an array of fractions of same length, a fraction or an integer
+        POST : the array of the elementwise products
+        RAISES : - ValueError: other is nor an array of fractions, a fraction or an integer
+        """
+        return self.__product_terms(*self.__operand_terms(other))
+
+    def __rmul__(self, other):
+        """Overloading of the reflected * operator for arrays of fractions
+
+        PRE : - other: a fraction or an integer
+        POST : the array of the elementwise products
+        """
+        return self * other
+
+    def __truediv__(self, other):
+        """Overloading of the / operator for arrays of fractions
+
+        PRE : - other: an array of fractions of same length, a fraction or an integer
+        POST : the array of the elementwise quotients
+        RAISES : - ValueError: other is nor an array of fractions, a fraction or an integer
+                 - ZeroDivisionError: a divisor is null
+        """
+        numerators, denominators = self.__operand_terms(other)
+        return self.__product_terms(denominators, numerators)
+
+    def __rtruediv__(self, other):
+        """Overloading of the reflected / operator for arrays of fractions
+
+        PRE : - other: a fraction or an integer
+        POST : the array of the elementwise quotients
+        RAISES : - ZeroDivisionError: a fraction of the array is null
+        """
+        numerators, denominators = self.__operand_terms(other)
+        inverse = FractionArray._from_reduced(self.__denominators, self.__numerators)
+        return inverse.__product_terms(numerators, denominators)
+
+    def __pow__(self, other: int):
+        """Overloading of the ** operator for arrays of fractions
+
+        PRE : - other: an integer
+        POST : the array of the fractions powered by the integer
+        RAISES : - ZeroDivisionError: other is negative and a fraction of the array is null
+        """
+        numerators = self.__numerators
+        denominators = self.__denominators
+
+        if other < 0:
+            if np.any(numerators == 0):
+                raise ZeroDivisionError("The denominator of a fraction can't be null.")
+            numerators, denominators = denominators, numerators
+            other = -other
+            negative = denominators < 0
+            numerators = np.where(negative, -numerators, numerators)
+            denominators = np.where(negative, -denominators, denominators)
+
+        bound = max(_magnitude(numerators), _magnitude(denominators)) ** other
+        numerators, denominators = _widened(bound, numerators, denominators)
+        # Powers of coprime integers stay coprime: no reduction is needed
+        return FractionArray._from_reduced(_narrowed(numerators ** other), _narrowed(denominators ** other))
+
+    def __abs__(self):
+        """Returns the absolute values of the fractions
+
+        PRE : -
+        POST : the array of the absolute values
+        """
+        return FractionArray._from_reduced(np.abs(self.__numerators), self.__denominators)
+
+    def __neg__(self):
+        """Overloading of the unary - operator for arrays of fractions
+
+        PRE : -
+        POST : the array of the opposites
+        """
+        return FractionArray._from_reduced(-self.__numerators, self.__denominators)
+
+    def __eq__(self, other):
+        """Overloading of the == operator for arrays of fractions
+
+        PRE : - other: an array of fractions of same length, a fraction or an integer
+        POST : the boolean array of the elementwise equalities
+        """
+        left, right = self.__cross_terms(other)
+        return left == right
+
+    def __ne__(self, other):
+        """Overloading of the != operator for arrays of fractions
+
+        PRE : - other: an array of fractions of same length, a fraction or an integer
+        POST : the boolean array of the elementwise inequalities
+        """
+        left, right = self.__cross_terms(other)
+        return left != right
+
+    def __gt__(self, other):
+        """Overloading of the > operator for arrays of fractions
+
+        PRE : - other: an array of fractions of same length, a fraction or an integer
+        POST : the boolean array of the elementwise comparisons
+        """
+        left, right = self.__cross_terms(other)
+        return left > right
+
+    def __ge__(self, other):
+        """Overloading of the >= operator for arrays of fractions
+
+        PRE : - other: an array of fractions of same length, a fraction or an integer
+        POST : the boolean array of the elementwise comparisons
+        """
+        left, right = self.__cross_terms(other)
+        return left >= right
+
+    def __lt__(self, other):
+        """Overloading of the < operator for arrays of fractions
+
+        PRE : - other: an array of fractions of same length, a fraction or an integer
+        POST : the boolean array of the elementwise comparisons
+        """
+        left, right = self.__cross_terms(other)
+        return left < right
+
+    def __le__(self, other):
+        """Overloading of the <= operator for arrays of fractions
+
+        PRE : - other: an array of fractions of same length, a fraction or an integer
+        POST : the boolean array of the elementwise comparisons
+        """
+        left, right = self.__cross_terms(other)
+        return left <= right
+
+    __hash__ = None
+
+    # ------------------ Properties checking  ------------------
+
+    def is_zero(self):
+        """Check which fractions' value is 0
+
+        PRE : -
+        POST : the boolean array of the null numerators
+        """
+        return self.__numerators == 0
+
+    def is_integer(self):
+        """Check which fractions are integer
+
+        PRE : -
+        POST : the boolean array of the reduced denominators equal to 1
+        """
+        return self.__denominators == 1
+
+    def is_proper(self):
+        """Check which fractions have an absolute value < 1
+
+        PRE : -
+        POST : the boolean array of the absolute values < 1
+        """
+        return np.abs(self.__numerators) < self.__denominators
+
+    def is_unit(self):
+        """Check which fractions have a numerator equal to 1 in their reduced form
+
+        PRE : -
+        POST : the boolean array of the reduced numerators equal to 1
+        """
+        return self.__numerators == 1
+
+    # ------------------ Reductions ------------------
+
+    @staticmethod
+    def __where(mask, first, second):
+        """Select elementwise the fractions of two arrays
+
+        PRE : - mask: a boolean array
+              - first, second: arrays of fractions of same length as the mask
+        POST : the array of the fractions of first where mask is true, and of second elsewhere
+        """
+        return FractionArray._from_reduced(_narrowed(np.where(mask, first.__numerators, second.__numerators)),
+                                           _narrowed(np.where(mask, first.__denominators, second.__denominators)))
+
+    def __reduce_pairwise(self, operation, empty):
+        """Reduce the array by applying an operation on pairs of halves until one fraction is left
+
+        The pairwise reduction keeps the operands balanced.
+
+        PRE : - operation: a function combining two arrays of fractions of same length
+              - empty: the result for an empty array
+        POST : the reduced fraction
+        """
+        if not len(self):
+            return empty
+
+        array = self
+        while len(array) > 1:
+            half = len(array) // 2
+            reduced = operation(array[:half], array[half:2 * half])
+            if len(array) % 2:
+                reduced = FractionArray._from_reduced(
+                    _narrowed(np.concatenate((reduced.__numerators, array.__numerators[-1:]))),
+                    _narrowed(np.concatenate((reduced.__denominators, array.__denominators[-1:]))))
+            array = reduced
+        return array[0]
+
+    def sum(self) -> Fraction:
+        """Return the sum of the fractions of the array
+
+        PRE : -
+        POST : the exact sum of the fractions, Fraction() for an empty array
+        """
+        return self.__reduce_pairwise(FractionArray.__add__, Fraction())
+
+    def prod(self) -> Fraction:
+        """Return the product of the fractions of the array
+
+        PRE : -
+        POST : the exact product of the fractions, Fraction(1) for an empty array
+        """
+        return self.__reduce_pairwise(FractionArray.__mul__, Fraction(1))
+
+    def min(self) -> Fraction:
+        """Return the smallest fraction of the array
+
+        PRE : -
+        POST : the smallest fraction
+        RAISES : - ValueError: the array is empty
+        """
+        if not len(self):
+            raise ValueError('min() of an empty array of fractions')
+        return self.__reduce_pairwise(lambda first, second: self.__where(first <= second, first, second), None)
+
+    def max(self) -> Fraction:
+        """Return the greatest fraction of the array
+
+        PRE : -
+        POST : the greatest fraction
+        RAISES : - ValueError: the array is empty
         """
-        difference = abs(self - other)
-        return difference.is_unit()
+        if not len(self):
+            raise ValueError('max() of an empty array of fractions')
+        return self.__reduce_pairwise(lambda first, second: self.__where(first >= second, first, second), None)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,216 @@
+"""
+Benchmark the fraction class against the fractions module of the standard library.
+
+Run the benchmark and write a machine-readable JSON report:
+    python fraction_benchmark.py run --output before.json
+Compare two reports and flag the regressions beyond a threshold:
+    python fraction_benchmark.py compare before.json after.json --threshold 0.1
+"""
+import argparse
+import datetime
+import fractions
+import json
+import platform
+import random
+import sys
+import timeit
+
+from fraction import Fraction
+
+BIT_LENGTHS = (8, 64, 512, 4096, 32768, 100000)
+SORT_SIZE = 200
+IMPLEMENTATIONS = ('fraction', 'stdlib')
+
+
+def random_terms(rng: random.Random, bits: int) -> tuple:
+    """Return random terms of a fraction
+
+    PRE : - rng: a random generator
+          - bits: a positive int
+    POST : a (numerator, denominator) tuple of signed numerator and positive denominator of bits bits
+    """
+    numerator = rng.getrandbits(bits) | 1 << (bits - 1)
+    denominator = rng.getrandbits(bits) | 1 << (bits - 1)
+    return numerator if rng.random() < 0.5 else -numerator, denominator
+
+
+def stdlib_mixed_number(fraction: fractions.Fraction) -> str:
+    """Return the mixed number of a stdlib fraction, as Fraction.as_mixed_number does
+
+    PRE : - fraction: a fractions.Fraction
+    POST : the sum of the integer part and the fraction part
+    """
+    int_part, remainder = divmod(fraction.numerator, fraction.denominator)
+    return f'{int_part} + {fractions.Fraction(remainder, fraction.denominator)}'
+
+
+def operations(implementation: str, bits: int, seed: int) -> dict:
+    """Return the benchmarked operations of an implementation on operands of some size
+
+    PRE : - implementation: 'fraction' or 'stdlib'
+          - bits: a positive int, the bit length of the terms of the operands
+          - seed: the seed of the random operands, the same for both implementations
+    POST : a dict of the operation names and of the functions without argument running them once
+    """
+    cls = Fraction if implementation == 'fraction' else fractions.Fraction
+    rng = random.Random(seed)
+    terms1 = random_terms(rng, bits)
+    terms2 = random_terms(rng, bits)
+    first = cls(*terms1)
+    second = cls(*terms2)
+    to_sort = [cls(*random_terms(rng, bits)) for _ in range(SORT_SIZE)]
+
+    if implementation == 'fraction':
+        def as_mixed_number():
+            return first.as_mixed_number()
+
+        def is_adjacent_to():
+            return first.is_adjacent_to(second)
+    else:
+        def as_mixed_number():
+            return stdlib_mixed_number(first)
+
+        def is_adjacent_to():
+            return abs(first - second).numerator == 1
+
+    return {
+        'construct': lambda: cls(*terms1),
+        'add': lambda: first + second,
+        'sub': lambda: first - second,
+        'mul': lambda: first * second,
+        'truediv': lambda: first / second,
+        'pow': lambda: first ** 3,
+        'eq': lambda: first == second,
+        'lt': lambda: first < second,
+        'as_mixed_number': as_mixed_number,
+        'is_adjacent_to': is_adjacent_to,
+        'sort': lambda: sorted(to_sort),
+    }
+
+
+def time_call(function, min_time: float) -> float:
+    """Return the best time of a function call
+
+    PRE : - function: a function without argument
+          - min_time: a positive float, the minimum duration in seconds of a measure
+    POST : the best time in seconds of one call over 3 measures
+    """
+    timer = timeit.Timer(function)
+    number = 1
+    while True:
+        duration = timer.timeit(number)
+        if duration >= min_time or number >= 10 ** 7:
+            break
+        number *= 10 if duration < min_time / 10 else 2
+    best = min([duration] + timer.repeat(repeat=2, number=number))
+    return best / number
+
+
+def run(bit_lengths, names, min_time: float, seed: int) -> dict:
+    """Run the benchmark
+
+    PRE : - bit_lengths: an iterable of positive ints
+          - names: an iterable of operation names, or None for all of them
+          - min_time: a positive float, the minimum duration in seconds of a measure
+          - seed: the seed of the random operands
+    POST : the report, a dict of metadata and of results
+    """
+    # The mixed numbers of the largest operands have more digits than the integer to string conversions allow
+    max_str_digits = sys.get_int_max_str_digits()
+    sys.set_int_max_str_digits(0)
+    results = []
+    try:
+        for bits in bit_lengths:
+            for implementation in IMPLEMENTATIONS:
+                for name, function in operations(implementation, bits, seed).items():
+                    if names and name not in names:
+                        continue
+                    seconds = time_call(function, min_time)
+                    results.append({'operation': name, 'bits': bits, 'implementation': implementation,
+                                    'seconds': seconds})
+                    print(f'{name:>16} {bits:>7} bits {implementation:>8}: {seconds * 1e6:12.3f} us',
+                          file=sys.stderr)
+    finally:
+        sys.set_int_max_str_digits(max_str_digits)
+
+    return {
+        'metadata': {
+            'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'min_time': min_time,
+        },
+        'results': results,
+    }
+
+
+def compare(old: dict, new: dict, threshold: float) -> list:
+    """Compare two reports of the fraction class
+
+    PRE : - old, new: reports as returned by run
+          - threshold: a positive float, the tolerated relative slowdown (EX: 0.1 for 10%)
+    POST : the list of the comparisons of the operations measured in both reports, as dicts with
+           operation, bits, old and new seconds, their ratio and whether it is a regression
+    """
+    old_times = {(result['operation'], result['bits']): result['seconds']
+                 for result in old['results'] if result['implementation'] == 'fraction'}
+
+    comparisons = []
+    for result in new['results']:
+        key = (result['operation'], result['bits'])
+        if result['implementation'] != 'fraction' or key not in old_times:
+            continue
+        ratio = result['seconds'] / old_times[key]
+        comparisons.append({'operation': key[0], 'bits': key[1], 'old': old_times[key], 'new': result['seconds'],
+                            'ratio': ratio, 'regression': ratio > 1 + threshold})
+    return comparisons
+
+
+def main(arguments=None) -> int:
+    """Run the command line interface of the benchmark
+
+    PRE : - arguments: a list of command line arguments, or None for sys.argv
+    POST : the exit status; 1 if the compare command found a regression
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='run the benchmark')
+    run_parser.add_argument('--bits', type=int, nargs='+', default=BIT_LENGTHS, help='bit lengths of the operands')
+    run_parser.add_argument('--operations', nargs='+', help='names of the benchmarked operations')
+    run_parser.add_argument('--min-time', type=float, default=0.05, help='minimum duration of a measure')
+    run_parser.add_argument('--seed', type=int, default=2021, help='seed of the random operands')
+    run_parser.add_argument('--output', help='path of the JSON report, standard output by default')
+
+    compare_parser = commands.add_parser('compare', help='compare two JSON reports')
+    compare_parser.add_argument('old', help='path of the reference report')
+    compare_parser.add_argument('new', help='path of the new report')
+    compare_parser.add_argument('--threshold', type=float, default=0.1, help='tolerated relative slowdown')
+
+    arguments = parser.parse_args(arguments)
+
+    if arguments.command == 'run':
+        report = json.dumps(run(arguments.bits, arguments.operations, arguments.min_time, arguments.seed), indent=2)
+        if arguments.output:
+            with open(arguments.output, 'w') as file:
+                file.write(report + '\n')
+        else:
+            print(report)
+        return 0
+
+    with open(arguments.old) as file:
+        old = json.load(file)
+    with open(arguments.new) as file:
+        new = json.load(file)
+
+    comparisons = compare(old, new, arguments.threshold)
+    for comparison in comparisons:
+        flag = 'REGRESSION' if comparison['regression'] else ''
+        print(f"{comparison['operation']:>16} {comparison['bits']:>7} bits: {comparison['old'] * 1e6:12.3f} us -> "
+              f"{comparison['new'] * 1e6:12.3f} us ({comparison['ratio']:.2f}x) {flag}")
+    return 1 if any(comparison['regression'] for comparison in comparisons) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""
+Test the benchmark of the fraction class.
+"""
+import contextlib
+import io
+import sys
+import unittest
+from fraction_benchmark import BIT_LENGTHS, compare, operations, run
+
+
+class FractionBenchmarkTestCase(unittest.TestCase):
+    """
+    Test the operations, the report and the comparison of the benchmark.
+    """
+
+    def test_operations(self):
+        """
+        Test that both implementations run the same operations with the same results.
+        """
+        fraction_operations = operations('fraction', 64, 1)
+        stdlib_operations = operations('stdlib', 64, 1)
+        self.assertEqual(fraction_operations.keys(), stdlib_operations.keys(), 'operations names')
+        for name, function in fraction_operations.items():
+            result = function()
+            expected = stdlib_operations[name]()
+            if name == 'sort':
+                result = [(fraction.numerator, fraction.denominator) for fraction in result]
+                expected = [(fraction.numerator, fraction.denominator) for fraction in expected]
+            elif name not in ('eq', 'lt', 'as_mixed_number', 'is_adjacent_to'):
+                result = (result.numerator, result.denominator)
+                expected = (expected.numerator, expected.denominator)
+            self.assertEqual(result, expected, f'operation {name}')
+
+    def test_run_compare(self):
+        """
+        Test the report of a run and the detection of the regressions.
+        """
+        report = run([8], ['add', 'eq'], 0.001, 1)
+        self.assertEqual(len(report['results']), 4, 'run(...) results')
+
+        slower = {'results': [dict(result, seconds=result['seconds'] * 2) for result in report['results']]}
+        comparisons = compare(report, slower, 0.5)
+        self.assertEqual(len(comparisons), 2, 'compare(...) only compares the fraction class')
+        self.assertTrue(all(comparison['regression'] for comparison in comparisons), 'compare(...) regressions')
+        self.assertFalse(any(comparison['regression'] for comparison in compare(slower, report, 0.5)),
+                         'compare(...) improvements')
+
+    def test_run_default_sizes(self):
+        """
+        Test that the operations run at the default sizes, beyond the limit of the integer to string conversions.
+        """
+        # The sort is left out: it takes seconds at the largest size
+        names = [name for name in operations('fraction', 8, 1) if name != 'sort']
+        max_str_digits = sys.get_int_max_str_digits()
+        with contextlib.redirect_stderr(io.StringIO()):
+            report = run(BIT_LENGTHS, names, 0, 1)
+        self.assertEqual(len(report['results']), len(BIT_LENGTHS) * 2 * len(names), 'run(BIT_LENGTHS, ...) results')
+        self.assertEqual(sys.get_int_max_str_digits(), max_str_digits, 'run(...) restores the limit')
+
+
+if __name__ == "__main__":
+    unittest.main()
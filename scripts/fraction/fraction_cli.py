@@ -0,0 +1,204 @@
+"""
+Evaluate fraction expressions in batch, one expression by line.
+
+An expression is either a binary operator between two fractions, or the name of an operation
+of the fraction server followed by its arguments, or a single fraction:
+    3/4 + -5/2
+    -7/3 ** 2
+    is_adjacent_to 1/2 1/3
+    limit_denominator 3.14159 100
+The results are written in the order of the input, as CSV or as JSON lines:
+    python fraction_cli.py expressions.txt --format jsonl
+    python fraction_cli.py --jobs 4 < expressions.txt > results.csv
+"""
+import argparse
+import collections
+import csv
+import io
+import itertools
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from fraction import Fraction
+from fraction_server import OPERATIONS
+
+CHUNK_SIZE = 10000
+FORMATS = ('csv', 'jsonl')
+CSV_HEADER = ('line', 'expression', 'result', 'error')
+
+# The binary operators and the names of their operations
+OPERATORS = {
+    '+': 'add',
+    '-': 'sub',
+    '*': 'mul',
+    '/': 'truediv',
+    '**': 'pow',
+    '==': 'eq',
+    '>': 'gt',
+    '>=': 'ge',
+    '<': 'lt',
+    '<=': 'le',
+}
+
+
+def evaluate_expression(expression: str):
+    """Evaluate an expression
+
+    PRE : - expression: a binary operator between two fractions, the name of an operation followed by
+                        its arguments separated by spaces, or a single fraction
+    POST : the result, a fraction or the value returned by the operation
+    RAISES : - ValueError: the expression is invalid
+             - TypeError, ZeroDivisionError, OverflowError: the operation failed
+    """
+    tokens = expression.split()
+    if len(tokens) == 3 and tokens[1] in OPERATORS:
+        return OPERATIONS[OPERATORS[tokens[1]]][2](Fraction.from_string(tokens[0]), Fraction.from_string(tokens[2]))
+    if len(tokens) == 1:
+        return Fraction.from_string(tokens[0])
+    if not tokens or tokens[0] not in OPERATIONS:
+        raise ValueError(f'Invalid expression: {expression.strip()!r}')
+
+    kinds, _, function = OPERATIONS[tokens[0]]
+    arguments = tokens[1:]
+    if kinds != '*' and len(arguments) != len(kinds):
+        raise ValueError(f'The operation {tokens[0]!r} takes {len(kinds)} arguments.')
+    if kinds == '*':
+        kinds = 'f' * len(arguments)
+    return function(*(int(argument) if kind == 'i' else Fraction.from_string(argument)
+                      for kind, argument in zip(kinds, arguments)))
+
+
+def evaluate_chunk(start: int, lines: list, output_format: str) -> tuple:
+    """Evaluate a chunk of lines and format their results
+
+    This is the function run by the worker processes: the results are sent back already formatted.
+
+    PRE : - start: the number of the first line of the chunk
+          - lines: a list of expressions; the blank lines are skipped
+          - output_format: 'csv' or 'jsonl'
+    POST : a (text, errors) tuple, text being the formatted results and errors the number of invalid expressions
+    """
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator='\n') if output_format == 'csv' else None
+    errors = 0
+    for number, line in enumerate(lines, start):
+        expression = line.strip()
+        if not expression:
+            continue
+        try:
+            result = evaluate_expression(expression)
+        except (ValueError, TypeError, ZeroDivisionError, OverflowError) as error:
+            errors += 1
+            if writer is None:
+                output.write(json.dumps({'line': number, 'expression': expression, 'error': str(error)}) + '\n')
+            else:
+                writer.writerow((number, expression, '', str(error)))
+            continue
+
+        if isinstance(result, Fraction):
+            result = str(result)
+        if writer is None:
+            output.write(json.dumps({'line': number, 'expression': expression, 'result': result}) + '\n')
+        else:
+            writer.writerow((number, expression, json.dumps(result) if isinstance(result, list) else result, ''))
+    return output.getvalue(), errors
+
+
+def _chunks(lines, chunk_size: int):
+    """Generate the chunks of an iterable of lines
+
+    PRE : - lines: an iterable of strings
+          - chunk_size: a positive int
+    POST : the (number of the first line, list of lines) tuples, the lines being numbered from 1
+    """
+    iterator = iter(lines)
+    start = 1
+    while chunk := list(itertools.islice(iterator, chunk_size)):
+        yield start, chunk
+        start += len(chunk)
+
+
+def run(lines, output, output_format: str = 'csv', jobs: int = 1, chunk_size: int = CHUNK_SIZE) -> int:
+    """Evaluate a stream of expressions and write their results in order
+
+    The lines are evaluated by chunks, in the current process or in jobs worker processes,
+    with a bounded number of chunks in flight; each chunk is written at once.
+
+    PRE : - lines: an iterable of expressions
+          - output: a writable text file
+          - output_format: 'csv' or 'jsonl'
+          - jobs: a positive int, the number of processes
+          - chunk_size: a positive int, the number of lines evaluated at once
+    POST : the number of invalid expressions; the results are written to output
+    """
+    if output_format == 'csv':
+        csv.writer(output, lineterminator='\n').writerow(CSV_HEADER)
+
+    errors = 0
+    if jobs == 1:
+        for start, chunk in _chunks(lines, chunk_size):
+            text, chunk_errors = evaluate_chunk(start, chunk, output_format)
+            output.write(text)
+            errors += chunk_errors
+        return errors
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = collections.deque()
+        for start, chunk in _chunks(lines, chunk_size):
+            pending.append(executor.submit(evaluate_chunk, start, chunk, output_format))
+            if len(pending) >= 2 * jobs:
+                text, chunk_errors = pending.popleft().result()
+                output.write(text)
+                errors += chunk_errors
+        while pending:
+            text, chunk_errors = pending.popleft().result()
+            output.write(text)
+            errors += chunk_errors
+    return errors
+
+
+def _positive_int(text: str) -> int:
+    """Parse a positive int command line argument
+
+    PRE : - text: a string
+    POST : the positive int written in text
+    RAISES : - argparse.ArgumentTypeError: text is not a positive int
+    """
+    try:
+        value = int(text)
+    except ValueError:
+        value = 0
+    if value < 1:
+        raise argparse.ArgumentTypeError(f'{text!r} is not a positive int')
+    return value
+
+
+def main(arguments=None) -> int:
+    """Run the command line interface of the batch mode
+
+    PRE : - arguments: a list of command line arguments, or None for sys.argv
+    POST : the exit status; 1 if an expression was invalid
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('files', nargs='*', help='files of expressions, the standard input by default or for -')
+    parser.add_argument('--format', choices=FORMATS, default='csv', help='format of the results')
+    parser.add_argument('--jobs', type=_positive_int, default=1, help='number of processes')
+    parser.add_argument('--chunk-size', type=_positive_int, default=CHUNK_SIZE, help='number of lines evaluated at once')
+    arguments = parser.parse_args(arguments)
+
+    def lines():
+        for path in arguments.files or ['-']:
+            if path == '-':
+                yield from sys.stdin
+            else:
+                with open(path) as file:
+                    yield from file
+
+    errors = run(lines(), sys.stdout, arguments.format, arguments.jobs, arguments.chunk_size)
+    sys.stdout.flush()
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
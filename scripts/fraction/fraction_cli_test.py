@@ -0,0 +1,81 @@
+"""
+Test the batch mode of fraction expressions.
+"""
+import contextlib
+import io
+import json
+import unittest
+from fraction import Fraction
+from fraction_cli import evaluate_expression, main, run
+
+
+class FractionCliTestCase(unittest.TestCase):
+    """
+    Test the evaluation of expressions and the streaming of their results.
+    """
+
+    lines = ['3/4 + -5/2\n', 'is_adjacent_to 1/2 1/3\n', '\n', '1/0\n', 'continued_fraction 7/3\n', 'foo 1\n',
+             '1/2 >= 1/3\n']
+
+    def test_evaluate_expression(self):
+        """
+        Test the binary operators, the named operations and the single fractions.
+        """
+        self.assertEqual(evaluate_expression('3/4 + -5/2'), Fraction(-7, 4), "'3/4 + -5/2'")
+        self.assertEqual(evaluate_expression('-7/3 ** 2'), Fraction(49, 9), "'-7/3 ** 2'")
+        self.assertEqual(evaluate_expression('0.5 / 1/4'), Fraction(2), "'0.5 / 1/4'")
+        self.assertIs(evaluate_expression('1/2 < 1/3'), False, "'1/2 < 1/3'")
+        self.assertIs(evaluate_expression('is_adjacent_to 1/2 1/3'), True, "'is_adjacent_to 1/2 1/3'")
+        self.assertEqual(evaluate_expression('limit_denominator 3.14159 100'), Fraction(311, 99),
+                         "'limit_denominator 3.14159 100'")
+        self.assertEqual(evaluate_expression('sum 1 2 1/2'), Fraction(7, 2), "'sum 1 2 1/2'")
+        self.assertEqual(evaluate_expression(' 6/8 '), Fraction(3, 4), "' 6/8 '")
+        self.assertRaises(ZeroDivisionError, evaluate_expression, '1/2 / 0')
+        self.assertRaises(ValueError, evaluate_expression, 'foo 1')
+        self.assertRaises(ValueError, evaluate_expression, 'abs 1 2')
+        self.assertRaises(ValueError, evaluate_expression, '')
+
+    def test_run(self):
+        """
+        Test the results written as CSV and as JSON lines, in the order of the input.
+        """
+        output = io.StringIO()
+        self.assertEqual(run(self.lines, output), 2, 'run(...) errors')
+        self.assertEqual(output.getvalue().splitlines(), [
+            'line,expression,result,error',
+            '1,3/4 + -5/2,-7/4,',
+            '2,is_adjacent_to 1/2 1/3,True,',
+            "4,1/0,,The denominator of a fraction can't be null.",
+            '5,continued_fraction 7/3,"[2, 3]",',
+            "6,foo 1,,Invalid expression: 'foo 1'",
+            '7,1/2 >= 1/3,True,',
+        ], 'run(...) as CSV')
+
+        output = io.StringIO()
+        run(self.lines, output, 'jsonl')
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(results[0], {'line': 1, 'expression': '3/4 + -5/2', 'result': '-7/4'}, 'first JSON line')
+        self.assertEqual(results[3], {'line': 5, 'expression': 'continued_fraction 7/3', 'result': [2, 3]},
+                         'fourth JSON line')
+        self.assertIn('error', results[2], 'third JSON line')
+
+        lines = [f'{index}/7 * 7/{index + 1}\n' for index in range(1000)]
+        serial = io.StringIO()
+        run(lines, serial, chunk_size=64)
+        parallel = io.StringIO()
+        self.assertEqual(run(lines, parallel, jobs=2, chunk_size=64), 0, 'run(..., jobs=2) errors')
+        self.assertEqual(parallel.getvalue(), serial.getvalue(), 'run(..., jobs=2) keeps the order')
+
+    def test_main_arguments(self):
+        """
+        Test that the numbers of processes and of lines by chunk must be positive ints.
+        """
+        for arguments in (['--jobs', '0'], ['--jobs', '-2'], ['--jobs', 'two'], ['--chunk-size', '0']):
+            with self.assertRaises(SystemExit, msg=f'main({arguments})'), \
+                    contextlib.redirect_stderr(io.StringIO()) as error:
+                main(arguments)
+            self.assertIn('is not a positive int', error.getvalue(), f'main({arguments}) error message')
+
+
+if __name__ == '__main__':
+    unittest.main()
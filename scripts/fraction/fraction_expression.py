@@ -0,0 +1,444 @@
+"""
+Build deferred expressions on fractions and evaluate them with a single final normalization.
+
+The operators on expressions build a directed acyclic graph instead of computing fractions:
+identical subexpressions are shared, sums are kept as linear combinations over a common
+denominator and products as factors with integer exponents, so that x * y / y is x.
+An expression is compiled once into straight-line integer code, which computes unreduced
+numerators and denominators and only reduces the final result.
+"""
+import itertools
+import weakref
+
+from fraction import Fraction
+
+# The nodes are shared: building twice the same expression gives the same node
+_nodes = weakref.WeakValueDictionary()
+_serials = itertools.count()
+
+
+class Expression:
+    """Class representing a node of a deferred expression on fractions
+
+    A node is one of the following kinds, with its data :
+    - 'constant': the fraction
+    - 'variable': the name of the variable
+    - 'sum': a (constant, terms) tuple, terms being (node, coefficient) tuples, coefficients being fractions
+    - 'product': a (coefficient, factors) tuple, factors being (node, exponent) tuples, exponents being ints
+    Cancelling factors assumes that they are not null: x / x is 1.
+    """
+
+    __slots__ = ('kind', 'data', 'serial', 'compiled', '__weakref__')
+
+    @staticmethod
+    def _build(kind: str, data):
+        """Return the node of some kind and data, shared with the identical nodes
+
+        PRE : - kind: 'constant', 'variable', 'sum' or 'product'
+              - data: the data of the node, hashable, its terms or factors sorted by serial
+        POST : the node
+        """
+        key = (kind, data)
+        node = _nodes.get(key)
+        if node is None:
+            node = object.__new__(Expression)
+            node.kind = kind
+            node.data = data
+            node.serial = next(_serials)
+            node.compiled = None
+            _nodes[key] = node
+        return node
+
+    @property
+    def children(self) -> tuple:
+        """Get the operands of the node
+
+        PRE : -
+        POST : the nodes of the terms of a sum or of the factors of a product, an empty tuple otherwise
+        """
+        if self.kind in ('sum', 'product'):
+            return tuple(node for node, _ in self.data[1])
+        return ()
+
+    @property
+    def variables(self) -> set:
+        """Get the names of the variables of the expression
+
+        PRE : -
+        POST : the set of the names of the variables
+        """
+        names = set()
+        for node in self.__topological_order():
+            if node.kind == 'variable':
+                names.add(node.data)
+        return names
+
+    # ------------------ Textual representations ------------------
+
+    def __str__(self) -> str:
+        """Return a textual representation of the expression
+
+        PRE : -
+        POST : the expression with the operators +, * and **, EX: (x + 2/1*y + 1/2)
+        """
+        if self.kind == 'constant':
+            return str(self.data)
+        if self.kind == 'variable':
+            return self.data
+
+        first, items = self.data
+        if self.kind == 'sum':
+            parts = [str(node) if coefficient == 1 else f'{coefficient}*{node}' for node, coefficient in items]
+            if not first.is_zero():
+                parts.append(str(first))
+            return '(' + ' + '.join(parts) + ')'
+
+        parts = [str(node) if exponent == 1 else f'{node}**{exponent}' for node, exponent in items]
+        if first != 1:
+            parts.insert(0, str(first))
+        return '*'.join(parts)
+
+    def __repr__(self) -> str:
+        """Return the textual representation of the expression
+
+        PRE : -
+        POST : the classname and the expression, EX: <Expression: x*y>
+        """
+        return f'<Expression: {self}>'
+
+    # ------------------ Canonical forms ------------------
+
+    def __linear(self) -> tuple:
+        """Return the expression as a linear combination
+
+        PRE : -
+        POST : a (constant, terms) tuple, terms being a dict of the coefficients by node
+        """
+        if self.kind == 'constant':
+            return self.data, {}
+        if self.kind == 'sum':
+            return self.data[0], dict(self.data[1])
+        if self.kind == 'product' and self.data[0] != 1:
+            return Fraction(), {Expression.__from_factors(Fraction(1), dict(self.data[1])): self.data[0]}
+        return Fraction(), {self: Fraction(1)}
+
+    def __factors(self) -> tuple:
+        """Return the expression as a product
+
+        PRE : -
+        POST : a (coefficient, factors) tuple, factors being a dict of the exponents by node
+        """
+        if self.kind == 'constant':
+            return self.data, {}
+        if self.kind == 'product':
+            return self.data[0], dict(self.data[1])
+        return Fraction(1), {self: 1}
+
+    @staticmethod
+    def __from_terms(constant: Fraction, terms: dict):
+        """Return the node of a linear combination, without its null terms
+
+        PRE : - constant: a fraction
+              - terms: a dict of the fraction coefficients by node
+        POST : the simplest node of the linear combination
+        """
+        items = tuple(sorted(((node, coefficient) for node, coefficient in terms.items() if not coefficient.is_zero()),
+                             key=lambda item: item[0].serial))
+        if not items:
+            return Expression._build('constant', constant)
+        if constant.is_zero() and len(items) == 1:
+            # A single scaled term is a product, so that x + x and 2*x are the same node
+            node, coefficient = items[0]
+            node_coefficient, factors = node.__factors()
+            return Expression.__from_factors(node_coefficient * coefficient, factors)
+        return Expression._build('sum', (constant, items))
+
+    @staticmethod
+    def __from_factors(coefficient: Fraction, factors: dict):
+        """Return the node of a product, without its cancelled factors
+
+        PRE : - coefficient: a fraction
+              - factors: a dict of the int exponents by node
+        POST : the simplest node of the product
+        """
+        items = tuple(sorted(((node, exponent) for node, exponent in factors.items() if exponent),
+                             key=lambda item: item[0].serial))
+        if not items or coefficient.is_zero():
+            return Expression._build('constant', coefficient)
+        if coefficient == 1 and len(items) == 1 and items[0][1] == 1:
+            return items[0][0]
+        return Expression._build('product', (coefficient, items))
+
+    # ------------------ Operators overloading ------------------
+
+    def __add__(self, other):
+        """Overloading of the + operator for expressions
+
+        PRE : - other: an expression or a number supported by the fraction class
+        POST : the expression of the sum, like terms being combined
+        """
+        other = _as_expression(other)
+        if other is NotImplemented:
+            return NotImplemented
+
+        constant, terms = self.__linear()
+        other_constant, other_terms = other.__linear()
+        for node, coefficient in other_terms.items():
+            terms[node] = terms.get(node, 0) + coefficient
+        return Expression.__from_terms(constant + other_constant, terms)
+
+    def __radd__(self, other):
+        """Overloading of the reflected + operator for expressions
+
+        PRE : - other: a number supported by the fraction class
+        POST : the expression of the sum
+        """
+        return self.__add__(other)
+
+    def __neg__(self):
+        """Overloading of the unary - operator for expressions
+
+        PRE : -
+        POST : the expression of the opposite
+        """
+        constant, terms = self.__linear()
+        return Expression.__from_terms(-constant, {node: -coefficient for node, coefficient in terms.items()})
+
+    def __sub__(self, other):
+        """Overloading of the - operator for expressions
+
+        PRE : - other: an expression or a number supported by the fraction class
+        POST : the expression of the difference
+        """
+        other = _as_expression(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return self + -other
+
+    def __rsub__(self, other):
+        """Overloading of the reflected - operator for expressions
+
+        PRE : - other: a number supported by the fraction class
+        POST : the expression of the difference
+        """
+        return -self + other
+
+    def __mul__(self, other):
+        """Overloading of the * operator for expressions
+
+        PRE : - other: an expression or a number supported by the fraction class
+        POST : the expression of the product, the exponents of the same factors being added
+        """
+        other = _as_expression(other)
+        if other is NotImplemented:
+            return NotImplemented
+
+        if other.kind == 'constant' or self.kind == 'constant':
+            # Scaling a linear combination keeps it linear
+            scalar, expression = (other.data, self) if other.kind == 'constant' else (self.data, other)
+            constant, terms = expression.__linear()
+            if expression.kind == 'sum' or expression.kind == 'constant':
+                return Expression.__from_terms(constant * scalar,
+                                               {node: coefficient * scalar for node, coefficient in terms.items()})
+
+        coefficient, factors = self.__factors()
+        other_coefficient, other_factors = other.__factors()
+        for node, exponent in other_factors.items():
+            factors[node] = factors.get(node, 0) + exponent
+        return Expression.__from_factors(coefficient * other_coefficient, factors)
+
+    def __rmul__(self, other):
+        """Overloading of the reflected * operator for expressions
+
+        PRE : - other: a number supported by the fraction class
+        POST : the expression of the product
+        """
+        return self.__mul__(other)
+
+    def __truediv__(self, other):
+        """Overloading of the / operator for expressions
+
+        PRE : - other: an expression or a number supported by the fraction class
+        POST : the expression of the quotient, the common factors being cancelled
+        RAISES : - ZeroDivisionError: other is the null constant
+        """
+        other = _as_expression(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return self * other ** -1
+
+    def __rtruediv__(self, other):
+        """Overloading of the reflected / operator for expressions
+
+        PRE : - other: a number supported by the fraction class
+        POST : the expression of the quotient
+        """
+        return self ** -1 * other
+
+    def __pow__(self, other: int):
+        """Overloading of the ** operator for expressions
+
+        PRE : - other: an int
+        POST : the expression of the power
+        RAISES : - ValueError: other is not an int
+                 - ZeroDivisionError: the expression is the null constant and other is negative
+        """
+        if not isinstance(other, int):
+            raise ValueError('The exponent of an expression must be an integer.')
+
+        coefficient, factors = self.__factors()
+        if other < 0 and coefficient.is_zero():
+            raise ZeroDivisionError("The denominator of a fraction can't be null.")
+        return Expression.__from_factors(Fraction(1) / coefficient ** -other if other < 0 else coefficient ** other,
+                                         {node: exponent * other for node, exponent in factors.items()})
+
+    # ------------------ Evaluation ------------------
+
+    def __topological_order(self) -> list:
+        """Return the distinct nodes of the expression, each one after its operands
+
+        PRE : -
+        POST : the list of the nodes, the shared subexpressions appearing once
+        """
+        order = []
+        visited = set()
+        stack = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                order.append(node)
+            elif node not in visited:
+                visited.add(node)
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.children if child not in visited)
+        return order
+
+    def compile(self):
+        """Compile the expression into a function of its variables
+
+        The function is straight-line Python code on integers: each distinct node is computed once
+        as an unreduced numerator and denominator, and only the result is reduced.
+        The integers of the constants are bound in the namespace of the function rather than written
+        as literals, whose size is limited by the integer to string conversions.
+        The compiled function is cached by the node.
+
+        PRE : -
+        POST : a function taking the values of the variables as keyword arguments and returning a fraction
+        """
+        if self.compiled is not None:
+            return self.compiled
+
+        lines = ['def evaluate(**bindings):']
+        constants = {'Fraction': Fraction, '_terms': _terms}
+        bound = {}
+
+        def constant(value: int) -> str:
+            if value not in bound:
+                bound[value] = f'c{len(bound)}'
+                constants[bound[value]] = value
+            return bound[value]
+
+        names = {}
+        for index, node in enumerate(self.__topological_order()):
+            names[node] = f'n{index}', f'd{index}'
+            numerator, denominator = names[node]
+            if node.kind == 'constant':
+                lines.append(f'    {numerator}, {denominator} = {constant(node.data.numerator)}, '
+                             f'{constant(node.data.denominator)}')
+            elif node.kind == 'variable':
+                lines.append(f'    {numerator}, {denominator} = _terms(bindings[{node.data!r}])')
+            elif node.kind == 'sum':
+                offset, terms = node.data
+                lines.append(f'    {numerator}, {denominator} = {constant(offset.numerator)}, '
+                             f'{constant(offset.denominator)}')
+                for child, coefficient in terms:
+                    child_numerator, child_denominator = names[child]
+                    lines.append(f'    term_numerator = {constant(coefficient.numerator)} * {child_numerator}')
+                    lines.append(f'    term_denominator = {constant(coefficient.denominator)} * {child_denominator}')
+                    lines.append(f'    if {denominator} == term_denominator:')
+                    lines.append(f'        {numerator} += term_numerator')
+                    lines.append('    else:')
+                    lines.append(f'        {numerator} = {numerator} * term_denominator + term_numerator * {denominator}')
+                    lines.append(f'        {denominator} *= term_denominator')
+            else:
+                coefficient, factors = node.data
+                lines.append(f'    {numerator}, {denominator} = {constant(coefficient.numerator)}, '
+                             f'{constant(coefficient.denominator)}')
+                for child, exponent in factors:
+                    child_numerator, child_denominator = names[child]
+                    if exponent > 0:
+                        lines.append(f'    {numerator} *= {child_numerator} ** {exponent}')
+                        lines.append(f'    {denominator} *= {child_denominator} ** {exponent}')
+                    else:
+                        lines.append(f'    if not {child_numerator}:')
+                        lines.append('        raise ZeroDivisionError("The denominator of a fraction can\'t be null.")')
+                        lines.append(f'    {numerator} *= {child_denominator} ** {-exponent}')
+                        lines.append(f'    {denominator} *= {child_numerator} ** {-exponent}')
+        numerator, denominator = names[self]
+        lines.append(f'    return Fraction({numerator}, {denominator})')
+
+        exec(compile('\n'.join(lines), f'<expression {self.serial}>', 'exec'), constants)
+        self.compiled = constants['evaluate']
+        return self.compiled
+
+    def evaluate(self, **bindings) -> Fraction:
+        """Evaluate the expression
+
+        PRE : - bindings: the values of the variables, as numbers supported by the fraction class
+        POST : the reduced fraction value of the expression
+        RAISES : - KeyError: a variable has no value
+                 - ZeroDivisionError: the expression divides by zero
+        """
+        return self.compile()(**bindings)
+
+    __call__ = evaluate
+
+
+def _terms(value) -> tuple:
+    """Return the reduced terms of the value of a variable
+
+    PRE : - value: a number supported by the fraction class
+    POST : the (numerator, denominator) tuple of the value
+    RAISES : - TypeError: value is not a supported number
+    """
+    if isinstance(value, int):
+        return value, 1
+    if not isinstance(value, Fraction):
+        value = Fraction() + value
+    return value.numerator, value.denominator
+
+
+def _as_expression(value):
+    """Return a value as an expression
+
+    PRE : - value: an expression or a number supported by the fraction class
+    POST : the expression, a constant node for a number, or NotImplemented if value is not supported
+    """
+    if isinstance(value, Expression):
+        return value
+    value = Fraction().__add__(value)
+    if value is NotImplemented:
+        return NotImplemented
+    return Expression._build('constant', value)
+
+
+def constant(value):
+    """Return the expression of a constant
+
+    PRE : - value: a number supported by the fraction class
+    POST : the constant node of the exact fraction value
+    RAISES : - TypeError: value is not a supported number
+    """
+    node = _as_expression(value)
+    if node is NotImplemented:
+        raise TypeError(f'Unsupported constant: {value!r}')
+    return node
+
+
+def variable(name: str):
+    """Return the expression of a variable
+
+    PRE : - name: a valid keyword argument name
+    POST : the variable node, bound by the keyword argument name at evaluation
+    """
+    return Expression._build('variable', name)
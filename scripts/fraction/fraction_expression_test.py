@@ -0,0 +1,71 @@
+"""
+Test the deferred expressions on fractions.
+"""
+import random
+import unittest
+from fraction import Fraction
+from fraction_expression import constant, variable
+
+
+class ExpressionTestCase(unittest.TestCase):
+    """
+    Test the building, the simplification and the evaluation of deferred expressions.
+    """
+
+    x = variable('x')
+    y = variable('y')
+
+    def test_expression_sharing(self):
+        """
+        Test that the identical subexpressions are the same node.
+        """
+        self.assertIs(self.x + self.y, self.y + self.x, 'x + y is y + x')
+        self.assertIs((self.x + 1) * self.y, (1 + self.x) * self.y, '(x + 1)*y is (1 + x)*y')
+        self.assertIs(variable('x'), self.x, "variable('x') is x")
+        self.assertIs(constant(Fraction(1, 2)), constant(0.5), 'constant(Fraction(1, 2)) is constant(0.5)')
+        self.assertEqual((self.x + self.y).variables, {'x', 'y'}, '(x + y).variables')
+        self.assertRaises(TypeError, constant, '1/2')
+
+    def test_expression_simplification(self):
+        """
+        Test the combination of the like terms and the cancellation of the factors.
+        """
+        self.assertIs(self.x * self.y / self.y, self.x, 'x*y / y')
+        self.assertIs(self.x - self.x, constant(0), 'x - x')
+        self.assertIs(self.x + self.x, 2 * self.x, 'x + x')
+        self.assertIs((self.x + 1) / (self.x + 1), constant(1), '(x + 1) / (x + 1)')
+        self.assertIs(self.x ** 3 / self.x ** 2, self.x, 'x**3 / x**2')
+        self.assertIs(Fraction(1, 2) + self.x - Fraction(1, 2), self.x, 'Fraction(1, 2) + x - Fraction(1, 2)')
+        self.assertIs(-(-self.x), self.x, '-(-x)')
+        self.assertRaises(ZeroDivisionError, lambda: self.x / 0)
+        self.assertRaises(ValueError, lambda: self.x ** Fraction(1, 2))
+
+    def test_expression_evaluation(self):
+        """
+        Test the evaluation of expressions against the operators of the fraction class.
+        """
+        expression = (self.x + self.y) * (self.x + self.y) / self.y + self.x * self.y - 3
+        self.assertEqual(expression.evaluate(x=Fraction(1, 2), y=3), Fraction(31, 12), 'evaluate(x=1/2, y=3)')
+        self.assertEqual(expression(x=-1, y=Fraction(-2, 7)), Fraction(-17, 2), '(x=-1, y=-2/7)')
+        self.assertEqual(expression(x=0.5, y=3), Fraction(31, 12), '(x=0.5, y=3)')
+        self.assertRaises(ZeroDivisionError, expression, x=1, y=0)
+        self.assertRaises(ZeroDivisionError, (1 / (self.x - self.y)), x=2, y=2)
+        self.assertRaises(KeyError, expression, x=1)
+
+        compiled = expression.compile()
+        self.assertIs(expression.compile(), compiled, 'compile() is cached')
+
+        rng = random.Random(2021)
+        for _ in range(200):
+            x = Fraction(rng.randint(-50, 50), rng.randint(1, 50))
+            y = Fraction(rng.randint(1, 50), rng.randint(1, 50))
+            self.assertEqual(compiled(x=x, y=y), (x + y) * (x + y) / y + x * y - 3, f'compiled(x={x}, y={y})')
+
+        # Constants beyond the limit of the integer to string conversions
+        big = Fraction(10 ** 5000 + 1, 3 ** 10000)
+        expression = self.x * big + constant(big) * self.y * self.y
+        self.assertEqual(expression(x=Fraction(1, 2), y=2), big * Fraction(9, 2), '(x * big + big * y * y)(x=1/2, y=2)')
+
+
+if __name__ == '__main__':
+    unittest.main()
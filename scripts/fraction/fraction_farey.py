@@ -0,0 +1,454 @@
+"""
+Find the adjacent fractions of a collection with an index based on the Farey structure.
+Two fractions are adjacent if the absolute value of their difference is a unit fraction.
+"""
+import bisect
+import functools
+import itertools
+import math
+
+from fraction import Fraction, np
+
+# The denominators up to this bound are factored with a table of smallest prime factors
+SIEVE_LIMIT = 1 << 24 if np is not None else 1 << 20
+
+
+def _are_adjacent(numerator1: int, denominator1: int, numerator2: int, denominator2: int) -> bool:
+    """Check if two fractions are adjacent, with integer operations only
+
+    The difference of n1/d1 and n2/d2 is D/(d1*d2) with the determinant D = n2*d1 - n1*d2:
+    it is a unit fraction if and only if D is not null and divides d1*d2.
+
+    PRE : - numerator1, denominator1, numerator2, denominator2: the reduced terms of two fractions
+    POST : the absolute value of their difference is a unit fraction
+    """
+    determinant = numerator2 * denominator1 - numerator1 * denominator2
+    return determinant != 0 and denominator1 * denominator2 % determinant == 0
+
+
+def _compare_terms(terms1: tuple, terms2: tuple) -> int:
+    """Compare two fractions given by their terms, with a cross-product
+
+    PRE : - terms1, terms2: the (numerator, denominator) tuples of two fractions with positive denominators
+    POST : a negative, null or positive int, as the first fraction is lower, equal or greater than the second
+    """
+    return terms1[0] * terms2[1] - terms2[0] * terms1[1]
+
+
+def _float_value(terms: tuple) -> float:
+    """Return the float nearest to a fraction given by its terms
+
+    PRE : - terms: the (numerator, denominator) tuple of a fraction
+    POST : the correctly rounded float of numerator/denominator
+    RAISES : - OverflowError: the fraction is beyond the range of the floats
+    """
+    return terms[0] / terms[1]
+
+
+def _sorted_terms(terms: list) -> list:
+    """Sort fractions given by their terms, exactly
+
+    The correctly rounded floats keep the order of the fractions: the terms are sorted by their float
+    at C speed, and only the runs of distinct fractions with the same float are sorted by cross-products.
+
+    PRE : - terms: a list of (numerator, denominator) tuples of fractions with positive denominators
+    POST : the list of the terms, by increasing fraction
+    """
+    try:
+        terms = sorted(terms, key=_float_value)
+    except OverflowError:
+        return sorted(terms, key=functools.cmp_to_key(_compare_terms))
+
+    result = []
+    for _, run in itertools.groupby(terms, key=_float_value):
+        run = list(run)
+        if len(run) > 1:
+            run.sort(key=functools.cmp_to_key(_compare_terms))
+        result += run
+    return result
+
+
+def _bisect_terms(numerators: list, denominators: list, numerator: int, denominator: int) -> int:
+    """Locate a fraction in sorted fractions given by their terms, with cross-products
+
+    PRE : - numerators, denominators: the terms of fractions in increasing order, with positive denominators
+          - numerator, denominator: the terms of a fraction, with a positive denominator
+    POST : the index of the first fraction greater or equal to numerator/denominator
+    """
+    low, high = 0, len(numerators)
+    while low < high:
+        middle = (low + high) // 2
+        if numerators[middle] * denominator < numerator * denominators[middle]:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def _smallest_factors(limit: int):
+    """Return the table of the smallest prime factors of the integers up to a limit
+
+    PRE : - limit: a positive int
+    POST : a sequence whose item n is the smallest prime factor of n, or 0 if n is lower than 2 or prime
+    """
+    if np is not None:
+        table = np.zeros(limit + 1, dtype=np.int32)
+        for prime in range(2, math.isqrt(limit) + 1):
+            if not table[prime]:
+                multiples = table[prime * prime::prime]
+                multiples[multiples == 0] = prime
+        return table
+
+    table = [0] * (limit + 1)
+    for prime in range(2, math.isqrt(limit) + 1):
+        if not table[prime]:
+            for multiple in range(prime * prime, limit + 1, prime):
+                if not table[multiple]:
+                    table[multiple] = prime
+    return table
+
+
+def _divisors(number: int, smallest_factors) -> list:
+    """Return the divisors of a number, factored with a table of smallest prime factors
+
+    PRE : - number: a positive int, lower than the length of smallest_factors
+          - smallest_factors: a table as returned by _smallest_factors
+    POST : the list of the divisors of number, in no particular order
+    """
+    divisors = [1]
+    while number > 1:
+        prime = int(smallest_factors[number]) or number
+        power = 1
+        powers = []
+        while number % prime == 0:
+            number //= prime
+            power *= prime
+            powers.append(power)
+        divisors += [divisor * power for divisor in divisors for power in powers]
+    return divisors
+
+
+def farey_sequence(order: int):
+    """Generate the Farey sequence of some order
+
+    Each term is computed from the two previous ones, with O(1) extra memory per step.
+
+    PRE : - order: a positive int
+    POST : the reduced fractions between 0 and 1 whose denominator is lower or equal to order, in increasing order
+    """
+    numerator1, denominator1, numerator2, denominator2 = 0, 1, 1, order
+    yield Fraction._from_reduced(numerator1, denominator1)
+    while numerator2 <= order:
+        factor = (order + denominator1) // denominator2
+        numerator1, denominator1, numerator2, denominator2 = (
+            numerator2, denominator2, factor * numerator2 - numerator1, factor * denominator2 - denominator1)
+        yield Fraction._from_reduced(numerator1, denominator1)
+
+
+class FareyIndex:
+    """Class indexing fractions in increasing order to find their adjacent fractions
+
+    Let g = gcd(b, d). The determinant D of adjacent fractions a/b and c/d is g*t where t divides g,
+    so that their distance D/(b*d) is at most g*g/(b*d):
+    - the close pairs, with D <= max(b, d), lie within 1/min(b, d) of each other: they are found by
+      a sweep of the sorted fractions, each fraction being compared to the fractions within the
+      inverse of its denominator;
+    - the far pairs need g*g > D > max(b, d): g is a divisor of both denominators greater than their
+      square roots. The denominators are put in the buckets of these large divisors, found with a table
+      of smallest prime factors: with b = g*j < d = g*k, the distance is at most 1/(j*k) <= 1/(j*(j+1)),
+      so that each fraction a/(g*j) of a bucket is compared to the fractions of the bucket within
+      1/(j*(j+1)). Two fractions of a same denominator d are far adjacent when their
+      numerators differ by a divisor of d greater than 1.
+    The denominators beyond SIEVE_LIMIT are not factored: they are paired by their gcd with the other ones.
+    The fractions are compared by integer cross-products, without temporary fractions.
+    """
+
+    def __init__(self, fractions=()):
+        """This builds an index of fractions.
+
+        PRE : - fractions: an iterable of fractions
+        POST : set the following attribute :
+               - by_denominator : the dict of the indexed fractions by denominator, then by numerator
+        """
+        self.by_denominator = {}
+        self.__size = 0
+        self.__numerators = self.__denominators = None
+        self.__groups = self.__buckets = self.__unfactored = self.__smallest_factors = None
+        for fraction in fractions:
+            self.add(fraction)
+
+    def add(self, fraction: Fraction):
+        """Add a fraction to the index
+
+        PRE : - fraction: a fraction
+        POST : the fraction is indexed, once even if added several times
+        """
+        numerators = self.by_denominator.setdefault(fraction.denominator, {})
+        if fraction.numerator not in numerators:
+            numerators[fraction.numerator] = fraction
+            self.__size += 1
+            # Sorted again lazily
+            self.__numerators = None
+
+    def __len__(self) -> int:
+        """Return the number of indexed fractions
+
+        PRE : -
+        POST : the number of distinct indexed fractions
+        """
+        return self.__size
+
+    def __contains__(self, fraction) -> bool:
+        """Check if a fraction is indexed
+
+        PRE : - fraction: a fraction
+        POST : the fraction is indexed
+        """
+        return fraction.numerator in self.by_denominator.get(fraction.denominator, {})
+
+    def __sort(self):
+        """Sort and bucket the indexed fractions, once after each change of the index
+
+        PRE : -
+        POST : the terms of the sorted fractions, the sorted numerators of each denominator,
+               the buckets of the denominators by large divisor and the unfactored denominators are up to date
+        """
+        if self.__numerators is not None:
+            return
+        terms = _sorted_terms([(numerator, denominator) for denominator, numerators in self.by_denominator.items()
+                               for numerator in numerators])
+        self.__numerators = [numerator for numerator, _ in terms]
+        self.__denominators = [denominator for _, denominator in terms]
+
+        denominators = sorted(self.by_denominator)
+        self.__groups = {denominator: sorted(self.by_denominator[denominator]) for denominator in denominators}
+        limit = min(denominators[-1] if denominators else 1, SIEVE_LIMIT)
+        self.__smallest_factors = _smallest_factors(limit)
+        self.__buckets = {}
+        self.__unfactored = []
+        for denominator in denominators:
+            if denominator > limit:
+                self.__unfactored.append(denominator)
+                continue
+            for divisor in _divisors(denominator, self.__smallest_factors):
+                if divisor * divisor > denominator:
+                    self.__buckets.setdefault(divisor, []).append(denominator)
+
+    def __divisors(self, number: int):
+        """Return the divisors of a number if it is in the table of smallest prime factors
+
+        PRE : - number: a positive int
+        POST : the list of the divisors of number, or None if it is beyond the table
+        """
+        if number < len(self.__smallest_factors):
+            return _divisors(number, self.__smallest_factors)
+        return None
+
+    def __far_denominators(self, denominator: int):
+        """Generate the indexed denominators sharing with a denominator a divisor greater than their square root
+
+        PRE : - denominator: a positive int
+        POST : the (d, gcd(denominator, d)) tuples of the indexed denominators d with gcd(denominator, d)**2 > d
+        """
+        divisors = self.__divisors(denominator)
+        if divisors is None:
+            for other_denominator in self.__groups:
+                gcd = math.gcd(denominator, other_denominator)
+                if gcd * gcd > other_denominator:
+                    yield other_denominator, gcd
+            return
+
+        # Each indexed denominator is found in the bucket of its gcd with denominator only
+        for divisor in divisors:
+            for other_denominator in self.__buckets.get(divisor, ()):
+                if math.gcd(denominator, other_denominator) == divisor:
+                    yield other_denominator, divisor
+        for other_denominator in self.__unfactored:
+            gcd = math.gcd(denominator, other_denominator)
+            if gcd * gcd > other_denominator:
+                yield other_denominator, gcd
+
+    def neighbours(self, fraction: Fraction):
+        """Generate the indexed fractions adjacent to a fraction
+
+        PRE : - fraction: a fraction, indexed or not
+        POST : the indexed fractions adjacent to fraction, each once
+        """
+        self.__sort()
+        numerators, denominators = self.__numerators, self.__denominators
+        numerator, denominator = fraction.numerator, fraction.denominator
+
+        # The neighbours c/d with D <= d, within 1/denominator
+        position = _bisect_terms(numerators, denominators, numerator, denominator)
+        for other_position in range(position, len(numerators)):
+            other_numerator, other_denominator = numerators[other_position], denominators[other_position]
+            determinant = other_numerator * denominator - numerator * other_denominator
+            if determinant > other_denominator:
+                break
+            if determinant and denominator * other_denominator % determinant == 0:
+                yield self.by_denominator[other_denominator][other_numerator]
+        for other_position in range(position - 1, -1, -1):
+            other_numerator, other_denominator = numerators[other_position], denominators[other_position]
+            determinant = numerator * other_denominator - other_numerator * denominator
+            if determinant > other_denominator:
+                break
+            if denominator * other_denominator % determinant == 0:
+                yield self.by_denominator[other_denominator][other_numerator]
+
+        # The neighbours c/d with D > d, within g*g/(denominator*d)
+        for other_denominator, gcd in self.__far_denominators(denominator):
+            group = self.__groups[other_denominator]
+            square = gcd * gcd
+            product = numerator * other_denominator
+            start = bisect.bisect_left(group, -((square - product) // denominator))
+            for other_numerator in group[start:bisect.bisect_right(group, (product + square) // denominator, start)]:
+                determinant = abs(other_numerator * denominator - product)
+                if determinant > other_denominator and denominator * other_denominator % determinant == 0:
+                    yield self.by_denominator[other_denominator][other_numerator]
+
+    def adjacent_pairs(self):
+        """Generate all the pairs of adjacent indexed fractions
+
+        PRE : -
+        POST : the (smaller, greater) tuples of adjacent indexed fractions, each pair once
+        """
+        if not self.__size:
+            return
+        self.__sort()
+        yield from self.__close_pairs()
+        yield from self.__same_denominator_pairs()
+        yield from self.__bucket_pairs()
+        yield from self.__unfactored_pairs()
+
+    def __pair(self, numerator1: int, denominator1: int, numerator2: int, denominator2: int) -> tuple:
+        """Return the indexed fractions of two terms, in increasing order
+
+        PRE : - numerator1, denominator1, numerator2, denominator2: the terms of two distinct indexed fractions
+        POST : the (smaller, greater) tuple of the fractions
+        """
+        first = self.by_denominator[denominator1][numerator1]
+        second = self.by_denominator[denominator2][numerator2]
+        if numerator1 * denominator2 < numerator2 * denominator1:
+            return first, second
+        return second, first
+
+    def __close_pairs(self):
+        """Generate the adjacent pairs with D <= max(b, d)
+
+        PRE : the index is sorted
+        POST : the pairs from the smaller fraction if D <= d, from the greater one otherwise
+        """
+        numerators, denominators = self.__numerators, self.__denominators
+        count = len(numerators)
+        for position in range(count):
+            numerator, denominator = numerators[position], denominators[position]
+            for other_position in range(position + 1, count):
+                other_numerator, other_denominator = numerators[other_position], denominators[other_position]
+                determinant = other_numerator * denominator - numerator * other_denominator
+                if determinant > other_denominator:
+                    break
+                if denominator * other_denominator % determinant == 0:
+                    yield self.__pair(numerator, denominator, other_numerator, other_denominator)
+            for other_position in range(position - 1, -1, -1):
+                other_numerator, other_denominator = numerators[other_position], denominators[other_position]
+                determinant = numerator * other_denominator - other_numerator * denominator
+                if determinant > other_denominator:
+                    break
+                if determinant > denominator and denominator * other_denominator % determinant == 0:
+                    yield self.__pair(numerator, denominator, other_numerator, other_denominator)
+
+    def __same_denominator_pairs(self):
+        """Generate the far adjacent pairs of a same denominator
+
+        PRE : the index is sorted
+        POST : the pairs of fractions a/d and c/d with c - a a divisor of d greater than 1
+        """
+        for denominator, group in self.__groups.items():
+            if len(group) < 2:
+                continue
+            fractions = self.by_denominator[denominator]
+            divisors = self.__divisors(denominator)
+            if divisors is None:
+                for position, numerator in enumerate(group):
+                    for other_numerator in group[position + 1:]:
+                        difference = other_numerator - numerator
+                        if difference > 1 and denominator % difference == 0:
+                            yield fractions[numerator], fractions[other_numerator]
+                continue
+            divisors = [divisor for divisor in divisors if divisor > 1]
+            for numerator in group:
+                for divisor in divisors:
+                    if numerator + divisor in fractions:
+                        yield fractions[numerator], fractions[numerator + divisor]
+
+    def __bucket_pairs(self):
+        """Generate the far adjacent pairs of distinct factored denominators
+
+        PRE : the index is sorted
+        POST : the pairs of fractions a/(g*j) and c/(g*k) with j < k, g = gcd(g*j, g*k) and D > g*k,
+               from the bucket of g
+        """
+        numerators, denominators = self.__numerators, self.__denominators
+        buckets = {}
+        for divisor, members in self.__buckets.items():
+            if len(members) > 1:
+                for denominator in members:
+                    buckets.setdefault(denominator, []).append(divisor)
+        positions = {}
+        for position, denominator in enumerate(denominators):
+            for divisor in buckets.get(denominator, ()):
+                positions.setdefault(divisor, []).append(position)
+
+        for divisor, bucket in positions.items():
+            for index, position in enumerate(bucket):
+                numerator, denominator = numerators[position], denominators[position]
+                # The partners of greater denominators g*k, k > j, lie within 1/(j*k) <= 1/(j*(j+1))
+                cofactor = denominator // divisor
+                scale = cofactor * (cofactor + 1)
+                for other_indices in range(index + 1, len(bucket)), range(index - 1, -1, -1):
+                    for other_index in other_indices:
+                        other_position = bucket[other_index]
+                        other_numerator, other_denominator = numerators[other_position], denominators[other_position]
+                        determinant = abs(other_numerator * denominator - numerator * other_denominator)
+                        if determinant * scale > denominator * other_denominator:
+                            break
+                        if other_denominator > denominator and determinant > other_denominator \
+                                and denominator * other_denominator % determinant == 0 \
+                                and math.gcd(denominator, other_denominator) == divisor:
+                            yield self.__pair(numerator, denominator, other_numerator, other_denominator)
+
+    def __unfactored_pairs(self):
+        """Generate the far adjacent pairs of distinct denominators, the greater one being unfactored
+
+        PRE : the index is sorted
+        POST : the pairs of fractions a/b and c/d with b < d, d beyond the table of smallest prime factors,
+               g = gcd(b, d), g*g > d and D > d
+        """
+        if not self.__unfactored:
+            return
+        denominators = list(self.__groups)
+        array = np.array(denominators, dtype=np.int64) if np is not None and denominators[-1] < 1 << 62 else None
+        start = bisect.bisect_left(denominators, self.__unfactored[0])
+        for position in range(start, len(denominators)):
+            denominator = denominators[position]
+            if array is not None:
+                gcds = np.gcd(array[:position], denominator)
+                partners = [(denominators[index], int(gcds[index]))
+                            for index in np.flatnonzero(gcds > math.isqrt(denominator)).tolist()]
+            else:
+                partners = [(other_denominator, math.gcd(denominator, other_denominator))
+                            for other_denominator in denominators[:position]]
+                partners = [(other_denominator, gcd) for other_denominator, gcd in partners
+                            if gcd * gcd > denominator]
+
+            for other_denominator, gcd in partners:
+                group = self.__groups[other_denominator]
+                square = gcd * gcd
+                for numerator in self.__groups[denominator]:
+                    product = numerator * other_denominator
+                    start = bisect.bisect_left(group, -((square - product) // denominator))
+                    end = bisect.bisect_right(group, (product + square) // denominator, start)
+                    for other_numerator in group[start:end]:
+                        determinant = abs(other_numerator * denominator - product)
+                        if determinant > denominator and denominator * other_denominator % determinant == 0:
+                            yield self.__pair(numerator, denominator, other_numerator, other_denominator)
@@ -0,0 +1,120 @@
+"""
+Test the Farey index of fractions.
+"""
+import itertools
+import random
+import time
+import unittest
+from fraction import Fraction
+import fraction_farey
+from fraction_farey import FareyIndex, farey_sequence
+
+
+class FareyIndexTestCase(unittest.TestCase):
+    """
+    Test the index of adjacent fractions and the Farey sequences.
+    """
+
+    fractions = [Fraction(numerator, denominator) for denominator in range(1, 13) for numerator in range(-15, 16)]
+
+    def test_farey_sequence(self):
+        """
+        Test the generation of the Farey sequences.
+        """
+        self.assertEqual(list(farey_sequence(1)), [Fraction(0), Fraction(1)], 'farey_sequence(1)')
+        self.assertEqual(list(farey_sequence(4)), [Fraction(0), Fraction(1, 4), Fraction(1, 3), Fraction(1, 2),
+                                                    Fraction(2, 3), Fraction(3, 4), Fraction(1)], 'farey_sequence(4)')
+        sequence = list(farey_sequence(30))
+        self.assertEqual(sequence, sorted(set(sequence)), 'farey_sequence(30) is increasing')
+        self.assertTrue(all(first.is_adjacent_to(second) for first, second in zip(sequence, sequence[1:])),
+                        'farey_sequence(30) terms are adjacent')
+
+    def test_farey_index_neighbours(self):
+        """
+        Test the adjacent fractions of a fraction in the index.
+        """
+        index = FareyIndex(self.fractions)
+        self.assertEqual(len(index), len(set(self.fractions)), 'len(FareyIndex(...))')
+        self.assertIn(Fraction(-5, 4), index, 'Fraction(-5, 4) in FareyIndex(...)')
+        self.assertNotIn(Fraction(1, 13), index, 'Fraction(1, 13) in FareyIndex(...)')
+
+        for fraction in (Fraction(1, 2), Fraction(-5, 4), Fraction(7, 12), Fraction(3, 17)):
+            self.assertEqual(set(index.neighbours(fraction)),
+                             {other for other in self.fractions if fraction.is_adjacent_to(other)},
+                             f'FareyIndex(...).neighbours({fraction!r})')
+
+    def test_farey_index_adjacent_pairs(self):
+        """
+        Test all the pairs of adjacent fractions of the index against the pairwise check.
+        """
+        unique = set(self.fractions)
+        expected = {(min(first, second), max(first, second)) for first, second in itertools.combinations(unique, 2)
+                    if first.is_adjacent_to(second)}
+        pairs = list(FareyIndex(self.fractions).adjacent_pairs())
+        self.assertEqual(len(pairs), len(expected), 'FareyIndex(...).adjacent_pairs() gives each pair once')
+        self.assertEqual(set(pairs), expected, 'FareyIndex(...).adjacent_pairs()')
+
+    def test_farey_index_beats_pairwise_check(self):
+        """
+        Test that the index finds the adjacent pairs of fractions of distinct denominators faster than the pairwise
+        check.
+        """
+        rng = random.Random(2021)
+        fractions = [Fraction(rng.randint(1, denominator), denominator)
+                     for denominator in rng.sample(range(1, 10 ** 6), 1000)]
+        fractions += list(farey_sequence(20))
+
+        start = time.perf_counter()
+        expected = {(min(first, second), max(first, second)) for first, second in itertools.combinations(fractions, 2)
+                    if first.is_adjacent_to(second)}
+        pairwise = time.perf_counter() - start
+        start = time.perf_counter()
+        pairs = set(FareyIndex(fractions).adjacent_pairs())
+        indexed = time.perf_counter() - start
+
+        self.assertEqual(pairs, expected, 'FareyIndex(...).adjacent_pairs()')
+        self.assertLess(indexed, pairwise / 2, f'index in {indexed:.3f}s, pairwise check in {pairwise:.3f}s')
+
+
+    def test_farey_index_unfactored_denominators(self):
+        """
+        Test the index on denominators beyond the table of smallest prime factors against the pairwise check.
+        """
+        fractions = [Fraction(numerator, (1 << 25) * factor)
+                     for factor in (1, 2, 3, 4, 6, 12) for numerator in range(-40, 41, 3)]
+        fractions += [Fraction(numerator, denominator) for denominator in range(1, 7) for numerator in range(-7, 8)]
+        unique = set(fractions)
+        expected = {(min(first, second), max(first, second)) for first, second in itertools.combinations(unique, 2)
+                    if first.is_adjacent_to(second)}
+        limit = fraction_farey.SIEVE_LIMIT
+        for sieve_limit in (1, 1 << 12, limit):
+            fraction_farey.SIEVE_LIMIT = sieve_limit
+            try:
+                index = FareyIndex(fractions)
+                self.assertEqual(set(index.adjacent_pairs()), expected,
+                                 f'FareyIndex(...).adjacent_pairs() with SIEVE_LIMIT {sieve_limit}')
+                for fraction in (Fraction(1, 1 << 25), Fraction(-7, 3 << 26), Fraction(2, 5)):
+                    self.assertEqual(set(index.neighbours(fraction)),
+                                     {other for other in fractions if fraction.is_adjacent_to(other)},
+                                     f'FareyIndex(...).neighbours({fraction!r})')
+            finally:
+                fraction_farey.SIEVE_LIMIT = limit
+
+    def test_farey_index_scales(self):
+        """
+        Test that the index of 20000 fractions of distinct denominators finds its adjacent pairs in a few seconds.
+        """
+        rng = random.Random(2024)
+        fractions = [Fraction(rng.randint(1, denominator), denominator)
+                     for denominator in rng.sample(range(1, 10 ** 6), 20000)]
+        start = time.perf_counter()
+        index = FareyIndex(fractions)
+        pairs = list(index.adjacent_pairs())
+        elapsed = time.perf_counter() - start
+        self.assertTrue(all(first < second and first.is_adjacent_to(second) for first, second in pairs),
+                        'FareyIndex(...).adjacent_pairs() are ordered adjacent pairs')
+        self.assertLess(elapsed, 5, f'FareyIndex(...).adjacent_pairs() of 20000 fractions in {elapsed:.3f}s')
+
+
+if __name__ == "__main__":
+    unittest.main()
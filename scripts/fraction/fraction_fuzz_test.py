@@ -0,0 +1,270 @@
+"""
+Test the fraction class against the fractions module of the standard library on random operands,
+and the growth of the runtime of its key operations.
+
+The seed and the number of iterations of the differential tests can be changed to fuzz longer:
+    FRACTION_FUZZ_SEED=7 FRACTION_FUZZ_ITERATIONS=100000 python -m pytest fraction_fuzz_test.py
+"""
+import fractions
+import math
+import operator
+import os
+import random
+import sys
+import timeit
+import unittest
+from fraction import Fraction
+
+SEED = int(os.environ.get('FRACTION_FUZZ_SEED', 2021))
+ITERATIONS = int(os.environ.get('FRACTION_FUZZ_ITERATIONS', 1500))
+BIT_LENGTHS = (1, 2, 8, 31, 64, 65, 512, 4096, 12000)
+# The terms of a few fractions only are far beyond the default limit of the int to str conversions,
+# their operations being slow
+HUGE_BIT_LENGTHS = (100000,)
+HUGE_RATE = 0.003
+
+BINARY_OPERATORS = {
+    'add': operator.add,
+    'sub': operator.sub,
+    'mul': operator.mul,
+    'truediv': operator.truediv,
+    'eq': operator.eq,
+    'ne': operator.ne,
+    'lt': operator.lt,
+    'le': operator.le,
+    'gt': operator.gt,
+    'ge': operator.ge,
+}
+
+
+def random_terms(rng: random.Random) -> tuple:
+    """Return random terms of a fraction, not reduced
+
+    PRE : - rng: a random generator
+    POST : a (numerator, denominator) tuple of random bit lengths and signs, the numerator being null once in ten
+           and the bit lengths being huge with the probability HUGE_RATE
+    """
+    if rng.random() < 0.1:
+        return 0, rng.choice((1, -1, 5))
+    bit_lengths = HUGE_BIT_LENGTHS if rng.random() < HUGE_RATE else BIT_LENGTHS
+    numerator = rng.getrandbits(rng.choice(bit_lengths)) or 1
+    denominator = rng.getrandbits(rng.choice(bit_lengths)) or 1
+    return numerator if rng.random() < 0.5 else -numerator, denominator if rng.random() < 0.8 else -denominator
+
+
+def shown(integer: int) -> str:
+    """Return an int as shown in the messages
+
+    PRE : - integer: an int
+    POST : the decimal digits of integer, or its sign, bit length and lowest hex digits if it has huge bit length
+    """
+    if integer.bit_length() <= max(BIT_LENGTHS):
+        return str(integer)
+    return f'{"-" if integer < 0 else ""}<{integer.bit_length()} bits ...{abs(integer) & 0xffffffff:08x}>'
+
+
+def described(terms: tuple) -> str:
+    """Return the construction of a fraction as shown in the messages
+
+    PRE : - terms: a (numerator, denominator) tuple of ints
+    POST : the call to the fraction class with the terms, EX: Fraction(3, -4)
+    """
+    return f'Fraction({shown(terms[0])}, {shown(terms[1])})'
+
+
+def outcome(function, *arguments):
+    """Return the result of a function, or the type of the exception it raised
+
+    PRE : - function: a function
+          - arguments: its arguments
+    POST : the (numerator, denominator) tuple of a fraction result, the result itself otherwise,
+           or the type of the ZeroDivisionError, ValueError or OverflowError raised
+    """
+    try:
+        result = function(*arguments)
+    except (ZeroDivisionError, ValueError, OverflowError) as error:
+        return type(error)
+    if isinstance(result, (Fraction, fractions.Fraction)):
+        return 'fraction', result.numerator, result.denominator
+    return type(result).__name__, result
+
+
+class FractionFuzzTestCase(unittest.TestCase):
+    """
+    Differential tests of every operator, comparison and predicate against fractions.Fraction.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Lift the limit of the int to str conversions, which the huge terms exceed.
+        """
+        cls.max_str_digits = sys.get_int_max_str_digits()
+        sys.set_int_max_str_digits(0)
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        Restore the limit of the int to str conversions.
+        """
+        sys.set_int_max_str_digits(cls.max_str_digits)
+
+    def assertSameOutcome(self, function, reference, arguments, reference_arguments, message):
+        """
+        Check that function(*arguments) and reference(*reference_arguments) return equal values or raise the same error.
+        """
+        self.assertEqual(outcome(function, *arguments), outcome(reference, *reference_arguments),
+                         f'{message} (seed {SEED})')
+
+    def test_fuzz_operators(self):
+        """
+        Test the binary operators and comparisons, between fractions and with integers and stdlib fractions.
+        """
+        rng = random.Random(SEED)
+        for _ in range(ITERATIONS):
+            terms1 = random_terms(rng)
+            terms2 = random_terms(rng)
+            first, second = Fraction(*terms1), Fraction(*terms2)
+            reference1, reference2 = fractions.Fraction(*terms1), fractions.Fraction(*terms2)
+            integer = rng.getrandbits(rng.choice(BIT_LENGTHS)) * rng.choice((1, -1))
+            for name, function in BINARY_OPERATORS.items():
+                self.assertSameOutcome(function, function, (first, second), (reference1, reference2),
+                                       f'{name}({described(terms1)}, {described(terms2)})')
+                self.assertSameOutcome(function, function, (first, integer), (reference1, integer),
+                                       f'{name}({described(terms1)}, {shown(integer)})')
+                self.assertSameOutcome(function, function, (integer, first), (integer, reference1),
+                                       f'{name}({shown(integer)}, {described(terms1)})')
+                self.assertSameOutcome(function, function, (first, reference2), (reference1, reference2),
+                                       f'{name}({described(terms1)}, fractions.{described(terms2)})')
+
+    def test_fuzz_unary(self):
+        """
+        Test the unary operators, the conversions, the hash and the predicates.
+        """
+        rng = random.Random(SEED + 1)
+        for _ in range(ITERATIONS):
+            terms1 = random_terms(rng)
+            terms2 = random_terms(rng)
+            first, second = Fraction(*terms1), Fraction(*terms2)
+            reference1, reference2 = fractions.Fraction(*terms1), fractions.Fraction(*terms2)
+            message = described(terms1)
+
+            for name, function in (('abs', operator.abs), ('neg', operator.neg), ('pos', operator.pos),
+                                   ('float', float), ('hash', hash), ('bool', bool), ('int', int),
+                                   ('trunc', math.trunc), ('floor', math.floor), ('ceil', math.ceil), ('round', round)):
+                self.assertSameOutcome(function, function, (first,), (reference1,), f'{name}({message})')
+
+            self.assertEqual(first.is_zero(), reference1 == 0, f'{message}.is_zero()')
+            self.assertEqual(first.is_integer(), reference1.denominator == 1, f'{message}.is_integer()')
+            self.assertEqual(first.is_proper(), abs(reference1) < 1, f'{message}.is_proper()')
+            self.assertEqual(first.is_unit(), reference1.numerator == 1, f'{message}.is_unit()')
+            self.assertEqual(first.is_adjacent_to(second), abs(reference1 - reference2).numerator == 1,
+                             f'{message}.is_adjacent_to({described(terms2)})')
+            self.assertEqual(str(first), f'{reference1.numerator}/{reference1.denominator}', f'str({message})')
+            self.assertEqual(Fraction.from_string(str(first)), first, f'Fraction.from_string(str({message}))')
+            self.assertEqual(Fraction.from_bytes(first.to_bytes()), first, f'Fraction.from_bytes({message})')
+            integer_part, remainder = divmod(reference1.numerator, reference1.denominator)
+            self.assertEqual(first.as_mixed_number(),
+                             f'{integer_part} + {remainder}/{reference1.denominator}'
+                             if remainder else f'{integer_part} + 0/1', f'{message}.as_mixed_number()')
+
+            max_denominator = rng.choice((1, 2, 10, 1000, 10 ** 9))
+            self.assertSameOutcome(Fraction.limit_denominator, fractions.Fraction.limit_denominator,
+                                   (first, max_denominator), (reference1, max_denominator),
+                                   f'{message}.limit_denominator({max_denominator})')
+
+    def test_fuzz_pow(self):
+        """
+        Test the powers with small, negative and huge integer exponents, and with integral fraction exponents.
+        """
+        rng = random.Random(SEED + 2)
+        for _ in range(ITERATIONS):
+            terms = random_terms(rng)
+            if max(abs(term) for term in terms).bit_length() > 512:
+                continue
+            base, reference = Fraction(*terms), fractions.Fraction(*terms)
+            exponent = rng.choice((0, 1, 2, 3, 7, 25, -1, -2, -3, -7))
+            self.assertSameOutcome(operator.pow, operator.pow, (base, exponent), (reference, exponent),
+                                   f'{described(terms)} ** {exponent}')
+            self.assertSameOutcome(operator.pow, operator.pow, (base, Fraction(exponent)), (reference, exponent),
+                                   f'{described(terms)} ** Fraction({exponent})')
+
+        for terms in ((1, 1), (-1, 1), (0, 1), (1, -1)):
+            for exponent in (10 ** 18, 10 ** 18 + 1, -(10 ** 18) - 1):
+                self.assertSameOutcome(operator.pow, operator.pow, (Fraction(*terms), exponent),
+                                       (fractions.Fraction(*terms), exponent), f'{described(terms)} ** {exponent}')
+        self.assertSameOutcome(operator.pow, operator.pow, (Fraction(-2, 3), 10001),
+                               (fractions.Fraction(-2, 3), 10001), 'Fraction(-2, 3) ** 10001')
+
+    def test_fuzz_pow_zero_negative(self):
+        """
+        Test that the powers of a null fraction by negative integers raise a ZeroDivisionError,
+        as fractions.Fraction does.
+        """
+        for exponent in (-1, -2, -7, -(10 ** 18) - 1):
+            self.assertSameOutcome(operator.pow, operator.pow, (Fraction(), exponent), (fractions.Fraction(), exponent),
+                                   f'Fraction() ** {exponent}')
+
+
+class FractionComplexityTestCase(unittest.TestCase):
+    """
+    Test that the runtime of key operations grows within their declared complexity.
+
+    Each operation is timed on operands of a size and of four times this size: the observed exponent
+    log4(time ratio) must not exceed the declared one by more than a margin absorbing the noise,
+    which still catches a complexity one degree higher.
+    """
+
+    MARGIN = 0.6
+    FACTOR = 4
+
+    def assertComplexity(self, setup, function, size: int, exponent: float, message: str):
+        """
+        Check the growth of the runtime of function(*setup(size)) between size and FACTOR * size.
+        """
+        times = []
+        for scaled in (size, self.FACTOR * size):
+            arguments = setup(scaled)
+            timer = timeit.Timer(lambda: function(*arguments))
+            number = max(1, int(0.02 / max(timer.timeit(1), 1e-7)))
+            times.append(min(timer.repeat(repeat=5, number=number)) / number)
+        observed = math.log(times[1] / times[0], self.FACTOR)
+        self.assertLessEqual(observed, exponent + self.MARGIN,
+                             f'{message}: observed exponent {observed:.2f} for a declared {exponent}')
+
+    @staticmethod
+    def operands(bits: int) -> tuple:
+        """
+        Return two random fractions whose terms have bits bits.
+        """
+        rng = random.Random(bits)
+        return tuple(Fraction(rng.getrandbits(bits) | 1 << (bits - 1), rng.getrandbits(bits) | 1 << (bits - 1))
+                     for _ in range(2))
+
+    def test_complexity_arithmetic(self):
+        """
+        Test the construction, the arithmetic operators and the comparisons: at most quadratic in the bit size.
+        """
+        rng = random.Random(SEED)
+        self.assertComplexity(lambda bits: (rng.getrandbits(bits), rng.getrandbits(bits) | 1), Fraction, 20000, 2,
+                              'Fraction(n, d)')
+        for name in ('add', 'sub', 'mul', 'truediv', 'lt', 'eq'):
+            self.assertComplexity(self.operands, BINARY_OPERATORS[name], 20000, 2, name)
+        self.assertComplexity(lambda bits: self.operands(bits)[:1], hash, 20000, 2, 'hash')
+        self.assertComplexity(self.operands, Fraction.is_adjacent_to, 20000, 2, 'is_adjacent_to')
+
+    def test_complexity_reductions(self):
+        """
+        Test the sum of many small fractions: quasi-linear in their number with the balanced reduction.
+        """
+        def setup(count):
+            rng = random.Random(count)
+            return [Fraction(rng.randint(1, 100), rng.randint(1, 100)) for _ in range(count)],
+
+        self.assertComplexity(setup, Fraction.sum, 2000, 1.2, 'Fraction.sum')
+        self.assertComplexity(lambda count: ([Fraction(1, index) for index in range(1, count + 1)],),
+                              Fraction.sum, 1000, 2, 'Fraction.sum of the harmonic series')
+
+
+if __name__ == '__main__':
+    unittest.main()
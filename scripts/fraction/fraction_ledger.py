@@ -0,0 +1,238 @@
+"""
+Keep balances of fractions as integer multiples of a declared denominator.
+
+A ledger is declared with the denominator of its data, EX: 100 for cents or 360 for degrees.
+Each account stores its balance as an integer number of units of its own denominator, which is
+the declared one until an amount with a foreign denominator is posted to the account: only this
+account is then rescaled, to the lowest common multiple of both denominators. Posting an amount
+whose denominator divides the one of its account is a plain integer addition, with no gcd.
+The balances are converted to and from fractions losslessly.
+"""
+import math
+
+from fraction import Fraction
+
+
+def _terms(amount) -> tuple:
+    """Return the terms of an amount
+
+    PRE : - amount: an int, a fraction or a number supported by the fraction class, EX: a Decimal
+    POST : the (numerator, denominator) tuple of the exact amount
+    RAISES : - TypeError: amount is not a supported number
+    """
+    if isinstance(amount, int):
+        return amount, 1
+    if not isinstance(amount, Fraction):
+        converted = Fraction().__add__(amount)
+        if converted is NotImplemented:
+            raise TypeError(f'Unsupported amount: {amount!r}')
+        amount = converted
+    return amount.numerator, amount.denominator
+
+
+class Ledger:
+    """Class representing accounts whose balances are integer multiples of a declared denominator
+
+    Each account is stored as a [units, denominator] list: its balance is units / denominator,
+    denominator being a multiple of the declared one.
+    """
+
+    __slots__ = ('__denominator', '__accounts')
+
+    def __init__(self, denominator: int = 1, balances=None):
+        """This builds a ledger.
+
+        PRE : - denominator: a positive int, the denominator of the amounts, EX: 100 for cents
+              - balances: a dict of the initial balances by account, or None
+        POST : set the following attributes :
+               - denominator : the declared denominator
+               - accounts : the dict of the [units, denominator] lists by account
+        RAISES : - ValueError: denominator is not positive
+                 - TypeError: a balance is not a supported number
+        """
+        if not isinstance(denominator, int) or denominator <= 0:
+            raise ValueError('The denominator of a ledger must be a positive integer.')
+        self.__denominator = denominator
+        self.__accounts = {}
+        if balances is not None:
+            self.post_many(balances.items())
+
+    @property
+    def denominator(self) -> int:
+        """Get the declared denominator
+
+        PRE : -
+        POST : the declared denominator
+        """
+        return self.__denominator
+
+    def __len__(self) -> int:
+        """Return the number of accounts
+
+        PRE : -
+        POST : the number of accounts with postings
+        """
+        return len(self.__accounts)
+
+    def __contains__(self, account) -> bool:
+        """Check if an account has postings
+
+        PRE : - account: a hashable account key
+        POST : account has postings
+        """
+        return account in self.__accounts
+
+    def __iter__(self):
+        """Iterate over the accounts
+
+        PRE : -
+        POST : the accounts with postings, in order of first posting
+        """
+        return iter(self.__accounts)
+
+    def __repr__(self) -> str:
+        """Return the textual representation of the ledger
+
+        PRE : -
+        POST : the classname, the denominator and the number of accounts, EX: <Ledger: 1/100, 3 accounts>
+        """
+        return f'<Ledger: 1/{self.__denominator}, {len(self.__accounts)} accounts>'
+
+    # ------------------ Postings ------------------
+
+    def post(self, account, amount):
+        """Post an amount to an account
+
+        PRE : - account: a hashable account key
+              - amount: an int, a fraction or a number supported by the fraction class
+        POST : the balance of account is increased by amount, exactly
+        RAISES : - TypeError: amount is not a supported number
+        """
+        self.post_many(((account, amount),))
+
+    def post_many(self, postings):
+        """Post amounts to accounts
+
+        PRE : - postings: an iterable of (account, amount) tuples, as for post
+        POST : the balances are increased by the amounts, exactly
+        RAISES : - TypeError: an amount is not a supported number; the previous postings are kept
+        """
+        accounts = self.__accounts
+        declared = self.__denominator
+        for account, amount in postings:
+            if type(amount) is int:
+                entry = accounts.get(account)
+                if entry is None:
+                    entry = accounts[account] = [0, declared]
+                entry[0] += amount * entry[1]
+                continue
+
+            if type(amount) is Fraction:
+                numerator, denominator = amount.numerator, amount.denominator
+            else:
+                # Converted before the account is opened: an invalid amount leaves no empty account
+                numerator, denominator = _terms(amount)
+            entry = accounts.get(account)
+            if entry is None:
+                entry = accounts[account] = [0, declared]
+            scale = entry[1]
+            if scale % denominator:
+                # Lazy rescaling of this account only
+                factor = denominator // math.gcd(scale, denominator)
+                entry[0] *= factor
+                entry[1] = scale = scale * factor
+            entry[0] += numerator * (scale // denominator)
+
+    def post_units(self, account, units: int):
+        """Post an amount given as a number of units of the declared denominator
+
+        PRE : - account: a hashable account key
+              - units: an int, EX: a number of cents
+        POST : the balance of account is increased by units / denominator
+        """
+        self.post_units_many(((account, units),))
+
+    def post_units_many(self, postings):
+        """Post amounts given as numbers of units of the declared denominator
+
+        This is the fastest way to post: each posting is an integer addition.
+
+        PRE : - postings: an iterable of (account, units) tuples, units being ints
+        POST : the balances are increased by the units / denominator
+        """
+        accounts = self.__accounts
+        declared = self.__denominator
+        for account, units in postings:
+            entry = accounts.get(account)
+            if entry is None:
+                accounts[account] = [units, declared]
+            elif entry[1] == declared:
+                entry[0] += units
+            else:
+                entry[0] += units * (entry[1] // declared)
+
+    def transfer(self, source, destination, amount):
+        """Move an amount from an account to another one
+
+        PRE : - source, destination: hashable account keys
+              - amount: an int, a fraction or a number supported by the fraction class
+        POST : the balance of source is decreased by amount and the one of destination increased by amount
+        RAISES : - TypeError: amount is not a supported number
+        """
+        numerator, denominator = _terms(amount)
+        self.post_many(((source, Fraction._from_reduced(-numerator, denominator)),
+                        (destination, Fraction._from_reduced(numerator, denominator))))
+
+    def compact(self):
+        """Bring the rescaled accounts back to the smallest denominator multiple of the declared one
+
+        PRE : -
+        POST : the balances are unchanged, each account denominator being the lowest common multiple
+               of the declared denominator and of the reduced denominator of its balance
+        """
+        declared = self.__denominator
+        for entry in self.__accounts.values():
+            units, scale = entry
+            if scale != declared:
+                reduced = math.lcm(declared, scale // math.gcd(units, scale))
+                entry[0] = units * reduced // scale
+                entry[1] = reduced
+
+    # ------------------ Balances ------------------
+
+    def units(self, account) -> tuple:
+        """Return the raw balance of an account
+
+        PRE : - account: a hashable account key
+        POST : the (units, denominator) tuple of the balance, (0, denominator) for an account without postings
+        """
+        entry = self.__accounts.get(account)
+        return (0, self.__denominator) if entry is None else tuple(entry)
+
+    def balance(self, account) -> Fraction:
+        """Return the balance of an account
+
+        PRE : - account: a hashable account key
+        POST : the exact balance, 0 for an account without postings
+        """
+        return Fraction(*self.units(account))
+
+    def balances(self) -> dict:
+        """Return the balances of all the accounts
+
+        PRE : -
+        POST : the dict of the exact balances by account
+        """
+        return {account: Fraction(units, scale) for account, (units, scale) in self.__accounts.items()}
+
+    def total(self) -> Fraction:
+        """Return the sum of the balances
+
+        PRE : -
+        POST : the exact sum of the balances, summed over the common denominator of the accounts
+        """
+        common = self.__denominator
+        for _, scale in self.__accounts.values():
+            if common % scale:
+                common = math.lcm(common, scale)
+        return Fraction(sum(units * (common // scale) for units, scale in self.__accounts.values()), common)
@@ -0,0 +1,66 @@
+"""
+Test the ledgers of fractions.
+"""
+import random
+import unittest
+from decimal import Decimal
+from fraction import Fraction
+from fraction_ledger import Ledger
+
+
+class LedgerTestCase(unittest.TestCase):
+    """
+    Test the postings, the lazy rescaling and the balances of the ledgers.
+    """
+
+    def test_ledger_postings(self):
+        """
+        Test the postings of amounts and of units, against sums of fractions.
+        """
+        ledger = Ledger(100, {'cash': Fraction(1, 4)})
+        ledger.post('cash', 3)
+        ledger.post('bank', Decimal('12.34'))
+        ledger.post_units('bank', -34)
+        ledger.transfer('cash', 'bank', Fraction(1, 2))
+        self.assertEqual(ledger.balances(), {'cash': Fraction(11, 4), 'bank': Fraction(25, 2)}, 'balances()')
+        self.assertEqual(ledger.units('cash'), (275, 100), "units('cash')")
+        self.assertEqual(ledger.balance('unknown'), Fraction(0), "balance('unknown')")
+        self.assertEqual(ledger.total(), Fraction(61, 4), 'total()')
+        self.assertEqual((len(ledger), 'cash' in ledger, list(ledger)), (2, True, ['cash', 'bank']), 'accounts')
+        self.assertEqual(repr(ledger), '<Ledger: 1/100, 2 accounts>', 'repr(ledger)')
+        self.assertRaises(TypeError, ledger.post, 'cash', '1/2')
+        self.assertRaises(TypeError, ledger.post, 'card', '1/2')
+        self.assertEqual((len(ledger), 'card' in ledger, ledger.balances()),
+                         (2, False, {'cash': Fraction(11, 4), 'bank': Fraction(25, 2)}), 'no account after a TypeError')
+        self.assertRaises(ValueError, Ledger, 0)
+
+        rng = random.Random(2021)
+        postings = [(rng.randrange(10), Fraction(rng.randint(-10 ** 6, 10 ** 6), rng.choice((1, 2, 5, 100))))
+                    for _ in range(2000)]
+        ledger = Ledger(100)
+        ledger.post_many(postings)
+        expected = {}
+        for account, amount in postings:
+            expected[account] = expected.get(account, Fraction()) + amount
+        self.assertEqual(ledger.balances(), expected, 'balances() after postings')
+        self.assertTrue(all(ledger.units(account)[1] == 100 for account in ledger), 'no rescaling')
+
+    def test_ledger_rescaling(self):
+        """
+        Test the lazy rescaling of the accounts receiving foreign denominators, and the compaction.
+        """
+        ledger = Ledger(60)
+        ledger.post_units_many([('a', 90), ('b', 30)])
+        ledger.post('a', Fraction(1, 7))
+        self.assertEqual(ledger.units('a'), (90 * 7 + 60, 420), "units('a') after 1/7")
+        self.assertEqual(ledger.units('b'), (30, 60), "units('b') is not rescaled")
+        ledger.post_units('a', 6)
+        ledger.post('a', Fraction(-1, 7))
+        self.assertEqual(ledger.balance('a'), Fraction(8, 5), "balance('a')")
+        self.assertEqual(ledger.total(), Fraction(21, 10), 'total()')
+        ledger.compact()
+        self.assertEqual(ledger.units('a'), (96, 60), "units('a') after compact()")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,470 @@
+"""
+Solve linear systems exactly with matrices of fractions.
+
+The eliminations never compute with fractions: each row is scaled to integers by the common
+denominator of its entries. With numpy, the determinant and the solutions are then computed by
+Gaussian elimination modulo word-sized primes, enough of them for the Chinese remainder theorem
+to recover every minor below the Hadamard bound, so that the cost only grows with the size of the
+result. Otherwise, and for the rank, Bareiss fraction-free elimination keeps every intermediate
+entry an integer minor of the matrix, with exact divisions by the previous pivot.
+The fractions are only built back from the integer results.
+"""
+import math
+
+from fraction import Fraction, np
+from fraction_modular import _prime
+
+
+def _integer_row(row) -> tuple:
+    """Return a row of fractions scaled to integers
+
+    PRE : - row: a sequence of fractions
+    POST : a (integers, scale) tuple, integers being the entries multiplied by scale,
+           the positive lowest common multiple of the denominators
+    """
+    scale = math.lcm(*(entry.denominator for entry in row)) if row else 1
+    return [entry.numerator * (scale // entry.denominator) for entry in row], scale
+
+
+def _bareiss(rows: list, columns: int) -> tuple:
+    """Reduce integer rows to a row echelon form with the Bareiss fraction-free elimination
+
+    The rows are modified in place. Each eliminated entry is (p*a - b*c) // q, q being
+    the previous pivot, which divides it exactly.
+
+    PRE : - rows: a list of lists of ints
+          - columns: the number of columns to eliminate, the next ones being only updated
+    POST : a (pivots, sign) tuple, pivots being the list of the (row, column) positions of the pivots
+           and sign being -1 if an odd number of rows were swapped, 1 otherwise.
+           The entries below the pivots are left as they are, instead of being set to zero
+    """
+    pivots = []
+    sign = 1
+    previous = 1
+    rank = 0
+    for column in range(columns):
+        if rank == len(rows):
+            break
+        pivot_row = next((index for index in range(rank, len(rows)) if rows[index][column]), None)
+        if pivot_row is None:
+            continue
+        if pivot_row != rank:
+            rows[rank], rows[pivot_row] = rows[pivot_row], rows[rank]
+            sign = -sign
+
+        row = rows[rank]
+        pivot = row[column]
+        for index in range(rank + 1, len(rows)):
+            other = rows[index]
+            factor = other[column]
+            # The entries left of the column are never read again: only the rest of the row is updated
+            if factor:
+                other[column + 1:] = [(pivot * entry - factor * value) // previous
+                                      for entry, value in zip(other[column + 1:], row[column + 1:])]
+            elif pivot != previous:
+                other[column + 1:] = [pivot * entry // previous for entry in other[column + 1:]]
+
+        pivots.append((rank, column))
+        previous = pivot
+        rank += 1
+    return pivots, sign
+
+
+def _hadamard_bits(rows: list) -> int:
+    """Return a bound on the bit length of the minors of integer rows
+
+    PRE : - rows: a list of lists of ints
+    POST : an int b such that every minor of the rows is lower than 2**b in absolute value,
+           by Hadamard's inequality: a minor is at most the product of the norms of the rows
+    """
+    return sum((math.isqrt(sum(entry * entry for entry in row)) + 1).bit_length() for row in rows)
+
+
+def _eliminate_modulo(matrix, size: int, prime: int) -> tuple:
+    """Solve integer linear systems modulo a prime by Gaussian elimination
+
+    The matrix is modified in place, each pivot step only updating the rows below the pivot.
+
+    PRE : - matrix: an int64 array of residues modulo prime, with size rows and at least size columns
+          - size: the number of rows
+          - prime: a prime lower than 2**31, so that the products of residues fit in an int64
+    POST : a (determinant, solutions) tuple, determinant being the determinant of the size first columns
+           modulo prime and solutions the int64 array of the solutions modulo prime of the systems whose
+           right-hand sides are the next columns, or None if the determinant is null modulo prime
+    """
+    determinant = 1
+    for column in range(size):
+        candidates = np.flatnonzero(matrix[column:, column])
+        if not candidates.size:
+            return 0, None
+        pivot = column + int(candidates[0])
+        if pivot != column:
+            matrix[[column, pivot]] = matrix[[pivot, column]]
+            determinant = -determinant
+        value = int(matrix[column, column])
+        determinant = determinant * value % prime
+        row = matrix[column, column:] * pow(value, -1, prime) % prime
+        matrix[column, column:] = row
+        below = matrix[column + 1:, column:]
+        below -= np.outer(below[:, 0], row)
+        below %= prime
+
+    # The pivots are 1: the back substitution subtracts each solution from the rows above
+    solutions = matrix[:, size:]
+    for index in range(size - 1, 0, -1) if solutions.size else ():
+        solutions[:index] -= np.outer(matrix[:index, index], solutions[index])
+        solutions[:index] %= prime
+    return determinant, solutions
+
+
+def _chinese_remainder(residues: list, primes: list):
+    """Return the integers of least absolute values congruent to residues modulo primes
+
+    PRE : - residues: a list of ints, or a list of lists of ints of a same length, one per prime
+          - primes: a non-empty list of distinct primes
+    POST : the int in ]-M/2, M/2], M being the product of the primes, congruent to each residue
+           modulo its prime, or the list of them for lists of residues
+    """
+    modulus = math.prod(primes)
+    coefficients = [modulus // prime * pow(modulus // prime, -1, prime) for prime in primes]
+    half = modulus // 2
+
+    def symmetric(value):
+        value %= modulus
+        return value - modulus if value > half else value
+
+    if isinstance(residues[0], int):
+        return symmetric(sum(map(int.__mul__, residues, coefficients)))
+    return [symmetric(sum(map(int.__mul__, values, coefficients))) for values in zip(*residues)]
+
+
+def _modular_minors(rows: list, size: int) -> tuple:
+    """Return the determinant of integer rows and the products of the determinant by the solutions
+
+    The rows are reduced modulo one prime after another, until the product of the primes is greater
+    than twice the Hadamard bound, for the determinant and for the primes not dividing it. Every
+    product of the determinant by a solution is a minor, by Cramer's rule: both are recovered
+    exactly by the Chinese remainder theorem.
+
+    PRE : - rows: a non-empty list of size lists of ints, of at least size entries
+          - size: the number of rows
+    POST : a (determinant, numerators) tuple, determinant being the determinant of the size first columns
+           and numerators the list of the lists of the products of determinant by the solutions of the
+           systems whose right-hand sides are the next columns, or None if determinant is null
+    """
+    bits = _hadamard_bits(rows) + 1
+    width = len(rows[0]) - size
+    try:
+        integers = np.array(rows, dtype=np.int64)
+    except OverflowError:
+        integers = None
+
+    determinants, determinant_primes, determinant_modulus = [], [], 1
+    solutions, solution_primes, solution_modulus = [], [], 1
+    index = 0
+    while determinant_modulus.bit_length() <= bits or width and solution_modulus.bit_length() <= bits:
+        prime = _prime(index)
+        index += 1
+        if integers is not None:
+            matrix = integers % prime
+        else:
+            matrix = np.array([[entry % prime for entry in row] for row in rows], dtype=np.int64)
+        residue, solution = _eliminate_modulo(matrix, size, prime)
+        if determinant_modulus.bit_length() <= bits:
+            determinants.append(residue)
+            determinant_primes.append(prime)
+            determinant_modulus *= prime
+            if determinant_modulus.bit_length() > bits and not _chinese_remainder(determinants, determinant_primes):
+                return 0, None
+        if solution is not None and solution_modulus.bit_length() <= bits:
+            solutions.append((solution * residue % prime).ravel().tolist())
+            solution_primes.append(prime)
+            solution_modulus *= prime
+
+    determinant = _chinese_remainder(determinants, determinant_primes)
+    if not width:
+        return determinant, [[] for _ in range(size)]
+    numerators = _chinese_remainder(solutions, solution_primes)
+    return determinant, [numerators[start:start + width] for start in range(0, size * width, width)]
+
+
+class FractionMatrix:
+    """Class representing a matrix of fractions
+
+    The entries are stored as rows of fractions. The determinant, the rank, the inverse and
+    the solutions of linear systems are exact and computed by fraction-free elimination.
+    """
+
+    __slots__ = ('__rows', '__column_count')
+
+    def __init__(self, rows):
+        """This builds a matrix based on its rows.
+
+        PRE : - rows: an iterable of iterables of numbers supported by the fraction class
+        POST : set the following attributes :
+               - rows : the tuple of the rows, as tuples of fractions
+               - column_count : the number of columns
+        RAISES : - ValueError: the rows have different lengths
+                 - TypeError: an entry is not a supported number
+        """
+        self.__rows = tuple(tuple(_as_fraction(entry) for entry in row) for row in rows)
+        self.__column_count = len(self.__rows[0]) if self.__rows else 0
+        if any(len(row) != self.__column_count for row in self.__rows):
+            raise ValueError('The rows of a matrix must have the same length.')
+
+    @staticmethod
+    def identity(size: int):
+        """Return an identity matrix
+
+        PRE : - size: a positive int
+        POST : the identity matrix of size rows and columns
+        """
+        return FractionMatrix([[1 if row == column else 0 for column in range(size)] for row in range(size)])
+
+    @property
+    def rows(self) -> tuple:
+        """Get the rows of the matrix
+
+        PRE : -
+        POST : the tuple of the rows, as tuples of fractions
+        """
+        return self.__rows
+
+    @property
+    def shape(self) -> tuple:
+        """Get the shape of the matrix
+
+        PRE : -
+        POST : the (number of rows, number of columns) tuple
+        """
+        return len(self.__rows), self.__column_count
+
+    def __getitem__(self, position: tuple) -> Fraction:
+        """Return an entry of the matrix
+
+        PRE : - position: a (row, column) tuple of ints
+        POST : the fraction at position
+        RAISES : - IndexError: position is out of the matrix
+        """
+        row, column = position
+        return self.__rows[row][column]
+
+    def __eq__(self, other) -> bool:
+        """Overloading of the == operator for matrices
+
+        PRE : - other: a matrix
+        POST : both matrices have the same entries
+        """
+        if not isinstance(other, FractionMatrix):
+            return NotImplemented
+        return self.__rows == other.__rows
+
+    __hash__ = None
+
+    def transpose(self):
+        """Return the transpose of the matrix
+
+        PRE : -
+        POST : the matrix whose rows are the columns of this matrix
+        """
+        return FractionMatrix(zip(*self.__rows)) if self.__rows else FractionMatrix([])
+
+    # ------------------ Textual representations ------------------
+
+    def __str__(self) -> str:
+        """Return a textual representation of the matrix
+
+        PRE : -
+        POST : the rows of fractions separated by commas, between brackets
+               EX: [[.../..., .../...], [.../..., .../...]]
+        """
+        return '[' + ', '.join('[' + ', '.join(str(entry) for entry in row) + ']' for row in self.__rows) + ']'
+
+    def __repr__(self) -> str:
+        """Return the textual representation of the matrix
+
+        PRE : -
+        POST : the classname and the rows
+               EX: <FractionMatrix: [[.../..., .../...], [.../..., .../...]]>
+        """
+        return f'<FractionMatrix: {self}>'
+
+    # ------------------ Operators overloading ------------------
+
+    def __add__(self, other):
+        """Overloading of the + operator for matrices
+
+        PRE : - other: a matrix of same shape
+        POST : the matrix of the sums of the entries
+        RAISES : - ValueError: the matrices have different shapes
+        """
+        if not isinstance(other, FractionMatrix):
+            return NotImplemented
+        if self.shape != other.shape:
+            raise ValueError('The matrices must have the same shape.')
+        return FractionMatrix([[entry + value for entry, value in zip(row, other_row)]
+                               for row, other_row in zip(self.__rows, other.__rows)])
+
+    def __sub__(self, other):
+        """Overloading of the - operator for matrices
+
+        PRE : - other: a matrix of same shape
+        POST : the matrix of the differences of the entries
+        RAISES : - ValueError: the matrices have different shapes
+        """
+        if not isinstance(other, FractionMatrix):
+            return NotImplemented
+        if self.shape != other.shape:
+            raise ValueError('The matrices must have the same shape.')
+        return FractionMatrix([[entry - value for entry, value in zip(row, other_row)]
+                               for row, other_row in zip(self.__rows, other.__rows)])
+
+    def __mul__(self, other):
+        """Overloading of the * operator for matrices
+
+        The products of rows and columns are summed over the common denominator of the row.
+
+        PRE : - other: a matrix whose number of rows is the number of columns of this matrix,
+                       or a number supported by the fraction class
+        POST : the matrix product, or the matrix scaled by the number
+        RAISES : - ValueError: the shapes of the matrices don't match
+        """
+        if not isinstance(other, FractionMatrix):
+            if Fraction().__add__(other) is NotImplemented:
+                return NotImplemented
+            return FractionMatrix([[entry * other for entry in row] for row in self.__rows])
+        if self.__column_count != len(other.__rows):
+            raise ValueError('The number of columns of a matrix must be the number of rows of the other one.')
+
+        columns = [_integer_row(column) for column in zip(*other.__rows)]
+        product = []
+        for row in self.__rows:
+            integers, scale = _integer_row(row)
+            product.append([Fraction(sum(map(int.__mul__, integers, column)), scale * column_scale)
+                            for column, column_scale in columns])
+        return FractionMatrix(product)
+
+    def __rmul__(self, other):
+        """Overloading of the reflected * operator for matrices
+
+        PRE : - other: a number supported by the fraction class
+        POST : the matrix scaled by the number
+        """
+        return self.__mul__(other)
+
+    # ------------------ Linear algebra ------------------
+
+    def __integer_rows(self) -> tuple:
+        """Return the rows of the matrix scaled to integers
+
+        PRE : -
+        POST : a (rows, scale) tuple, rows being lists of ints and scale the product of the scales of the rows
+        """
+        rows = []
+        scale = 1
+        for row in self.__rows:
+            integers, row_scale = _integer_row(row)
+            rows.append(integers)
+            scale *= row_scale
+        return rows, scale
+
+    def determinant(self) -> Fraction:
+        """Return the determinant of the matrix
+
+        PRE : -
+        POST : the exact determinant
+        RAISES : - ValueError: the matrix is not square
+        """
+        if len(self.__rows) != self.__column_count:
+            raise ValueError('The matrix must be square.')
+        if not self.__rows:
+            return Fraction(1)
+
+        rows, scale = self.__integer_rows()
+        if np is not None:
+            return Fraction(_modular_minors(rows, len(rows))[0], scale)
+        pivots, sign = _bareiss(rows, self.__column_count)
+        if len(pivots) < len(rows):
+            return Fraction(0)
+        return Fraction(sign * rows[-1][-1], scale)
+
+    def rank(self) -> int:
+        """Return the rank of the matrix
+
+        PRE : -
+        POST : the number of linearly independent rows
+        """
+        rows, _ = self.__integer_rows()
+        return len(_bareiss(rows, self.__column_count)[0])
+
+    def solve(self, right):
+        """Solve the linear system whose coefficients are the matrix
+
+        The rows are extended with the right-hand sides, each extended row being scaled to integers.
+        The determinant d of the scaled matrix and the integers d*x, by Cramer's rule, are computed
+        modulo primes with numpy. Otherwise, after the elimination, the last pivot is d and the back
+        substitution computes the integers d*x exactly.
+
+        PRE : - right: a matrix with as many rows as this matrix, or a sequence of numbers supported
+                       by the fraction class for a single right-hand side
+        POST : the matrix of the solutions, or the list of fractions of the solution for a sequence
+        RAISES : - ValueError: the matrix is not square or singular, or right doesn't have as many rows
+        """
+        size = len(self.__rows)
+        if size != self.__column_count:
+            raise ValueError('The matrix must be square.')
+        vector = not isinstance(right, FractionMatrix)
+        if vector:
+            right = FractionMatrix([[entry] for entry in right])
+        if len(right.__rows) != size:
+            raise ValueError('The right-hand side must have as many rows as the matrix.')
+
+        width = right.__column_count
+        rows = [_integer_row(row + right_row)[0] for row, right_row in zip(self.__rows, right.__rows)]
+        if np is not None and size:
+            determinant, solutions = _modular_minors(rows, size)
+            if not determinant:
+                raise ValueError('The matrix is singular.')
+        else:
+            pivots, _ = _bareiss(rows, size)
+            if len(pivots) < size:
+                raise ValueError('The matrix is singular.')
+
+            determinant = rows[-1][size - 1] if size else 1
+            solutions = [None] * size
+            for index in range(size - 1, -1, -1):
+                row = rows[index]
+                diagonal = row[index]
+                solutions[index] = [
+                    (determinant * row[size + column]
+                     - sum(row[other] * solutions[other][column] for other in range(index + 1, size))) // diagonal
+                    for column in range(width)]
+
+        result = [[Fraction(numerator, determinant) for numerator in row] for row in solutions]
+        if vector:
+            return [row[0] for row in result]
+        return FractionMatrix(result)
+
+    def inverse(self):
+        """Return the inverse of the matrix
+
+        PRE : -
+        POST : the matrix whose product with this matrix is the identity
+        RAISES : - ValueError: the matrix is not square or singular
+        """
+        return self.solve(FractionMatrix.identity(len(self.__rows)))
+
+
+def _as_fraction(value) -> Fraction:
+    """Return a number as a fraction
+
+    PRE : - value: a number supported by the fraction class
+    POST : the exact fraction value
+    RAISES : - TypeError: value is not a supported number
+    """
+    if isinstance(value, Fraction):
+        return value
+    fraction = Fraction().__add__(value)
+    if fraction is NotImplemented:
+        raise TypeError(f'Unsupported matrix entry: {value!r}')
+    return fraction
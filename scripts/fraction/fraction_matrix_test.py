@@ -0,0 +1,136 @@
+"""
+Test the matrices of fractions.
+"""
+import fractions
+import random
+import time
+import unittest
+import fraction_matrix
+from fraction import Fraction, np
+from fraction_matrix import FractionMatrix
+
+
+class FractionMatrixTestCase(unittest.TestCase):
+    """
+    Test the operators and the exact linear algebra of the matrices of fractions.
+    """
+
+    matrix = FractionMatrix([[2, Fraction(1, 2), 0], [Fraction(-1, 3), 1, 4], [Fraction(5, 6), 0, Fraction(-1, 2)]])
+    singular = FractionMatrix([[1, 2, 3], [Fraction(1, 2), 1, Fraction(3, 2)], [0, 1, 1]])
+
+    def test_fraction_matrix(self):
+        """
+        Test the building, the textual representations and the operators of matrices.
+        """
+        self.assertEqual(self.matrix.shape, (3, 3), 'matrix.shape')
+        self.assertEqual(self.matrix[1, 0], Fraction(-1, 3), 'matrix[1, 0]')
+        self.assertEqual(str(FractionMatrix([[1, 0.5]])), '[[1/1, 1/2]]', "str(FractionMatrix([[1, 0.5]]))")
+        self.assertEqual(repr(FractionMatrix([[1]])), '<FractionMatrix: [[1/1]]>', "repr(FractionMatrix([[1]]))")
+        self.assertRaises(ValueError, FractionMatrix, [[1, 2], [3]])
+        self.assertRaises(TypeError, FractionMatrix, [['1']])
+
+        self.assertEqual(self.matrix * FractionMatrix.identity(3), self.matrix, 'matrix * identity')
+        self.assertEqual(self.matrix + self.matrix, 2 * self.matrix, 'matrix + matrix')
+        self.assertEqual(self.matrix - self.matrix, 0 * self.matrix, 'matrix - matrix')
+        self.assertEqual(FractionMatrix([[1, 2]]) * FractionMatrix([[Fraction(1, 2)], [Fraction(1, 3)]]),
+                         FractionMatrix([[Fraction(7, 6)]]), '[[1, 2]] * [[1/2], [1/3]]')
+        self.assertEqual(self.matrix.transpose()[0, 1], Fraction(-1, 3), 'matrix.transpose()[0, 1]')
+        self.assertRaises(ValueError, lambda: self.matrix * FractionMatrix([[1, 2]]))
+
+    def test_fraction_matrix_linear_algebra(self):
+        """
+        Test the determinant, the rank, the inverse and the solutions of linear systems.
+        """
+        self.assertEqual(self.matrix.determinant(), Fraction(7, 12), 'matrix.determinant()')
+        self.assertEqual(self.singular.determinant(), Fraction(0), 'singular.determinant()')
+        self.assertEqual(self.matrix.rank(), 3, 'matrix.rank()')
+        self.assertEqual(self.singular.rank(), 2, 'singular.rank()')
+        self.assertEqual(FractionMatrix([[0, 1], [0, 2], [1, 0]]).rank(), 2, 'rank of a 3x2 matrix')
+        self.assertEqual(self.matrix * self.matrix.inverse(), FractionMatrix.identity(3), 'matrix * matrix.inverse()')
+        self.assertEqual(self.matrix.solve([1, 0, Fraction(1, 2)]),
+                         [Fraction(6, 7), Fraction(-10, 7), Fraction(3, 7)], 'matrix.solve([1, 0, 1/2])')
+        self.assertRaises(ValueError, self.singular.inverse)
+        self.assertRaises(ValueError, self.singular.solve, [1, 2, 3])
+        self.assertRaises(ValueError, FractionMatrix([[1, 2]]).determinant)
+        self.assertRaises(ValueError, self.matrix.solve, [1, 2])
+
+        rng = random.Random(2021)
+        for size in range(1, 9):
+            rows = [[Fraction(rng.randint(-9, 9), rng.randint(1, 9)) for _ in range(size)] for _ in range(size)]
+            right = [Fraction(rng.randint(-9, 9), rng.randint(1, 9)) for _ in range(size)]
+
+            # Reference: Gaussian elimination with the fractions of the standard library
+            expected = [[fractions.Fraction(entry.numerator, entry.denominator) for entry in row] + [
+                fractions.Fraction(value.numerator, value.denominator)] for row, value in zip(rows, right)]
+            determinant = fractions.Fraction(1)
+            for column in range(size):
+                pivot = next(index for index in range(column, size) if expected[index][column])
+                if pivot != column:
+                    expected[column], expected[pivot] = expected[pivot], expected[column]
+                    determinant = -determinant
+                determinant *= expected[column][column]
+                expected[column] = [entry / expected[column][column] for entry in expected[column]]
+                for index in range(size):
+                    if index != column:
+                        factor = expected[index][column]
+                        expected[index] = [entry - factor * value
+                                           for entry, value in zip(expected[index], expected[column])]
+
+            matrix = FractionMatrix(rows)
+            self.assertEqual(matrix.determinant(), Fraction(determinant.numerator, determinant.denominator),
+                             f'determinant of {matrix}')
+            self.assertEqual(matrix.solve(right), [Fraction(row[-1].numerator, row[-1].denominator)
+                                                   for row in expected], f'{matrix}.solve({right})')
+
+
+    def test_fraction_matrix_bareiss_fallback(self):
+        """
+        Test that the Bareiss elimination used without numpy agrees with the modular elimination.
+        """
+        rng = random.Random(2024)
+        for size in range(1, 13):
+            rows = [[Fraction(rng.randint(-9, 9), rng.randint(1, 9)) for _ in range(size)] for _ in range(size)]
+            if size % 3 == 0:
+                rows[-1] = [entry * 2 - value for entry, value in zip(rows[0], rows[1])]
+            right = FractionMatrix([[Fraction(rng.randint(-9, 9), rng.randint(1, 9)) for _ in range(2)]
+                                    for _ in range(size)])
+            matrix = FractionMatrix(rows)
+            results = []
+            for module_np in (np, None):
+                fraction_matrix.np = module_np
+                try:
+                    results.append((matrix.determinant(), matrix.rank(),
+                                    matrix.solve(right) if size % 3 else None))
+                finally:
+                    fraction_matrix.np = np
+            self.assertEqual(results[0], results[1], f'modular and Bareiss eliminations of {matrix}')
+            if size % 3 == 0:
+                self.assertRaises(ValueError, matrix.solve, right)
+
+    @unittest.skipIf(np is None, 'The modular elimination needs numpy.')
+    def test_fraction_matrix_large_system(self):
+        """
+        Test that a 200x200 system of small fractions is solved in seconds.
+        """
+        rng = random.Random(2021)
+        size = 200
+        matrix = FractionMatrix([[Fraction(rng.randint(-9, 9), rng.randint(1, 9)) for _ in range(size)]
+                                 for _ in range(size)])
+        right = [Fraction(rng.randint(-9, 9), rng.randint(1, 9)) for _ in range(size)]
+
+        start = time.perf_counter()
+        solution = matrix.solve(right)
+        determinant = matrix.determinant()
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(matrix * FractionMatrix([[value] for value in solution]),
+                         FractionMatrix([[value] for value in right]), 'matrix * matrix.solve(right)')
+        self.assertLess(elapsed, 20, f'200x200 solve and determinant in {elapsed:.3f}s')
+
+        # Cramer's rule for the first solution
+        replaced = FractionMatrix([[value] + list(row[1:]) for value, row in zip(right, matrix.rows)])
+        self.assertEqual(replaced.determinant() / determinant, solution[0], 'solution[0] by Cramer\'s rule')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,521 @@
+"""
+Evaluate computations on fractions modulo word-sized primes.
+
+This only pays off when the result is much smaller than the intermediate fractions, as in
+determinants, eliminations or cancelling sums: the number of runs grows with the size of the
+result, while the fraction operators pay for the size of every intermediate value.
+
+A function written with the operators +, -, *, / and integer powers is run on residues modulo
+several 31-bit primes instead of fractions: each run only handles small integers and is
+independent of the others, so that the runs are spread over processes. With numpy, a single run
+computes each operation modulo a whole block of primes at once. The exact result is
+recovered by the Chinese remainder theorem and a rational reconstruction, and accepted once
+the residues modulo primes unused by the reconstruction confirm it:
+    def sum_of_squares(*values):
+        return sum(value ** 2 for value in values)
+    evaluate(sum_of_squares, *fractions, jobs=4) == sum_of_squares(*fractions)
+
+A prime dividing a denominator or a divisor is unlucky and skipped. When too many
+primes in a row are unlucky, the division is by zero: the function is then run on the fractions
+themselves, to raise or return exactly what the fraction class does.
+"""
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+from fraction import Fraction, np
+
+# The sums of two products of residues fit in a signed 64-bit int
+PRIME_BITS = 31
+BLOCK_PRIMES = 64
+CHECK_PRIMES = 2
+UNLUCKY_LIMIT = 4
+
+# The primes below 2**PRIME_BITS, in decreasing order, extended on demand
+_primes = []
+_WITNESSES = (2, 7, 61)
+
+
+def _is_prime(number: int) -> bool:
+    """Check if a number lower than 2**32 is prime
+
+    PRE : - number: an odd int greater than 61, lower than 2**32
+    POST : number is prime, by the Miller-Rabin test with the witnesses that are deterministic below 2**32
+    """
+    exponent, shifts = number - 1, 0
+    while not exponent & 1:
+        exponent >>= 1
+        shifts += 1
+    for witness in _WITNESSES:
+        value = pow(witness, exponent, number)
+        if value in (1, number - 1):
+            continue
+        for _ in range(shifts - 1):
+            value = value * value % number
+            if value == number - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _prime(index: int) -> int:
+    """Return a word-sized prime
+
+    PRE : - index: a non-negative int
+    POST : the index-th prime below 2**PRIME_BITS, in decreasing order
+    """
+    candidate = _primes[-1] - 2 if _primes else (1 << PRIME_BITS) - 1
+    while len(_primes) <= index:
+        if _is_prime(candidate):
+            _primes.append(candidate)
+        candidate -= 2
+    return _primes[index]
+
+
+def reconstruct(residue: int, modulus: int):
+    """Return the fraction of small terms congruent to a residue
+
+    The extended Euclidean algorithm on modulus and residue is stopped at the first remainder
+    lower than the bound sqrt(modulus / 2): the fraction is unique with both terms below the bound.
+
+    PRE : - residue: an int in [0, modulus[
+          - modulus: an int greater than 1
+    POST : the fraction n/d with n * d**-1 = residue modulo modulus, |n| and d being lower or equal to
+           sqrt(modulus / 2), or None if there is none
+    """
+    bound = math.isqrt(modulus // 2)
+    remainder0, remainder1 = modulus, residue
+    cofactor0, cofactor1 = 0, 1
+    while remainder1 > bound:
+        quotient = remainder0 // remainder1
+        remainder0, remainder1 = remainder1, remainder0 - quotient * remainder1
+        cofactor0, cofactor1 = cofactor1, cofactor0 - quotient * cofactor1
+    if abs(cofactor1) > bound or math.gcd(remainder1, cofactor1) != 1:
+        return None
+    if cofactor1 < 0:
+        return Fraction._from_reduced(-remainder1, -cofactor1)
+    return Fraction._from_reduced(remainder1, cofactor1)
+
+
+def _combine(congruences: list) -> tuple:
+    """Return the solution of congruences by the Chinese remainder theorem
+
+    The congruences are merged pairwise as a balanced tree, so that the big moduli are few.
+
+    PRE : - congruences: a non-empty list of (residue, modulus) tuples, the moduli being coprime
+    POST : the (residue, modulus) tuple of the residue modulo the product of the moduli satisfying the congruences
+    """
+    while len(congruences) > 1:
+        merged = []
+        for index in range(0, len(congruences) - 1, 2):
+            (residue1, modulus1), (residue2, modulus2) = congruences[index], congruences[index + 1]
+            residue = residue1 + modulus1 * ((residue2 - residue1) * pow(modulus1, -1, modulus2) % modulus2)
+            merged.append((residue, modulus1 * modulus2))
+        if len(congruences) % 2:
+            merged.append(congruences[-1])
+        congruences = merged
+    return congruences[0]
+
+
+def _reduce(integer: int, prime):
+    """Return the residue of an int
+
+    PRE : - integer: an int
+          - prime: a prime int, or an int64 array of primes
+    POST : integer modulo prime, an int or an int64 array
+    """
+    if isinstance(prime, int) or -(1 << 62) < integer < 1 << 62:
+        return integer % prime
+    return np.array([integer % int(modulus) for modulus in prime], dtype=np.int64)
+
+
+def _power(value, exponent: int, prime):
+    """Return a residue powered by a non-negative exponent
+
+    PRE : - value: an int or an int64 array of residues
+          - exponent: a non-negative int
+          - prime: a prime int, or an int64 array of primes
+    POST : value ** exponent modulo prime, by squaring and multiplying for the arrays
+    """
+    if isinstance(prime, int):
+        return pow(value, exponent, prime)
+    result = np.ones_like(prime)
+    while exponent:
+        if exponent & 1:
+            result = result * value % prime
+        value = value * value % prime
+        exponent >>= 1
+    return result
+
+
+def _inverse(value, prime):
+    """Return the inverse of a residue
+
+    PRE : - value: an int or an int64 array of residues, not null
+          - prime: a prime int, or an int64 array of primes
+    POST : value ** -1 modulo prime, by Fermat's little theorem for the arrays
+    """
+    if isinstance(prime, int):
+        return pow(value, -1, prime)
+    # value ** (prime - 2), the exponent being different for each prime
+    result = np.ones_like(prime)
+    exponent = prime - 2
+    for _ in range(PRIME_BITS):
+        result = np.where(exponent & 1, result * value % prime, result)
+        value = value * value % prime
+        exponent >>= 1
+    return result
+
+
+def _nonzero(value) -> bool:
+    """Check if a residue is not null
+
+    PRE : - value: an int or an int64 array of residues
+    POST : value is not null, modulo each prime for an array
+    """
+    return bool(value) if isinstance(value, int) else bool(value.all())
+
+
+class Residue:
+    """Class representing the residue of a fraction modulo a prime, or modulo each prime of a block
+
+    The residues support the same arithmetic operators as the fractions, with ints, fractions and
+    residues modulo the same primes. A residue is kept as a numerator and a denominator modulo the
+    primes, so that no operation needs a modular inverse: the value of the residue is only computed
+    once the function is run. The residues modulo a block of primes are int64 arrays, computed with
+    one numpy operation for all the primes.
+    Dividing by a null residue raises ZeroDivisionError. The comparisons have no meaning modulo a
+    prime and raise TypeError.
+    """
+
+    __slots__ = ('numerator', 'denominator', 'prime')
+
+    def __init__(self, value, prime):
+        """This builds a residue.
+
+        PRE : - value: an int, a fraction or a number supported by the fraction class
+              - prime: a prime int, or an int64 array of primes below 2**PRIME_BITS
+        POST : set the following attributes :
+               - numerator, denominator : the ints in [0, prime[ whose ratio is congruent to value,
+                                          the denominator being not null, or the int64 arrays of them
+               - prime : the prime, or the array of primes
+        RAISES : - ZeroDivisionError: the denominator of value is a multiple of a prime
+                 - TypeError: value is not a supported number
+        """
+        self.prime = prime
+        terms = self.__operand_terms(value)
+        if terms is None:
+            raise TypeError(f'Unsupported value: {value!r}')
+        self.numerator, self.denominator = terms
+
+    @property
+    def value(self):
+        """Get the value of the residue
+
+        PRE : -
+        POST : the int in [0, prime[ congruent to the residue, or the int64 array of them
+        """
+        return self.numerator * _inverse(self.denominator, self.prime) % self.prime
+
+    def __operand_terms(self, other):
+        """Return the terms of the residue of an operand modulo the primes
+
+        PRE : - other: a residue modulo the same primes, an int, a fraction or a number supported by the fraction class
+        POST : the (numerator, denominator) tuple of the residue of other, or None if other is not supported
+        RAISES : - ZeroDivisionError: the denominator of other is a multiple of a prime
+                 - ValueError: other is a residue modulo other primes
+        """
+        if isinstance(other, Residue):
+            if other.prime is not self.prime and not np.array_equal(other.prime, self.prime) \
+                    if np is not None else other.prime != self.prime:
+                raise ValueError('The residues are modulo different primes.')
+            return other.numerator, other.denominator
+        if isinstance(other, int):
+            return _reduce(other, self.prime), 1
+        if not isinstance(other, Fraction):
+            other = Fraction().__add__(other)
+            if other is NotImplemented:
+                return None
+        denominator = _reduce(other.denominator, self.prime)
+        if not _nonzero(denominator):
+            raise ZeroDivisionError(f'The denominator of {other} is a multiple of a prime.')
+        return _reduce(other.numerator, self.prime), denominator
+
+    def __new(self, numerator, denominator):
+        """Return a residue modulo the same primes
+
+        PRE : - numerator, denominator: ints in [0, prime[, or int64 arrays of them, denominator being not null
+        POST : the residue of numerator / denominator
+        """
+        residue = object.__new__(Residue)
+        residue.numerator = numerator
+        residue.denominator = denominator
+        residue.prime = self.prime
+        return residue
+
+    def __repr__(self) -> str:
+        """Return the textual representation of the residue
+
+        PRE : -
+        POST : the classname, the value and the prime, EX: <Residue: 3 mod 7>
+        """
+        if isinstance(self.prime, int):
+            return f'<Residue: {self.value} mod {self.prime}>'
+        return f'<Residue: {len(self.prime)} primes>'
+
+    # ------------------ Operators overloading ------------------
+
+    def __add__(self, other):
+        """Overloading of the + operator for residues
+
+        PRE : - other: a residue modulo the same primes, an int, a fraction or a number supported by the fraction class
+        POST : a residue that sums the residue and other
+        """
+        terms = self.__operand_terms(other)
+        if terms is None:
+            return NotImplemented
+        numerator, denominator = terms
+        return self.__new((self.numerator * denominator + numerator * self.denominator) % self.prime,
+                          self.denominator * denominator % self.prime)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        """Overloading of the - operator for residues
+
+        PRE : - other: a residue modulo the same primes, an int, a fraction or a number supported by the fraction class
+        POST : a residue that subtracts other from the residue
+        """
+        terms = self.__operand_terms(other)
+        if terms is None:
+            return NotImplemented
+        numerator, denominator = terms
+        return self.__new((self.numerator * denominator - numerator * self.denominator) % self.prime,
+                          self.denominator * denominator % self.prime)
+
+    def __rsub__(self, other):
+        """Overloading of the reflected - operator for residues
+
+        PRE : - other: an int, a fraction or a number supported by the fraction class
+        POST : a residue that subtracts the residue from other
+        """
+        terms = self.__operand_terms(other)
+        if terms is None:
+            return NotImplemented
+        numerator, denominator = terms
+        return self.__new((numerator * self.denominator - self.numerator * denominator) % self.prime,
+                          self.denominator * denominator % self.prime)
+
+    def __mul__(self, other):
+        """Overloading of the * operator for residues
+
+        PRE : - other: a residue modulo the same primes, an int, a fraction or a number supported by the fraction class
+        POST : a residue that multiplies the residue by other
+        """
+        terms = self.__operand_terms(other)
+        if terms is None:
+            return NotImplemented
+        numerator, denominator = terms
+        return self.__new(self.numerator * numerator % self.prime, self.denominator * denominator % self.prime)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        """Overloading of the / operator for residues
+
+        PRE : - other: a residue modulo the same primes, an int, a fraction or a number supported by the fraction class
+        POST : a residue that divides the residue by other
+        RAISES : - ZeroDivisionError: the residue of other is null, modulo a prime at least
+        """
+        terms = self.__operand_terms(other)
+        if terms is None:
+            return NotImplemented
+        numerator, denominator = terms
+        if not _nonzero(numerator):
+            raise ZeroDivisionError('Division by a multiple of a prime.')
+        return self.__new(self.numerator * denominator % self.prime, self.denominator * numerator % self.prime)
+
+    def __rtruediv__(self, other):
+        """Overloading of the reflected / operator for residues
+
+        PRE : - other: an int, a fraction or a number supported by the fraction class
+        POST : a residue that divides other by the residue
+        RAISES : - ZeroDivisionError: the residue is null, modulo a prime at least
+        """
+        terms = self.__operand_terms(other)
+        if terms is None:
+            return NotImplemented
+        if not _nonzero(self.numerator):
+            raise ZeroDivisionError('Division by a multiple of a prime.')
+        numerator, denominator = terms
+        return self.__new(numerator * self.denominator % self.prime, denominator * self.numerator % self.prime)
+
+    def __pow__(self, other):
+        """Overloading of the ** operator for residues
+
+        PRE : - other: an int, or an integral fraction
+        POST : the residue powered by other
+        RAISES : - ZeroDivisionError: other is negative and the residue is null, modulo a prime at least
+                 - ValueError: other is not an int nor an integral fraction
+        """
+        if isinstance(other, Fraction) and other.is_integer():
+            other = other.numerator
+        elif not isinstance(other, int):
+            raise ValueError('Only the integer powers are computed modulo a prime.')
+        if other >= 0:
+            return self.__new(_power(self.numerator, other, self.prime), _power(self.denominator, other, self.prime))
+        if not _nonzero(self.numerator):
+            raise ZeroDivisionError('Negative power of a multiple of a prime.')
+        return self.__new(_power(self.denominator, -other, self.prime), _power(self.numerator, -other, self.prime))
+
+    def __neg__(self):
+        """Overloading of the unary - operator for residues
+
+        PRE : -
+        POST : the opposite residue
+        """
+        return self.__new(-self.numerator % self.prime, self.denominator)
+
+    def __pos__(self):
+        """Overloading of the unary + operator for residues
+
+        PRE : -
+        POST : the residue itself
+        """
+        return self
+
+    def __eq__(self, other):
+        """Refuse to compare residues
+
+        PRE : - other: any value
+        RAISES : - TypeError: always
+        """
+        raise TypeError('The residues modulo a prime are not compared.')
+
+    __ne__ = __lt__ = __le__ = __gt__ = __ge__ = __bool__ = __eq__
+    __hash__ = None
+
+
+def _residues(function, arguments: tuple, primes: list) -> list:
+    """Run a function on residues modulo primes
+
+    This is the function run by the worker processes. With numpy, the function is run once modulo
+    the block of all the primes; if a prime of the block is unlucky, it is run modulo each prime,
+    until UNLUCKY_LIMIT primes in a row are unlucky.
+
+    PRE : - function: a function of fractions, using the arithmetic operators only
+          - arguments: a tuple of ints and fractions, the arguments of function
+          - primes: a list of primes
+    POST : the list of the int residues of the results, None for the unlucky primes
+    """
+    if np is not None and len(primes) > 1:
+        block = np.array(primes, dtype=np.int64)
+        try:
+            result = function(*(Residue(argument, block) for argument in arguments))
+            if not isinstance(result, Residue):
+                result = Residue(result, block)
+            return result.value.tolist()
+        except ZeroDivisionError:
+            pass
+
+    results = []
+    unlucky = 0
+    for prime in primes:
+        if unlucky >= UNLUCKY_LIMIT:
+            results.append(None)
+            continue
+        try:
+            result = function(*(Residue(argument, prime) for argument in arguments))
+            results.append(result.value if isinstance(result, Residue) else Residue(result, prime).value)
+            unlucky = 0
+        except ZeroDivisionError:
+            results.append(None)
+            unlucky += 1
+    return results
+
+
+def evaluate(function, *arguments, jobs: int = 1, bits: int = None) -> Fraction:
+    """Evaluate a function of fractions modulo word-sized primes
+
+    The primes are used by rounds, split between jobs worker processes: after a failed reconstruction,
+    the next round doubles the number of primes; after a successful one, it checks the reconstructed
+    fraction modulo a block of new primes, CHECK_PRIMES at least, and starts over if they disagree.
+    With a bound on the bit size of the result, no check is needed: just enough primes are used.
+
+    PRE : - function: a function of fractions using the operators +, -, *, / and integer powers only,
+                      defined at module level if jobs is greater than 1
+          - arguments: ints and fractions, the arguments of function
+          - jobs: a positive int, the number of processes
+          - bits: the maximum bit length of the numerator and of the denominator of the result, or None
+    POST : the fraction function(*arguments), as computed with the fraction operators
+    RAISES : - ZeroDivisionError: function divides by zero
+             - TypeError: function compares its arguments
+             - ValueError: the result exceeds bits, or function computes a non-integer power
+    """
+    arguments = tuple(argument if isinstance(argument, (int, Fraction)) else Fraction().__add__(argument)
+                      for argument in arguments)
+    if NotImplemented in arguments:
+        raise TypeError('The arguments must be numbers supported by the fraction class.')
+
+    executor = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    try:
+        residue, modulus = 0, 1
+        candidate = None
+        used = unlucky = 0
+        minimum = max(CHECK_PRIMES, jobs * (BLOCK_PRIMES if np is not None else 1))
+        size = minimum
+        while True:
+            if bits is not None:
+                # Enough primes for a modulus greater than 2**(2 * bits + 1)
+                size = max(1, (2 * bits + 1 - modulus.bit_length()) // (PRIME_BITS - 1) + 1)
+            primes = [_prime(index) for index in range(used, used + size)]
+            used += size
+            if executor is None:
+                results = _residues(function, arguments, primes)
+            else:
+                chunk = -(-size // jobs)
+                results = [result for results in executor.map(_residues, [function] * jobs, [arguments] * jobs,
+                                                              [primes[start:start + chunk]
+                                                               for start in range(0, size, chunk)])
+                           for result in results]
+
+            checked = 0
+            congruences = [(residue, modulus)]
+            for prime, result in zip(primes, results):
+                if result is None:
+                    unlucky += 1
+                    if unlucky >= UNLUCKY_LIMIT:
+                        # A true division by zero: the fraction class decides
+                        return function(*(argument if isinstance(argument, Fraction) else Fraction(argument)
+                                           for argument in arguments))
+                    continue
+                unlucky = 0
+                congruences.append((result, prime))
+                if candidate is not None:
+                    if candidate.denominator % prime and \
+                            candidate.numerator * pow(candidate.denominator, -1, prime) % prime == result:
+                        checked += 1
+                    else:
+                        candidate = None
+            residue, modulus = _combine(congruences)
+
+            if candidate is not None and checked >= CHECK_PRIMES:
+                return candidate
+            if bits is not None:
+                if modulus.bit_length() > 2 * bits + 1:
+                    candidate = reconstruct(residue, modulus)
+                    if candidate is None or max(abs(candidate.numerator), candidate.denominator).bit_length() > bits:
+                        raise ValueError(f'The result exceeds {bits} bits.')
+                    return candidate
+                continue
+
+            if candidate is None:
+                candidate = reconstruct(residue, modulus)
+                # A fraction reconstructed near the bound is most likely spurious: more primes are needed
+                if candidate is not None and abs(candidate.numerator).bit_length() + \
+                        candidate.denominator.bit_length() + PRIME_BITS > modulus.bit_length():
+                    candidate = None
+            size = minimum if candidate is not None else max(used, minimum)
+    finally:
+        if executor is not None:
+            executor.shutdown()
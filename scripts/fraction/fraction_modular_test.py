@@ -0,0 +1,111 @@
+"""
+Test the evaluation of fraction computations modulo word-sized primes.
+"""
+import math
+import unittest
+from fraction import Fraction
+from fraction_modular import UNLUCKY_LIMIT, Residue, _prime, evaluate, reconstruct
+
+
+def harmonic_square(*values):
+    """Return the square of the sum of the inverses of values, as a module function for the worker processes."""
+    return sum(1 / value for value in values) ** 2
+
+
+def hilbert_determinant(one, size=12):
+    """Return the determinant of the Hilbert matrix of a size, by Gaussian elimination without pivoting."""
+    rows = [[one / (row + column + 1) for column in range(size)] for row in range(size)]
+    determinant = one
+    for pivot in range(size):
+        determinant = rows[pivot][pivot] * determinant
+        for row in range(pivot + 1, size):
+            factor = rows[row][pivot] / rows[pivot][pivot]
+            rows[row] = [value - factor * pivot_value for value, pivot_value in zip(rows[row], rows[pivot])]
+    return determinant
+
+
+class FractionModularTestCase(unittest.TestCase):
+    """
+    Test that the modular evaluation gives the results of the fraction operators.
+    """
+
+    def test_reconstruct(self):
+        """
+        Test the rational reconstruction of residues, and its failure when the modulus is too small.
+        """
+        modulus = 1000003 * 1000033
+        for fraction in (Fraction(0), Fraction(1), Fraction(-7, 12), Fraction(355, 113), Fraction(-1, 999)):
+            residue = fraction.numerator * pow(fraction.denominator, -1, modulus) % modulus
+            self.assertEqual(reconstruct(residue, modulus), fraction, f'reconstruct({fraction})')
+        large = Fraction(2 ** 40 + 1, 3 ** 25)
+        residue = large.numerator * pow(large.denominator, -1, modulus) % modulus
+        self.assertNotEqual(reconstruct(residue, modulus), large, f'reconstruct({large}) beyond the bound')
+
+    def test_residue(self):
+        """
+        Test the operators of the residues, and the refused comparisons and powers.
+        """
+        x = Residue(Fraction(1, 2), 7)
+        self.assertEqual(x.value, 4, 'Residue(1/2, 7)')
+        self.assertEqual((x + 1).value, 5, 'x + 1')
+        self.assertEqual((1 - x).value, 4, '1 - x')
+        self.assertEqual((x * Fraction(2, 3)).value, 5, 'x * 2/3')
+        self.assertEqual((Fraction(2, 3) / x).value, 6, '2/3 / x')
+        self.assertEqual((x ** -2).value, 4, 'x ** -2')
+        self.assertEqual((-x).value, 3, '-x')
+        self.assertEqual(repr(x), '<Residue: 4 mod 7>', 'repr(x)')
+        self.assertRaises(ZeroDivisionError, Residue, Fraction(1, 14), 7)
+        self.assertRaises(ZeroDivisionError, x.__truediv__, 7)
+        self.assertRaises(ZeroDivisionError, Residue(0, 7).__pow__, -1)
+        self.assertRaises(ValueError, x.__pow__, Fraction(1, 2))
+        self.assertRaises(ValueError, x.__add__, Residue(1, 11))
+        self.assertRaises(TypeError, x.__lt__, 1)
+        self.assertRaises(TypeError, bool, x)
+        self.assertRaises(TypeError, Residue, 'a', 7)
+
+    def test_evaluate(self):
+        """
+        Test sums, products and eliminations whose results have large terms.
+        """
+        values = [Fraction(index, index * index + 1) for index in range(1, 200)]
+        self.assertEqual(evaluate(harmonic_square, *values), harmonic_square(*values), 'harmonic_square')
+        self.assertEqual(evaluate(hilbert_determinant, 1), hilbert_determinant(Fraction(1)), 'hilbert_determinant')
+        self.assertEqual(evaluate(lambda x, y: (x - y) / (x + y) ** 3, Fraction(-3, 4), 5), Fraction(-368, 4913),
+                         '(x - y) / (x + y) ** 3')
+        self.assertEqual(evaluate(lambda x: x - x, Fraction(10 ** 40, 7)), Fraction(), 'x - x')
+        self.assertEqual(evaluate(lambda: 3), Fraction(3), 'a constant')
+        self.assertEqual(evaluate(lambda x: x / 2, 0.75), Fraction(3, 8), 'a float argument')
+
+    def test_evaluate_bits(self):
+        """
+        Test the evaluation with a bound on the bit size of the result.
+        """
+        values = [Fraction(1, index) for index in range(1, 100)]
+        result = sum(values, Fraction())
+        self.assertEqual(evaluate(harmonic_square, *range(1, 100), bits=400), result ** 2, 'harmonic_square, bits=400')
+        self.assertRaises(ValueError, evaluate, harmonic_square, *range(1, 100), bits=100)
+
+    def test_evaluate_division_by_zero(self):
+        """
+        Test that the divisions by zero behave as with the fraction operators.
+        """
+        self.assertRaises(ZeroDivisionError, evaluate, lambda x, y: x / (y - y), Fraction(1, 3), 5)
+        self.assertRaises(ZeroDivisionError, evaluate, lambda x: (x - x) ** -2, Fraction(1, 3))
+        # The first primes, dividing the denominator of an argument, are skipped while fewer than UNLUCKY_LIMIT
+        unlucky = math.prod(_prime(index) for index in range(UNLUCKY_LIMIT - 1))
+        self.assertEqual(evaluate(lambda x: x * unlucky + 1, Fraction(3, unlucky)), Fraction(4), 'unlucky primes')
+        self.assertEqual(evaluate(lambda x: x * x * unlucky, Fraction(1, _prime(0))), Fraction(unlucky, _prime(0) ** 2),
+                         'an unlucky prime')
+        self.assertRaises(TypeError, evaluate, lambda x: x if x > 0 else -x, Fraction(1, 3))
+
+    def test_evaluate_jobs(self):
+        """
+        Test the evaluation in worker processes.
+        """
+        values = [Fraction(index, 3 * index + 2) for index in range(1, 300)]
+        self.assertEqual(evaluate(harmonic_square, *values, jobs=2), harmonic_square(*values),
+                         'harmonic_square, jobs=2')
+
+
+if __name__ == '__main__':
+    unittest.main()
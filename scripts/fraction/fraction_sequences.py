@@ -0,0 +1,307 @@
+"""
+Compute classic rational sequences incrementally, with memoized terms.
+
+The harmonic numbers resume from the nearest cached term below the asked index and sum the
+missing unit fractions as a balanced tree: H(10**6) after H(999999) is one addition.
+The Bernoulli numbers are computed in increasing order from the previous ones, and the
+Egyptian fraction decompositions reuse the cached decompositions of their remainders.
+
+The terms are kept in memory by a cache bounded by their total bit size, which evicts the
+least recently used terms, and optionally in an SQLite file to survive restarts.
+"""
+import bisect
+import io
+import math
+import sqlite3
+from collections import OrderedDict
+
+from fraction import Fraction, iter_fractions, write_fractions
+
+MAX_BITS = 1 << 26
+INDEXED_SEQUENCES = ('harmonic', 'bernoulli')
+
+
+def _bits(fractions) -> int:
+    """Return the bit size of fractions
+
+    PRE : - fractions: an iterable of fractions
+    POST : the total bit length of their numerators and denominators
+    """
+    return sum(fraction.numerator.bit_length() + fraction.denominator.bit_length() for fraction in fractions)
+
+
+def _pack(fractions) -> bytes:
+    """Return the compact binary representation of fractions
+
+    PRE : - fractions: an iterable of fractions
+    POST : the bytes written by write_fractions
+    """
+    buffer = io.BytesIO()
+    write_fractions(buffer, fractions)
+    return buffer.getvalue()
+
+
+class RationalSequences:
+    """Class computing rational sequences with a memory cache bounded by bit size and an optional disk cache
+
+    The memory cache maps (sequence, key) tuples to tuples of fractions: the term of an index
+    for the harmonic and Bernoulli numbers, the unit fractions of a decomposition for the
+    Egyptian fractions. The cached indices of each indexed sequence are kept sorted to find the
+    nearest cached term below an index.
+    """
+
+    def __init__(self, max_bits: int = MAX_BITS, path: str = None):
+        """This builds the sequences and their caches.
+
+        PRE : - max_bits: a positive int, the maximum total bit size of the terms cached in memory
+              - path: the path of an SQLite file caching the terms on disk, or None
+        POST : set the following attributes :
+               - max_bits : the maximum bit size of the memory cache
+               - bits : the bit size of the terms cached in memory
+               - hits, misses, evictions : the statistics of the memory cache
+               - disk_hits : the number of misses of the memory cache found in the disk cache
+        """
+        self.max_bits = max_bits
+        self.bits = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+        self.__terms = OrderedDict()
+        self.__indices = {sequence: [] for sequence in INDEXED_SEQUENCES}
+        self.__connection = None
+        if path is not None:
+            self.__connection = sqlite3.connect(path)
+            self.__connection.execute('CREATE TABLE IF NOT EXISTS terms '
+                                      '(sequence TEXT, n INTEGER, value BLOB, PRIMARY KEY (sequence, n))')
+            self.__connection.execute('CREATE TABLE IF NOT EXISTS decompositions (fraction BLOB PRIMARY KEY, units BLOB)')
+
+    def close(self):
+        """Close the disk cache
+
+        PRE : -
+        POST : the terms are written to the disk cache, which is closed
+        """
+        if self.__connection is not None:
+            self.__connection.commit()
+            self.__connection.close()
+            self.__connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def stats(self) -> dict:
+        """Return the statistics of the memory cache
+
+        PRE : -
+        POST : a dict of the number of cached terms, their bit size and the hits, misses, evictions and disk hits
+        """
+        return {'terms': len(self.__terms), 'bits': self.bits, 'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'disk_hits': self.disk_hits}
+
+    def clear(self):
+        """Empty the memory cache
+
+        PRE : -
+        POST : the memory cache is empty, the disk cache is unchanged
+        """
+        self.__terms.clear()
+        for indices in self.__indices.values():
+            indices.clear()
+        self.bits = 0
+
+    # ------------------ Caches ------------------
+
+    def __get(self, sequence: str, key):
+        """Return cached fractions
+
+        PRE : - sequence: the name of a sequence
+              - key: an index, or a fraction for the Egyptian fractions
+        POST : the tuple of the cached fractions, from memory then from disk, or None
+        """
+        values = self.__terms.get((sequence, key))
+        if values is not None:
+            self.__terms.move_to_end((sequence, key))
+            self.hits += 1
+            return values
+        self.misses += 1
+
+        if self.__connection is not None:
+            if sequence in INDEXED_SEQUENCES:
+                row = self.__connection.execute('SELECT value FROM terms WHERE sequence = ? AND n = ?',
+                                                (sequence, key)).fetchone()
+            else:
+                row = self.__connection.execute('SELECT units FROM decompositions WHERE fraction = ?',
+                                                (key.to_bytes(),)).fetchone()
+            if row is not None:
+                self.disk_hits += 1
+                values = tuple(iter_fractions(row[0]))
+                self.__put(sequence, key, values, persist=False)
+                return values
+        return None
+
+    def __put(self, sequence: str, key, values: tuple, persist: bool = True):
+        """Cache fractions, evicting the least recently used ones beyond the bit budget
+
+        PRE : - sequence: the name of a sequence
+              - key: an index, or a fraction for the Egyptian fractions
+              - values: a tuple of fractions
+              - persist: the fractions are also written to the disk cache
+        POST : the fractions are cached
+        """
+        if (sequence, key) not in self.__terms:
+            self.__terms[(sequence, key)] = values
+            self.bits += _bits(values)
+            if sequence in INDEXED_SEQUENCES:
+                bisect.insort(self.__indices[sequence], key)
+            while self.bits > self.max_bits and len(self.__terms) > 1:
+                (evicted_sequence, evicted_key), evicted = self.__terms.popitem(last=False)
+                self.bits -= _bits(evicted)
+                self.evictions += 1
+                if evicted_sequence in INDEXED_SEQUENCES:
+                    indices = self.__indices[evicted_sequence]
+                    del indices[bisect.bisect_left(indices, evicted_key)]
+
+        if persist and self.__connection is not None:
+            if sequence in INDEXED_SEQUENCES:
+                self.__connection.execute('INSERT OR REPLACE INTO terms VALUES (?, ?, ?)',
+                                          (sequence, key, _pack(values)))
+            else:
+                self.__connection.execute('INSERT OR REPLACE INTO decompositions VALUES (?, ?)',
+                                          (key.to_bytes(), _pack(values)))
+
+    def __floor(self, sequence: str, index: int) -> tuple:
+        """Return the nearest cached term below an index
+
+        PRE : - sequence: the name of an indexed sequence
+              - index: a non-negative int
+        POST : the (index, term) tuple of the greatest cached index lower or equal to index,
+               from memory or from disk, or None
+        """
+        best = None
+        indices = self.__indices[sequence]
+        position = bisect.bisect_right(indices, index)
+        if position:
+            best = indices[position - 1], self.__terms[(sequence, indices[position - 1])][0]
+        if self.__connection is not None:
+            row = self.__connection.execute('SELECT n, value FROM terms WHERE sequence = ? AND n <= ? '
+                                            'ORDER BY n DESC LIMIT 1', (sequence, index)).fetchone()
+            if row is not None and (best is None or row[0] > best[0]):
+                self.disk_hits += 1
+                best = row[0], next(iter_fractions(row[1]))
+                self.__put(sequence, row[0], (best[1],), persist=False)
+        return best
+
+    def __commit(self):
+        """Write the pending terms to the disk cache
+
+        PRE : -
+        POST : the disk cache is up to date
+        """
+        if self.__connection is not None:
+            self.__connection.commit()
+
+    # ------------------ Sequences ------------------
+
+    def harmonic(self, index: int) -> Fraction:
+        """Return a harmonic number
+
+        PRE : - index: a non-negative int n
+        POST : H(n) = 1 + 1/2 + ... + 1/n, H(0) being 0
+        RAISES : - ValueError: index is negative
+        """
+        if index < 0:
+            raise ValueError('The index of a harmonic number must be non-negative.')
+        cached = self.__get('harmonic', index)
+        if cached is not None:
+            return cached[0]
+
+        start, value = self.__floor('harmonic', index) or (0, Fraction())
+        if start < index:
+            value = value + Fraction.sum(Fraction._from_reduced(1, term) for term in range(start + 1, index + 1))
+        self.__put('harmonic', index, (value,))
+        self.__commit()
+        return value
+
+    def bernoulli(self, index: int) -> Fraction:
+        """Return a Bernoulli number
+
+        The numbers are computed in increasing order from the previous ones with
+        B(m) = -1/(m+1) * sum(C(m+1, k) * B(k) for k < m), the odd ones after B(1) being null.
+
+        PRE : - index: a non-negative int n
+        POST : B(n), with B(1) = -1/2
+        RAISES : - ValueError: index is negative
+        """
+        if index < 0:
+            raise ValueError('The index of a Bernoulli number must be non-negative.')
+        if index > 1 and index % 2:
+            return Fraction()
+        cached = self.__get('bernoulli', index)
+        if cached is not None:
+            return cached[0]
+
+        # The even numbers are needed from the first one missing from the caches
+        numbers = {}
+        for even in range(0, index + 1, 2):
+            cached = self.__get('bernoulli', even)
+            if cached is None:
+                break
+            numbers[even] = cached[0]
+        numbers[1] = Fraction(-1, 2)
+
+        for even in range(len(numbers) * 2 - 2, index + 1, 2):
+            if even == 0:
+                value = Fraction(1)
+            else:
+                value = Fraction.sum(math.comb(even + 1, term) * numbers[term] for term in range(0, even, 2))
+                value = (value + math.comb(even + 1, 1) * numbers[1]) / -(even + 1)
+            numbers[even] = value
+            self.__put('bernoulli', even, (value,))
+        self.__commit()
+        return numbers[index]
+
+    def egyptian(self, fraction: Fraction) -> tuple:
+        """Return the Egyptian fraction decomposition of a fraction
+
+        The unit fractions are found by the greedy algorithm of Fibonacci-Sylvester: the greatest unit fraction
+        lower or equal to the remainder is subtracted until the remainder is a unit fraction. The decomposition
+        of a cached remainder is reused.
+
+        PRE : - fraction: a fraction between 0 and 1, 1 excluded
+        POST : the tuple of the distinct unit fractions summing to fraction, in decreasing order
+        RAISES : - ValueError: fraction is not between 0 and 1
+        """
+        if not Fraction() < fraction < 1:
+            raise ValueError('Only the fractions between 0 and 1 have an Egyptian fraction decomposition here.')
+        cached = self.__get('egyptian', fraction)
+        if cached is not None:
+            return cached
+
+        units = []
+        remainder = fraction
+        while not remainder.is_unit():
+            tail = self.__get('egyptian', remainder) if remainder is not fraction else None
+            if tail is not None:
+                units.extend(tail)
+                break
+            unit = Fraction._from_reduced(1, -(-remainder.denominator // remainder.numerator))
+            units.append(unit)
+            remainder = remainder - unit
+        else:
+            units.append(remainder)
+
+        units = tuple(units)
+        self.__put('egyptian', fraction, units)
+        self.__commit()
+        return units
+
+
+# The sequences shared by the module functions, with a memory cache only
+_sequences = RationalSequences()
+harmonic = _sequences.harmonic
+bernoulli = _sequences.bernoulli
+egyptian = _sequences.egyptian
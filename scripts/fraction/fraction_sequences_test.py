@@ -0,0 +1,78 @@
+"""
+Test the memoized rational sequences.
+"""
+import fractions
+import math
+import os
+import tempfile
+import unittest
+from fraction import Fraction
+from fraction_sequences import RationalSequences, bernoulli, egyptian, harmonic
+
+
+class RationalSequencesTestCase(unittest.TestCase):
+    """
+    Test the harmonic and Bernoulli numbers, the Egyptian fractions and their caches.
+    """
+
+    def test_sequences(self):
+        """
+        Test the terms of the sequences against the fractions of the standard library.
+        """
+        self.assertEqual([harmonic(index) for index in range(5)],
+                         [Fraction(0), Fraction(1), Fraction(3, 2), Fraction(11, 6), Fraction(25, 12)], 'harmonic(0..4)')
+        expected = sum(fractions.Fraction(1, term) for term in range(1, 301))
+        self.assertEqual(harmonic(300), Fraction(expected.numerator, expected.denominator), 'harmonic(300)')
+        self.assertRaises(ValueError, harmonic, -1)
+
+        numbers = [fractions.Fraction(1)]
+        for index in range(1, 31):
+            numbers.append(-sum(math.comb(index + 1, term) * numbers[term] for term in range(index)) / (index + 1))
+        self.assertEqual([bernoulli(index) for index in range(31)],
+                         [Fraction(number.numerator, number.denominator) for number in numbers], 'bernoulli(0..30)')
+        self.assertRaises(ValueError, bernoulli, -2)
+
+        self.assertEqual(egyptian(Fraction(4, 13)), (Fraction(1, 4), Fraction(1, 18), Fraction(1, 468)),
+                         'egyptian(4/13)')
+        self.assertEqual(egyptian(Fraction(1, 7)), (Fraction(1, 7),), 'egyptian(1/7)')
+        units = egyptian(Fraction(5, 121))
+        self.assertTrue(all(unit.is_unit() for unit in units), 'egyptian(5/121) are unit fractions')
+        self.assertEqual(Fraction.sum(units), Fraction(5, 121), 'sum of egyptian(5/121)')
+        self.assertRaises(ValueError, egyptian, Fraction(3, 2))
+
+    def test_sequences_caches(self):
+        """
+        Test the incremental computations, the bit budget of the memory cache and the disk cache.
+        """
+        sequences = RationalSequences()
+        previous = sequences.harmonic(2000)
+        misses = sequences.stats()['misses']
+        self.assertEqual(sequences.harmonic(2001), previous + Fraction(1, 2001), 'harmonic(2001)')
+        self.assertEqual(sequences.harmonic(2001), previous + Fraction(1, 2001), 'cached harmonic(2001)')
+        self.assertEqual(sequences.stats()['misses'], misses + 1, 'harmonic(2001) resumes from harmonic(2000)')
+        self.assertEqual(sequences.stats()['hits'], 1, 'harmonic(2001) is cached')
+
+        sequences = RationalSequences(max_bits=2000)
+        for index in range(0, 200, 10):
+            sequences.harmonic(index)
+        stats = sequences.stats()
+        self.assertLessEqual(stats['bits'], 2000, 'bits of the memory cache')
+        self.assertGreater(stats['evictions'], 0, 'evictions of the memory cache')
+        self.assertEqual(sequences.harmonic(190), harmonic(190), 'harmonic(190) after evictions')
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'sequences.db')
+            with RationalSequences(path=path) as sequences:
+                sequences.harmonic(500)
+                sequences.bernoulli(20)
+                sequences.egyptian(Fraction(4, 13))
+            with RationalSequences(path=path) as sequences:
+                self.assertEqual(sequences.harmonic(501), harmonic(501), 'harmonic(501) after a restart')
+                self.assertEqual(sequences.bernoulli(22), bernoulli(22), 'bernoulli(22) after a restart')
+                self.assertEqual(sequences.egyptian(Fraction(4, 13)), egyptian(Fraction(4, 13)),
+                                 'egyptian(4/13) after a restart')
+                self.assertEqual(sequences.stats()['disk_hits'], 13, 'disk hits after a restart')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,626 @@
+"""
+Serve the operations of the fraction class over TCP or a Unix socket with asyncio.
+
+The protocol is newline-delimited JSON. Each request is an object with an optional id,
+an operation and its arguments, fractions being given as strings (EX: "-5/2", "0.25")
+or as integers:
+    {"id": 1, "op": "add", "args": ["1/2", "1/3"]}
+Each response echoes the id with either a result or an error:
+    {"id": 1, "result": "5/6"}
+    {"id": 2, "error": {"type": "ZeroDivisionError", "message": "..."}}
+A connection can pipeline many requests: they are evaluated concurrently and answered in order.
+Concurrent requests are gathered into micro-batches, evaluated with arrays of fractions when
+they share an operation, and the large ones are offloaded to a pool of worker processes.
+The "metrics" operation returns the throughput and the latencies of the server.
+
+Serve on a TCP port or on a Unix socket:
+    python fraction_server.py --port 8765
+    python fraction_server.py --unix /tmp/fraction.sock
+"""
+import argparse
+import asyncio
+import collections
+import itertools
+import json
+import operator
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from fraction import Fraction, FractionArray, np
+
+BATCH_SIZE = 256
+BATCH_DELAY = 0.0005
+VECTOR_MIN = 16
+LARGE_SIZE = 2000
+SMALL_EXPONENT = 64
+LATENCY_WINDOW = 10000
+
+# The operations by name: the kinds of their arguments, the kind of their result and the function.
+# Argument kinds: 'f' for a fraction, 'i' for an int, '*' for any number of fractions;
+# result kinds: 'f' for a fraction, 'j' for a JSON value
+OPERATIONS = {
+    'add': ('ff', 'f', operator.add),
+    'sub': ('ff', 'f', operator.sub),
+    'mul': ('ff', 'f', operator.mul),
+    'truediv': ('ff', 'f', operator.truediv),
+    'pow': ('ff', 'f', operator.pow),
+    'eq': ('ff', 'j', operator.eq),
+    'gt': ('ff', 'j', operator.gt),
+    'ge': ('ff', 'j', operator.ge),
+    'lt': ('ff', 'j', operator.lt),
+    'le': ('ff', 'j', operator.le),
+    'abs': ('f', 'f', operator.abs),
+    'neg': ('f', 'f', operator.neg),
+    'float': ('f', 'j', float),
+    'as_mixed_number': ('f', 'j', Fraction.as_mixed_number),
+    'is_zero': ('f', 'j', Fraction.is_zero),
+    'is_integer': ('f', 'j', Fraction.is_integer),
+    'is_proper': ('f', 'j', Fraction.is_proper),
+    'is_unit': ('f', 'j', Fraction.is_unit),
+    'is_adjacent_to': ('ff', 'j', Fraction.is_adjacent_to),
+    'continued_fraction': ('f', 'j', lambda fraction: list(fraction.continued_fraction())),
+    'limit_denominator': ('fi', 'f', Fraction.limit_denominator),
+    'to_decimal_string': ('fi', 'j', Fraction.to_decimal_string),
+    'sum': ('*', 'f', lambda *fractions: Fraction.sum(fractions)),
+    'prod': ('*', 'f', lambda *fractions: Fraction.prod(fractions)),
+}
+
+# The operations evaluated on arrays of fractions when enough requests share them
+_VECTORIZED = {
+    'add': operator.add,
+    'sub': operator.sub,
+    'mul': operator.mul,
+    'truediv': operator.truediv,
+    'eq': operator.eq,
+    'gt': operator.gt,
+    'ge': operator.ge,
+    'lt': operator.lt,
+    'le': operator.le,
+    'abs': operator.abs,
+    'neg': operator.neg,
+    'is_zero': FractionArray.is_zero,
+    'is_integer': FractionArray.is_integer,
+    'is_proper': FractionArray.is_proper,
+    'is_unit': FractionArray.is_unit,
+}
+
+_ERRORS = {error.__name__: error for error in (ValueError, TypeError, ZeroDivisionError, OverflowError)}
+
+
+def _decode(value) -> Fraction:
+    """Return the fraction of a JSON argument
+
+    PRE : - value: an int, or a string accepted by Fraction.from_string
+    POST : the fraction
+    RAISES : - ValueError: value does not represent a fraction
+    """
+    if isinstance(value, int) and not isinstance(value, bool):
+        return Fraction(value)
+    if isinstance(value, str):
+        return Fraction.from_string(value)
+    raise ValueError(f'Invalid fraction: {value!r}')
+
+
+def _encode(value):
+    """Return the JSON value of a result
+
+    PRE : - value: a fraction, or a JSON value
+    POST : the string of the fraction, or the value itself
+    RAISES : - ValueError: a term of the fraction has more digits than the limit of the int to str conversions
+    """
+    if not isinstance(value, Fraction):
+        return value
+    try:
+        return str(value)
+    except ValueError:
+        raise ValueError(f'The result has more than {sys.get_int_max_str_digits()} digits, '
+                         f'the limit of the integer to string conversions.') from None
+
+
+def _is_small_exponent(value) -> bool:
+    """Check if a JSON argument is a small integer exponent
+
+    PRE : - value: a JSON argument
+    POST : value is an int, or the string of an int, of absolute value lower or equal to SMALL_EXPONENT
+    """
+    if isinstance(value, str) and len(value) <= 4:
+        try:
+            value = int(value)
+        except ValueError:
+            return False
+    return isinstance(value, int) and not isinstance(value, bool) and abs(value) <= SMALL_EXPONENT
+
+
+def _decode_arguments(name: str, arguments: list) -> list:
+    """Return the decoded arguments of an operation
+
+    PRE : - name: the name of an operation
+          - arguments: a list of JSON arguments
+    POST : the list of the arguments of the function of the operation
+    RAISES : - ValueError: the operation is unknown or the arguments don't match it
+    """
+    if name not in OPERATIONS:
+        raise ValueError(f'Unknown operation: {name!r}')
+    kinds = OPERATIONS[name][0]
+    if not isinstance(arguments, list):
+        raise ValueError('The arguments must be a list.')
+    if kinds == '*':
+        return [_decode(argument) for argument in arguments]
+    if len(arguments) != len(kinds):
+        raise ValueError(f'The operation {name!r} takes {len(kinds)} arguments.')
+
+    decoded = []
+    for kind, argument in zip(kinds, arguments):
+        if kind == 'i':
+            if not isinstance(argument, int) or isinstance(argument, bool):
+                raise ValueError(f'Invalid integer: {argument!r}')
+            decoded.append(argument)
+        else:
+            decoded.append(_decode(argument))
+    return decoded
+
+
+def evaluate(name: str, arguments: list):
+    """Evaluate an operation
+
+    This is the function run by the worker processes.
+
+    PRE : - name: the name of an operation
+          - arguments: a list of JSON arguments
+    POST : the JSON value of the result
+    RAISES : - ValueError, TypeError, ZeroDivisionError, OverflowError: the operation failed
+    """
+    return _encode(OPERATIONS[name][2](*_decode_arguments(name, arguments)))
+
+
+def _error(error: Exception) -> dict:
+    """Return the JSON value of an error
+
+    PRE : - error: an exception
+    POST : a dict of the type and of the message of the error
+    """
+    return {'type': type(error).__name__, 'message': str(error)}
+
+
+class FractionServer:
+    """Class representing an asyncio server of the operations of the fraction class
+
+    The requests of all the connections go through a queue. A batching task takes them
+    by micro-batches: the small requests are evaluated in the event loop, vectorized by
+    operation, and the large ones in a pool of worker processes.
+    """
+
+    def __init__(self, batch_size: int = BATCH_SIZE, batch_delay: float = BATCH_DELAY,
+                 large_size: int = LARGE_SIZE, workers: int = None):
+        """This builds a server, not started yet.
+
+        PRE : - batch_size: a positive int, the maximum number of requests of a micro-batch
+              - batch_delay: a positive float, the seconds waited for concurrent requests to batch
+              - large_size: a positive int, the size of the arguments of the requests offloaded to the workers,
+                            in characters or in number of fractions
+              - workers: the number of worker processes, or None for the number of processors
+        POST : set the following attributes :
+               - batch_size, batch_delay, large_size, workers : the parameters
+               - server : the asyncio server once started, None otherwise
+        """
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.large_size = large_size
+        self.workers = workers
+        self.server = None
+        self.__queue = None
+        self.__batcher = None
+        self.__connections = {}
+        self.__executor = None
+        self.__started = None
+        self.__counts = collections.Counter()
+        self.__latencies = collections.deque(maxlen=LATENCY_WINDOW)
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0, path: str = None):
+        """Start the server
+
+        PRE : - host, port: the address of the TCP server, port 0 for any free port
+              - path: the path of a Unix socket to serve instead, or None for TCP
+        POST : the server accepts connections; returns the server
+        """
+        self.__queue = asyncio.Queue()
+        self.__batcher = asyncio.create_task(self.__batch())
+        self.__started = time.perf_counter()
+        if path is None:
+            self.server = await asyncio.start_server(self.__handle, host, port)
+        else:
+            self.server = await asyncio.start_unix_server(self.__handle, path)
+        return self
+
+    @property
+    def address(self):
+        """Get the address of the server
+
+        PRE : the server is started
+        POST : the (host, port) tuple of the TCP server, or the path of the Unix socket
+        """
+        address = self.server.sockets[0].getsockname()
+        return address[:2] if isinstance(address, tuple) else address
+
+    async def close(self):
+        """Stop the server
+
+        PRE : -
+        POST : the connections are closed and the worker processes are shut down
+        """
+        if self.server is not None:
+            self.server.close()
+            for writer in self.__connections.values():
+                writer.close()
+            await asyncio.gather(*self.__connections, return_exceptions=True)
+            await self.server.wait_closed()
+            self.server = None
+        if self.__batcher is not None:
+            self.__batcher.cancel()
+            self.__batcher = None
+        if self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def metrics(self) -> dict:
+        """Return the metrics of the server
+
+        PRE : the server is started
+        POST : a dict of the counts of requests, errors, batches, vectorized and offloaded requests,
+               the uptime in seconds, the throughput in requests per second and the latency
+               percentiles in milliseconds over the last requests
+        """
+        uptime = time.perf_counter() - self.__started
+        latencies = sorted(self.__latencies)
+        metrics = dict.fromkeys(('requests', 'errors', 'batches', 'vectorized', 'offloaded'), 0)
+        metrics.update(self.__counts)
+        metrics['uptime'] = uptime
+        metrics['throughput'] = metrics['requests'] / uptime if uptime else 0.0
+        for percentile in (50, 95, 99):
+            key = f'latency_p{percentile}_ms'
+            metrics[key] = latencies[(len(latencies) - 1) * percentile // 100] * 1e3 if latencies else 0.0
+        metrics['latency_max_ms'] = latencies[-1] * 1e3 if latencies else 0.0
+        return metrics
+
+    # ------------------ Connections ------------------
+
+    async def __handle(self, reader, writer):
+        """Serve a connection
+
+        The requests are submitted as soon as they are read, and their responses are written
+        in order by a sending task.
+
+        PRE : - reader, writer: the streams of the connection
+        POST : the requests of the connection are answered until it is closed
+        """
+        handler = asyncio.current_task()
+        self.__connections[handler] = writer
+        responses = asyncio.Queue()
+        sender = asyncio.create_task(self.__send(responses, writer))
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    responses.put_nowait(self.__submit(line))
+        except ConnectionError:
+            pass
+        finally:
+            responses.put_nowait(None)
+            await sender
+            writer.close()
+            del self.__connections[handler]
+
+    @staticmethod
+    async def __send(responses, writer):
+        """Write the responses of a connection in order
+
+        PRE : - responses: a queue of futures of responses, ended by None
+              - writer: the stream of the connection
+        POST : the responses are written, one JSON object by line
+        """
+        while (future := await responses.get()) is not None:
+            writer.write(json.dumps(await future).encode() + b'\n')
+            if responses.empty():
+                try:
+                    await writer.drain()
+                except ConnectionError:
+                    return
+
+    def __submit(self, line: bytes):
+        """Submit a request to the batching task
+
+        PRE : - line: a request, as a JSON line
+        POST : a future of the response
+        """
+        future = asyncio.get_running_loop().create_future()
+        start = time.perf_counter()
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError('A request must be a JSON object.')
+        except ValueError as error:
+            self.__respond(future, None, start, error=_error(ValueError(str(error))))
+            return future
+
+        identifier = request.get('id')
+        name = request.get('op')
+        arguments = request.get('args', [])
+        if name == 'metrics':
+            self.__respond(future, identifier, start, result=self.metrics())
+        elif not isinstance(name, str) or name not in OPERATIONS:
+            self.__respond(future, identifier, start, error=_error(ValueError(f'Unknown operation: {name!r}')))
+        else:
+            self.__queue.put_nowait((name, arguments, identifier, future, start))
+        return future
+
+    def __respond(self, future, identifier, start: float, result=None, error: dict = None):
+        """Set the response of a request and measure its latency
+
+        PRE : - future: the future of the response
+              - identifier: the id of the request
+              - start: the time of the submission of the request
+              - result: the JSON value of the result
+              - error: the JSON value of the error, or None if the request succeeded
+        POST : the future holds the response
+        """
+        self.__latencies.append(time.perf_counter() - start)
+        self.__counts['requests'] += 1
+        response = {'id': identifier}
+        if error is None:
+            response['result'] = result
+        else:
+            self.__counts['errors'] += 1
+            response['error'] = error
+        if not future.done():
+            future.set_result(response)
+
+    # ------------------ Batches ------------------
+
+    def __is_large(self, name: str, arguments) -> bool:
+        """Check if a request has to be offloaded to the workers
+
+        The cost of a request is estimated from its arguments: their number and size, but also
+        the numbers they expand to, as the powers and the literals in exponent form, EX: "1e300000".
+
+        PRE : - name: the name of the operation of the request
+              - arguments: the JSON arguments of the request
+        POST : the arguments hold more than large_size fractions or characters, a literal in exponent form
+               or an int argument greater than large_size, or the request is a power by a large exponent
+        """
+        if not isinstance(arguments, list):
+            return False
+        if len(arguments) > self.large_size:
+            return True
+        if name == 'pow' and len(arguments) == 2 and not _is_small_exponent(arguments[1]):
+            return True
+        kinds = OPERATIONS[name][0]
+        size = 0
+        for index, argument in enumerate(arguments):
+            if isinstance(argument, str):
+                if 'e' in argument or 'E' in argument:
+                    return True
+                size += len(argument)
+            elif isinstance(argument, int):
+                # EX: the number of digits of to_decimal_string
+                if kinds[index:index + 1] == 'i' and abs(argument) > self.large_size:
+                    return True
+                size += argument.bit_length() // 3 + 1
+        return size > self.large_size
+
+    async def __batch(self):
+        """Take the requests by micro-batches and evaluate them
+
+        PRE : -
+        POST : runs until cancelled
+        """
+        while True:
+            batch = [await self.__queue.get()]
+            if self.__queue.qsize() < self.batch_size:
+                await asyncio.sleep(self.batch_delay)
+            while len(batch) < self.batch_size and not self.__queue.empty():
+                batch.append(self.__queue.get_nowait())
+            self.__counts['batches'] += 1
+
+            groups = collections.defaultdict(list)
+            for request in batch:
+                if self.__is_large(request[0], request[1]):
+                    self.__offload(request)
+                else:
+                    groups[request[0]].append(request)
+            for name, requests in groups.items():
+                self.__evaluate(name, requests)
+            # Let the connections read and write between two batches
+            await asyncio.sleep(0)
+
+    def __offload(self, request: tuple):
+        """Evaluate a request in a worker process
+
+        PRE : - request: a (name, arguments, id, future, start) tuple
+        POST : the response is set once the worker is done
+        """
+        name, arguments, identifier, future, start = request
+        if self.__executor is None:
+            self.__executor = ProcessPoolExecutor(self.workers)
+        self.__counts['offloaded'] += 1
+        work = asyncio.get_running_loop().run_in_executor(self.__executor, evaluate, name, arguments)
+
+        def done(work):
+            error = work.exception()
+            if error is None:
+                self.__respond(future, identifier, start, result=work.result())
+            else:
+                self.__respond(future, identifier, start, error=_error(error))
+
+        work.add_done_callback(done)
+
+    def __evaluate(self, name: str, requests: list):
+        """Evaluate small requests of the same operation
+
+        The requests are evaluated with arrays of fractions if there are enough of them,
+        and one by one if they can't or if an error occurs.
+
+        PRE : - name: the name of the operation
+              - requests: a list of (name, arguments, id, future, start) tuples
+        POST : the responses are set
+        """
+        if np is not None and name in _VECTORIZED and len(requests) >= VECTOR_MIN:
+            try:
+                columns = zip(*(_decode_arguments(name, arguments) for _, arguments, _, _, _ in requests))
+                results = _VECTORIZED[name](*(FractionArray.from_fractions(column) for column in columns))
+                if isinstance(results, FractionArray):
+                    results = [_encode(result) for result in results.to_fractions()]
+                else:
+                    results = [bool(result) for result in results]
+            except (ValueError, TypeError, ZeroDivisionError, OverflowError):
+                # Find the failing requests one by one
+                pass
+            else:
+                self.__counts['vectorized'] += len(requests)
+                for (_, _, identifier, future, start), result in zip(requests, results):
+                    self.__respond(future, identifier, start, result=result)
+                return
+
+        for _, arguments, identifier, future, start in requests:
+            try:
+                result = evaluate(name, arguments)
+            except (ValueError, TypeError, ZeroDivisionError, OverflowError) as error:
+                self.__respond(future, identifier, start, error=_error(error))
+            else:
+                self.__respond(future, identifier, start, result=result)
+
+
+class FractionClient:
+    """Class representing an asyncio client of a fraction server
+
+    The requests can be pipelined: several coroutines can await requests concurrently
+    on the same connection, their responses being matched by id.
+    """
+
+    def __init__(self, reader, writer):
+        """This builds a client on the streams of a connection.
+
+        PRE : - reader, writer: the streams of a connection to a fraction server
+        POST : set the following attributes :
+               - reader, writer : the streams
+        """
+        self.reader = reader
+        self.writer = writer
+        self.__identifiers = itertools.count()
+        self.__pending = {}
+        self.__receiver = asyncio.create_task(self.__receive())
+
+    @classmethod
+    async def connect(cls, host: str = '127.0.0.1', port: int = None, path: str = None):
+        """Connect to a fraction server
+
+        PRE : - host, port: the address of a TCP server
+              - path: the path of a Unix socket to connect to instead, or None for TCP
+        POST : the client of the connection
+        """
+        if path is None:
+            streams = await asyncio.open_connection(host, port)
+        else:
+            streams = await asyncio.open_unix_connection(path)
+        return cls(*streams)
+
+    async def __receive(self):
+        """Read the responses and resolve the pending requests
+
+        PRE : -
+        POST : runs until the connection is closed; the pending requests then fail with ConnectionError
+        """
+        try:
+            while line := await self.reader.readline():
+                response = json.loads(line)
+                future = self.__pending.pop(response['id'], None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self.__pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError('The connection to the server is closed.'))
+            self.__pending.clear()
+
+    async def request(self, operation: str, *arguments):
+        """Send a request and wait for its result
+
+        PRE : - operation: the name of an operation, or 'metrics'
+              - arguments: its arguments, as fractions, ints or strings
+        POST : the result; a fraction for the operations returning fractions
+        RAISES : - ValueError, TypeError, ZeroDivisionError, OverflowError: the operation failed on the server
+                 - ConnectionError: the connection is closed
+        """
+        identifier = next(self.__identifiers)
+        future = asyncio.get_running_loop().create_future()
+        self.__pending[identifier] = future
+        arguments = [str(argument) if isinstance(argument, Fraction) else argument for argument in arguments]
+        self.writer.write(json.dumps({'id': identifier, 'op': operation, 'args': arguments}).encode() + b'\n')
+        await self.writer.drain()
+
+        response = await future
+        if 'error' in response:
+            raise _ERRORS.get(response['error']['type'], ValueError)(response['error']['message'])
+        if operation in OPERATIONS and OPERATIONS[operation][1] == 'f':
+            return Fraction.from_string(response['result'])
+        return response['result']
+
+    async def close(self):
+        """Close the connection
+
+        PRE : -
+        POST : the connection is closed
+        """
+        self.writer.close()
+        await self.writer.wait_closed()
+        await self.__receiver
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+async def serve(host: str, port: int, path: str, **options):
+    """Run a fraction server forever
+
+    PRE : - host, port, path: the address of the server, as for FractionServer.start
+          - options: the parameters of FractionServer
+    POST : runs until cancelled
+    """
+    async with await FractionServer(**options).start(host, port, path) as server:
+        print(f'Serving fractions on {server.address}', file=sys.stderr)
+        await server.server.serve_forever()
+
+
+def main(arguments=None) -> int:
+    """Run the command line interface of the server
+
+    PRE : - arguments: a list of command line arguments, or None for sys.argv
+    POST : the exit status
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1', help='address of the TCP server')
+    parser.add_argument('--port', type=int, default=8765, help='port of the TCP server')
+    parser.add_argument('--unix', help='path of a Unix socket to serve instead of TCP')
+    parser.add_argument('--workers', type=int, help='number of worker processes')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='maximum size of a micro-batch')
+    parser.add_argument('--batch-delay', type=float, default=BATCH_DELAY, help='seconds waited to batch requests')
+    arguments = parser.parse_args(arguments)
+
+    try:
+        asyncio.run(serve(arguments.host, arguments.port, arguments.unix, workers=arguments.workers,
+                          batch_size=arguments.batch_size, batch_delay=arguments.batch_delay))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
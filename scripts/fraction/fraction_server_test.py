@@ -0,0 +1,125 @@
+"""
+Test the asyncio server of fractions.
+"""
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from fraction import Fraction, np
+from fraction_server import FractionClient, FractionServer
+
+
+class FractionServerTestCase(unittest.IsolatedAsyncioTestCase):
+    """
+    Test the protocol, the pipelining, the batching and the offloading of the server with an in-process client.
+    """
+
+    async def asyncSetUp(self):
+        self.server = await FractionServer(workers=1).start()
+        self.client = await FractionClient.connect(*self.server.address)
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.server.close()
+
+    async def test_server_operations(self):
+        """
+        Test the results and the errors of the operations.
+        """
+        self.assertEqual(await self.client.request('add', Fraction(1, 2), '1/3'), Fraction(5, 6), 'add 1/2 1/3')
+        self.assertEqual(await self.client.request('pow', '-2/3', 3), Fraction(-8, 27), 'pow -2/3 3')
+        self.assertEqual(await self.client.request('as_mixed_number', '7/2'), '3 + 1/2', 'as_mixed_number 7/2')
+        self.assertIs(await self.client.request('is_adjacent_to', '1/2', '2/3'), True, 'is_adjacent_to 1/2 2/3')
+        self.assertEqual(await self.client.request('limit_denominator', '0.3333', 10), Fraction(1, 3),
+                         'limit_denominator 0.3333 10')
+        self.assertEqual(await self.client.request('sum', '1/2', '1/3', 1), Fraction(11, 6), 'sum 1/2 1/3 1')
+
+        with self.assertRaises(ZeroDivisionError):
+            await self.client.request('truediv', 1, 0)
+        with self.assertRaises(ValueError):
+            await self.client.request('add', '1/2')
+        with self.assertRaises(ValueError):
+            await self.client.request('add', '1/2', 'a/b')
+        with self.assertRaises(ValueError):
+            await self.client.request('unknown', 1)
+
+    async def test_server_pipelining(self):
+        """
+        Test the concurrent requests on a connection, answered in order and batched.
+        """
+        results = await asyncio.gather(*(self.client.request('mul', Fraction(index, 7), Fraction(3, index + 1))
+                                         for index in range(500)))
+        self.assertEqual(results, [Fraction(index, 7) * Fraction(3, index + 1) for index in range(500)],
+                         'pipelined mul')
+
+        results = await asyncio.gather(*(self.client.request('truediv', index, index % 3) for index in range(60)),
+                                       return_exceptions=True)
+        self.assertEqual([isinstance(result, ZeroDivisionError) for result in results],
+                         [index % 3 == 0 for index in range(60)], 'pipelined truediv with errors')
+
+        metrics = await self.client.request('metrics')
+        self.assertEqual(metrics['requests'], 560, "metrics['requests']")
+        self.assertEqual(metrics['errors'], 20, "metrics['errors']")
+        self.assertLess(metrics['batches'], 560, "metrics['batches']")
+        if np is not None:
+            self.assertGreater(metrics['vectorized'], 0, "metrics['vectorized']")
+
+        # Batched requests whose terms overflow int64 in the arrays of fractions
+        denominators = [(2 ** 40 + index, 2 ** 40 + index + 1) for index in range(2 * 16)]
+        results = await asyncio.gather(*(self.client.request(name, Fraction(1, first), Fraction(1, second))
+                                         for name in ('add', 'sub') for first, second in denominators))
+        self.assertEqual(results, [operation(Fraction(1, first), Fraction(1, second))
+                                   for operation in (Fraction.__add__, Fraction.__sub__)
+                                   for first, second in denominators], 'pipelined add and sub of large terms')
+
+        # Raw protocol: the responses of a connection keep the order of its requests
+        reader, writer = await asyncio.open_connection(*self.server.address)
+        writer.write(b'{"id": "a", "op": "neg", "args": ["1/2"]}\nnot json\n{"op": "float", "args": [1]}\n')
+        await writer.drain()
+        responses = [json.loads(await reader.readline()) for _ in range(3)]
+        writer.close()
+        await writer.wait_closed()
+        self.assertEqual(responses[0], {'id': 'a', 'result': '-1/2'}, 'response to neg')
+        self.assertEqual(responses[1]['error']['type'], 'ValueError', 'response to invalid JSON')
+        self.assertEqual(responses[2], {'id': None, 'result': 1.0}, 'response to float')
+
+        # An invalid operation fails alone, the requests behind it are answered
+        reader, writer = await asyncio.open_connection(*self.server.address)
+        writer.write(b'{"id": 1, "op": [], "args": []}\n{"id": 2, "op": "neg", "args": [1]}\n')
+        await writer.drain()
+        responses = [json.loads(await reader.readline()) for _ in range(2)]
+        writer.close()
+        await writer.wait_closed()
+        self.assertEqual(responses[0]['error']['type'], 'ValueError', 'response to an unhashable op')
+        self.assertEqual(responses[1], {'id': 2, 'result': '-1/1'}, 'response after an unhashable op')
+
+    async def test_server_offloading(self):
+        """
+        Test the evaluation of large requests by the worker processes, and the Unix sockets.
+        """
+        self.server.large_size = 100
+        big = 3 ** 1000
+        self.assertEqual(await self.client.request('add', str(big), '1/2'), Fraction(2 * big + 1, 2), 'add 3**1000 1/2')
+        with self.assertRaises(ZeroDivisionError):
+            await self.client.request('truediv', str(big), 0 * big)
+        self.assertEqual((await self.client.request('metrics'))['offloaded'], 2, "metrics['offloaded']")
+
+        # Short requests of expensive operations are offloaded too
+        self.assertEqual(await self.client.request('pow', '3/7', 400), Fraction(3 ** 400, 7 ** 400), 'pow 3/7 400')
+        self.assertEqual(await self.client.request('add', '1e50', 1), Fraction(10 ** 50 + 1), 'add 1e50 1')
+        self.assertEqual(await self.client.request('pow', '3/7', 2), Fraction(9, 49), 'pow 3/7 2')
+        self.assertEqual((await self.client.request('metrics'))['offloaded'], 4, "metrics['offloaded']")
+        with self.assertRaisesRegex(ValueError, 'more than .* digits'):
+            await self.client.request('pow', '3/7', 20000)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'fraction.sock')
+            async with await FractionServer().start(path=path) as server:
+                self.assertEqual(server.address, path, 'server.address')
+                async with await FractionClient.connect(path=path) as client:
+                    self.assertEqual(await client.request('sub', '1/2', '1/3'), Fraction(1, 6), 'sub over a Unix socket')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,431 @@
+"""
+Compute exact statistics over streams of fractions.
+
+FractionStatistics accumulates the count, the sum and the sum of squares of the values in a
+single pass, as integers over a common denominator: adding a value is a few integer operations,
+without any reduction. The variance comes from the exact sum of squared deviations, so it needs
+no Welford-style correction, and two partial accumulators merge exactly for parallel use.
+
+The median and the quantiles are found by selection, without sorting: in memory with
+quickselect, or over a re-iterable stream in bounded memory with a few counting passes.
+"""
+import bisect
+import math
+import random
+
+from fraction import Fraction
+
+BUFFER_SIZE = 100000
+PIVOT_COUNT = 64
+
+
+def _terms(value) -> tuple:
+    """Return the terms of a value
+
+    PRE : - value: an int or a fraction
+    POST : the (numerator, denominator) tuple of the value
+    RAISES : - TypeError: value is nor an int or a fraction
+    """
+    if isinstance(value, int):
+        return value, 1
+    if isinstance(value, Fraction):
+        return value.numerator, value.denominator
+    raise TypeError(f'Unsupported value: {value!r}')
+
+
+class FractionStatistics:
+    """Class representing an accumulator of exact statistics over fractions
+
+    The sum is stored as an integer over the common denominator of the values, and the sum of squares
+    over its square. The common denominator is the lowest common multiple of the denominators seen.
+    """
+
+    __slots__ = ('__count', '__denominator', '__sum', '__sum_squares', '__min', '__max')
+
+    def __init__(self, values=()):
+        """This builds an accumulator of statistics.
+
+        PRE : - values: an iterable of ints or fractions
+        POST : set the following attributes :
+               - count : the number of values
+               - denominator : the common denominator of the values
+               - sum : the sum of the values scaled by the common denominator
+               - sum_squares : the sum of the squares of the values scaled by the common denominator
+               - min, max : the terms of the extreme values, None without value
+        RAISES : - TypeError: a value is nor an int or a fraction
+        """
+        self.__count = 0
+        self.__denominator = 1
+        self.__sum = 0
+        self.__sum_squares = 0
+        self.__min = None
+        self.__max = None
+        self.update(values)
+
+    def __rescale(self, denominator: int):
+        """Extend the common denominator to a multiple of a denominator
+
+        PRE : - denominator: a positive int
+        POST : the common denominator is divisible by denominator, the sums being scaled accordingly
+        """
+        factor = denominator // math.gcd(self.__denominator, denominator)
+        self.__denominator *= factor
+        self.__sum *= factor
+        self.__sum_squares *= factor * factor
+
+    def add(self, value):
+        """Add a value to the statistics
+
+        PRE : - value: an int or a fraction
+        POST : the statistics include value
+        RAISES : - TypeError: value is nor an int or a fraction
+        """
+        numerator, denominator = _terms(value)
+        if self.__denominator % denominator:
+            self.__rescale(denominator)
+        scaled = numerator * (self.__denominator // denominator)
+        self.__count += 1
+        self.__sum += scaled
+        self.__sum_squares += scaled * scaled
+        self.__merge_extremes((numerator, denominator), (numerator, denominator))
+
+    def update(self, values):
+        """Add values to the statistics
+
+        PRE : - values: an iterable of ints or fractions
+        POST : the statistics include the values
+        RAISES : - TypeError: a value is nor an int or a fraction
+        """
+        # Same as add, with the state in local variables
+        count, denominator, total, total_squares = self.__count, self.__denominator, self.__sum, self.__sum_squares
+        minimum = maximum = None
+        try:
+            for value in values:
+                if type(value) is Fraction:
+                    numerator, value_denominator = value.numerator, value.denominator
+                else:
+                    numerator, value_denominator = _terms(value)
+                if denominator % value_denominator:
+                    factor = value_denominator // math.gcd(denominator, value_denominator)
+                    denominator *= factor
+                    total *= factor
+                    total_squares *= factor * factor
+                scaled = numerator * (denominator // value_denominator)
+                count += 1
+                total += scaled
+                total_squares += scaled * scaled
+
+                if minimum is None:
+                    minimum = maximum = numerator, value_denominator
+                elif numerator * minimum[1] < minimum[0] * value_denominator:
+                    minimum = numerator, value_denominator
+                elif numerator * maximum[1] > maximum[0] * value_denominator:
+                    maximum = numerator, value_denominator
+        finally:
+            self.__count, self.__denominator, self.__sum, self.__sum_squares = count, denominator, total, total_squares
+            if minimum is not None:
+                self.__merge_extremes(minimum, maximum)
+
+    def merge(self, other):
+        """Merge the statistics of other values
+
+        PRE : - other: an accumulator of statistics, EX: computed by another process
+        POST : the statistics include the values of other; returns this accumulator
+        """
+        if other.__count == 0:
+            return self
+        if self.__denominator % other.__denominator:
+            self.__rescale(other.__denominator)
+        factor = self.__denominator // other.__denominator
+        self.__count += other.__count
+        self.__sum += other.__sum * factor
+        self.__sum_squares += other.__sum_squares * factor * factor
+
+        self.__merge_extremes(other.__min, other.__max)
+        return self
+
+    def __merge_extremes(self, minimum: tuple, maximum: tuple):
+        """Merge the extremes of other values
+
+        The extremes are compared by cross-multiplication of their positive denominators.
+
+        PRE : - minimum, maximum: the (numerator, denominator) tuples of the extremes of other values
+        POST : the extremes include minimum and maximum
+        """
+        if self.__min is None:
+            self.__min, self.__max = minimum, maximum
+        else:
+            if minimum[0] * self.__min[1] < self.__min[0] * minimum[1]:
+                self.__min = minimum
+            if maximum[0] * self.__max[1] > self.__max[0] * maximum[1]:
+                self.__max = maximum
+
+    def __repr__(self) -> str:
+        """Return the textual representation of the statistics
+
+        PRE : -
+        POST : the classname and the count, EX: <FractionStatistics: 3 values>
+        """
+        return f'<FractionStatistics: {self.__count} values>'
+
+    # ------------------ Statistics ------------------
+
+    @property
+    def count(self) -> int:
+        """Get the number of values
+
+        PRE : -
+        POST : the number of values added
+        """
+        return self.__count
+
+    @property
+    def sum(self) -> Fraction:
+        """Get the sum of the values
+
+        PRE : -
+        POST : the exact sum, 0 without value
+        """
+        return Fraction(self.__sum, self.__denominator)
+
+    @property
+    def mean(self) -> Fraction:
+        """Get the arithmetic mean of the values
+
+        PRE : -
+        POST : the exact mean
+        RAISES : - ValueError: there is no value
+        """
+        if not self.__count:
+            raise ValueError('mean requires at least one value')
+        return Fraction(self.__sum, self.__count * self.__denominator)
+
+    def __squared_deviations(self) -> int:
+        """Return the scaled sum of the squared deviations from the mean
+
+        PRE : -
+        POST : count * count * denominator**2 times the sum of the squared deviations
+        """
+        return self.__count * self.__sum_squares - self.__sum * self.__sum
+
+    @property
+    def variance(self) -> Fraction:
+        """Get the sample variance of the values
+
+        PRE : -
+        POST : the exact sample variance, as statistics.variance
+        RAISES : - ValueError: there are less than two values
+        """
+        if self.__count < 2:
+            raise ValueError('variance requires at least two values')
+        return Fraction(self.__squared_deviations(),
+                        self.__count * (self.__count - 1) * self.__denominator * self.__denominator)
+
+    @property
+    def pvariance(self) -> Fraction:
+        """Get the population variance of the values
+
+        PRE : -
+        POST : the exact population variance, as statistics.pvariance
+        RAISES : - ValueError: there is no value
+        """
+        if not self.__count:
+            raise ValueError('pvariance requires at least one value')
+        return Fraction(self.__squared_deviations(), (self.__count * self.__denominator) ** 2)
+
+    @property
+    def min(self) -> Fraction:
+        """Get the smallest value
+
+        PRE : -
+        POST : the smallest value
+        RAISES : - ValueError: there is no value
+        """
+        if self.__min is None:
+            raise ValueError('min requires at least one value')
+        return Fraction._from_reduced(*self.__min)
+
+    @property
+    def max(self) -> Fraction:
+        """Get the greatest value
+
+        PRE : -
+        POST : the greatest value
+        RAISES : - ValueError: there is no value
+        """
+        if self.__max is None:
+            raise ValueError('max requires at least one value')
+        return Fraction._from_reduced(*self.__max)
+
+
+# ------------------ Selection ------------------
+
+def select(values: list, rank: int, rng: random.Random = None):
+    """Return the value of some rank with quickselect
+
+    PRE : - values: a list of comparable values, not modified
+          - rank: an int between 0 and len(values) - 1
+          - rng: a random generator for the pivots, or None for a seeded one
+    POST : the value that would be at index rank if values were sorted, in expected linear time
+    RAISES : - IndexError: rank is out of the values
+    """
+    if not 0 <= rank < len(values):
+        raise IndexError('rank out of range')
+    rng = rng or random.Random(0)
+    while True:
+        pivot = values[rng.randrange(len(values))]
+        lower = [value for value in values if value < pivot]
+        if rank < len(lower):
+            values = lower
+            continue
+        equal = sum(1 for value in values if value == pivot)
+        if rank < len(lower) + equal:
+            return pivot
+        rank -= len(lower) + equal
+        values = [value for value in values if pivot < value]
+
+
+def select_stream(source, rank: int, buffer_size: int = BUFFER_SIZE, pivot_count: int = PIVOT_COUNT):
+    """Return the value of some rank of a stream, in bounded memory
+
+    Each pass over the stream counts the values between sorted pivots and keeps a sample of the values
+    of each gap between two pivots. The gap holding the rank gives the pivots of the next pass, until
+    its values fit in the buffer and are selected in memory. The pivots split the remaining values
+    about pivot_count ways, so few passes are needed.
+
+    PRE : - source: a re-iterable of comparable values, EX: a list or a file-backed iterable, giving the same
+                    values at each iteration
+          - rank: an int between 0 and the number of values - 1
+          - buffer_size: a positive int, the number of values selected in memory
+          - pivot_count: a positive int, the number of pivots of a pass
+    POST : the value that would be at index rank if the values were sorted;
+           at most buffer_size + pivot_count * (pivot_count + 1) values are held in memory
+    RAISES : - IndexError: rank is out of the values
+    """
+    rng = random.Random(0)
+    low = high = None
+    # Number of values strictly between low and high, unknown before the first pass
+    inside = None
+    pivots = None
+
+    while True:
+        if inside is not None and inside <= buffer_size:
+            buffer = [value for value in source if (low is None or low < value) and (high is None or value < high)]
+            return select(buffer, rank, rng)
+
+        if pivots is None:
+            # First pass: count the values and sample them
+            sample = []
+            inside = 0
+            for value in source:
+                inside += 1
+                if len(sample) < pivot_count:
+                    sample.append(value)
+                else:
+                    index = rng.randrange(inside)
+                    if index < pivot_count:
+                        sample[index] = value
+            if not 0 <= rank < inside:
+                raise IndexError('rank out of range')
+            pivots = sorted(set(sample))
+            continue
+
+        # Regions: 2*i for the gap before pivots[i], 2*i + 1 for the values equal to pivots[i]
+        counts = [0] * (2 * len(pivots) + 1)
+        seen = [0] * (len(pivots) + 1)
+        samples = [[] for _ in range(len(pivots) + 1)]
+        for value in source:
+            if (low is not None and not low < value) or (high is not None and not value < high):
+                continue
+            index = bisect.bisect_left(pivots, value)
+            if index < len(pivots) and pivots[index] == value:
+                counts[2 * index + 1] += 1
+                continue
+            counts[2 * index] += 1
+            seen[index] += 1
+            if len(samples[index]) < pivot_count:
+                samples[index].append(value)
+            else:
+                position = rng.randrange(seen[index])
+                if position < pivot_count:
+                    samples[index][position] = value
+
+        for region, count in enumerate(counts):
+            if rank < count:
+                break
+            rank -= count
+        index, equal = divmod(region, 2)
+        if equal:
+            return pivots[index]
+        low = pivots[index - 1] if index > 0 else low
+        high = pivots[index] if index < len(pivots) else high
+        inside = count
+        pivots = sorted(set(samples[index]))
+
+
+def _interpolate(source, position: Fraction, count: int, selector):
+    """Return the value at a fractional position of the sorted values
+
+    PRE : - source: the values
+          - position: a fraction between 0 and count - 1
+          - count: the number of values
+          - selector: a function selecting the value of some rank of source
+    POST : the fraction interpolating linearly the values of ranks floor(position) and ceil(position)
+    """
+    rank = position.numerator // position.denominator
+    lower = selector(source, rank)
+    weight = position - rank
+    if weight.is_zero():
+        return Fraction() + lower
+    return lower + (selector(source, rank + 1) - lower) * weight
+
+
+def _selector(source, buffer_size: int):
+    """Return the values of a source, their number and the selection function to use
+
+    A one-shot iterator can't be read in several passes: its values are kept in a list.
+
+    PRE : - source: a list of values, a re-iterable of values or an iterator
+          - buffer_size: a positive int
+    POST : a (source, count, selector) tuple
+    """
+    if iter(source) is source:
+        source = list(source)
+    if isinstance(source, list):
+        return source, len(source), select
+    count = sum(1 for _ in source)
+    if count <= buffer_size:
+        values = list(source)
+        return source, count, lambda _, rank: select(values, rank)
+    return source, count, lambda source, rank: select_stream(source, rank, buffer_size)
+
+
+def median(source, buffer_size: int = BUFFER_SIZE) -> Fraction:
+    """Return the exact median of values
+
+    PRE : - source: a list of ints or fractions, a re-iterable of them or an iterator, read in memory
+          - buffer_size: a positive int, the number of values selected in memory
+    POST : the fraction of the middle value, or the mean of the two middle values, as statistics.median
+    RAISES : - ValueError: there is no value
+    """
+    source, count, selector = _selector(source, buffer_size)
+    if not count:
+        raise ValueError('median requires at least one value')
+    return _interpolate(source, Fraction(count - 1, 2), count, selector)
+
+
+def quantiles(source, n: int = 4, buffer_size: int = BUFFER_SIZE) -> list:
+    """Return the exact cut points dividing values in intervals of equal probability
+
+    PRE : - source: a list of ints or fractions, a re-iterable of them or an iterator, read in memory
+          - n: an int greater than 1, the number of intervals
+          - buffer_size: a positive int, the number of values selected in memory
+    POST : the n - 1 fractions of the cut points, as statistics.quantiles with the inclusive method
+    RAISES : - ValueError: n is lower than 2, or there is no value
+    """
+    if n < 2:
+        raise ValueError('n must be at least 2')
+    source, count, selector = _selector(source, buffer_size)
+    if not count:
+        raise ValueError('quantiles requires at least one value')
+    return [_interpolate(source, Fraction(index * (count - 1), n), count, selector) for index in range(1, n)]
@@ -0,0 +1,103 @@
+"""
+Test the exact statistics over fractions.
+"""
+import fractions
+import pickle
+import random
+import statistics
+import unittest
+from fraction import Fraction
+from fraction_stats import FractionStatistics, median, quantiles, select, select_stream
+
+
+class Stream:
+    """
+    Re-iterable stream of values, as read again from a file at each pass.
+    """
+
+    def __init__(self, values):
+        self.values = values
+        self.passes = 0
+
+    def __iter__(self):
+        self.passes += 1
+        return iter(self.values)
+
+
+class FractionStatisticsTestCase(unittest.TestCase):
+    """
+    Test the statistics accumulator and the selection of the median and of the quantiles.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(2021)
+        cls.values = [Fraction(rng.randint(-50, 50), rng.randint(1, 12)) for _ in range(1001)]
+        cls.references = [fractions.Fraction(value.numerator, value.denominator) for value in cls.values]
+
+    def assertSameFraction(self, fraction, reference, message):
+        self.assertEqual((fraction.numerator, fraction.denominator), (reference.numerator, reference.denominator),
+                         message)
+
+    def test_fraction_statistics(self):
+        """
+        Test the count, the sum, the mean, the variances and the extremes against the statistics module.
+        """
+        accumulator = FractionStatistics(self.values)
+        self.assertEqual(accumulator.count, 1001, 'count')
+        self.assertSameFraction(accumulator.sum, sum(self.references), 'sum')
+        self.assertSameFraction(accumulator.mean, statistics.mean(self.references), 'mean')
+        self.assertSameFraction(accumulator.variance, statistics.variance(self.references), 'variance')
+        self.assertSameFraction(accumulator.pvariance, statistics.pvariance(self.references), 'pvariance')
+        self.assertEqual(accumulator.min, min(self.values), 'min')
+        self.assertEqual(accumulator.max, max(self.values), 'max')
+        self.assertEqual(repr(accumulator), '<FractionStatistics: 1001 values>', 'repr(...)')
+
+        single = FractionStatistics()
+        single.add(Fraction(-3, 4))
+        self.assertEqual((single.mean, single.pvariance, single.min, single.max),
+                         (Fraction(-3, 4), Fraction(0), Fraction(-3, 4), Fraction(-3, 4)), 'statistics of one value')
+        self.assertRaises(ValueError, lambda: single.variance)
+        self.assertRaises(ValueError, lambda: FractionStatistics().mean)
+        self.assertRaises(TypeError, FractionStatistics, [0.5])
+
+        # Partial statistics, as computed by several processes
+        partials = [pickle.loads(pickle.dumps(FractionStatistics(self.values[start:start + 300])))
+                    for start in range(0, 1001, 300)]
+        merged = FractionStatistics()
+        for partial in partials:
+            merged.merge(partial)
+        self.assertEqual((merged.count, merged.mean, merged.variance, merged.min, merged.max),
+                         (accumulator.count, accumulator.mean, accumulator.variance, accumulator.min,
+                          accumulator.max), 'merged statistics')
+
+    def test_fraction_selection(self):
+        """
+        Test the selection in memory and over streams, the median and the quantiles.
+        """
+        ordered = sorted(self.values)
+        for rank in (0, 1, 250, 500, 999, 1000):
+            self.assertEqual(select(self.values, rank), ordered[rank], f'select(values, {rank})')
+            self.assertEqual(select_stream(Stream(self.values), rank, buffer_size=40, pivot_count=8), ordered[rank],
+                             f'select_stream(values, {rank})')
+        self.assertRaises(IndexError, select, self.values, 1001)
+        self.assertRaises(IndexError, select_stream, Stream(self.values), -1)
+
+        stream = Stream(self.values)
+        self.assertSameFraction(median(stream, buffer_size=40), statistics.median(self.references), 'median(stream)')
+        self.assertLess(stream.passes, 10, 'passes of median(stream)')
+        self.assertSameFraction(median(self.values[:-1]), statistics.median(self.references[:-1]), 'median(even)')
+        self.assertEqual(quantiles(Stream(self.values), 10, buffer_size=40),
+                         [Fraction(value.numerator, value.denominator)
+                          for value in statistics.quantiles(self.references, n=10, method='inclusive')],
+                         'quantiles(stream, 10)')
+        self.assertEqual(quantiles([1, 2, 3, 4, 5]), [2, 3, 4], 'quantiles([1, 2, 3, 4, 5])')
+        self.assertEqual(repr(median([1, 2, 3])), repr(Fraction(2)), 'median([1, 2, 3])')
+        self.assertEqual(median(value for value in (3, 1, 4, 1, 5)), Fraction(3), 'median(generator)')
+        self.assertEqual(quantiles(iter([1, 2, 3, 4, 5]), 2), [Fraction(3)], 'quantiles(iterator, 2)')
+        self.assertRaises(ValueError, median, [])
+        self.assertRaises(ValueError, quantiles, self.values, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
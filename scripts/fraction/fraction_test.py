@@ -1,8 +1,16 @@
 """
 Test the fraction class.
 """
+import fractions
+import io
+import itertools
+import math
+import operator
+import pickle
 import unittest
-from fraction import Fraction
+from decimal import Decimal
+from fraction import Fraction, FractionArray, format_stats, iter_fractions, np, parallel_reduce, parse_many, \
+    write_fractions
 
 
 class FractionTestCase(unittest.TestCase):
@@ -44,6 +52,95 @@ class FractionTestCase(unittest.TestCase):
         with self.assertRaises(ZeroDivisionError, msg='Fraction(128, 0)'):
             Fraction(128, 0)
 
+    def test_fraction_init_big(self):
+        """
+        Test the constructor with values too big for floats and the compact layout of the fraction.
+        """
+        big = 10 ** 400
+        self.assertEqual(Fraction(big, -2 * big).numerator, -1, 'Fraction(10**400, -2 * 10**400).numerator')
+        self.assertEqual(Fraction(big, -2 * big).denominator, 2, 'Fraction(10**400, -2 * 10**400).denominator')
+        self.assertFalse(hasattr(self.fract1, '__dict__'), 'Fraction(6).__dict__')
+
+    def test_fraction_interning(self):
+        """
+        Test the sharing of the instances of common fractions.
+        """
+        self.assertIsNot(Fraction(1, 2), Fraction(1, 2), 'Fraction(1, 2) is Fraction(1, 2) without interning')
+
+        Fraction.enable_interning(max_size=2)
+        self.addCleanup(Fraction.disable_interning)
+        self.assertIs(Fraction(2, -4), Fraction(-1, 2), 'Fraction(2, -4) is Fraction(-1, 2)')
+        self.assertIs(Fraction(1, 3) + Fraction(1, 6), Fraction(1, 2), 'Fraction(1, 3) + Fraction(1, 6)')
+        self.assertIs(Fraction(1000, 3), Fraction(1000, 3), 'Fraction(1000, 3) is Fraction(1000, 3)')
+        self.assertEqual(Fraction(-125, 50), self.fract3, 'Fraction(-125, 50) with interning')
+
+        Fraction.clear_interning()
+        Fraction(1000, 3)
+        Fraction(1000, 3)
+        for value in range(1000, 1003):
+            Fraction(1, value)
+        stats = Fraction.interning_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 4), 'Fraction.interning_stats() hits and misses')
+        self.assertEqual(stats['cache_size'], 2, "Fraction.interning_stats()['cache_size']")
+
+        Fraction.disable_interning()
+        self.assertEqual(Fraction.interning_stats(), {}, 'Fraction.interning_stats() without interning')
+
+    def test_fraction_interning_outcomes(self):
+        """
+        Test that the same terms build equal fractions or raise the same errors with and without interning.
+        """
+        terms = [(1, 2), (2, -4), (True, 2), (1000, 3), (1.0, 2), (1, 2.0), (Decimal(1), 2), ('1', 2), (None, 1),
+                 (1, 0), (0, 0), (1.0, 0)]
+
+        def outcomes():
+            results = []
+            for numerator, denominator in terms:
+                try:
+                    fraction = Fraction(numerator, denominator)
+                except (TypeError, ZeroDivisionError) as error:
+                    results.append(type(error))
+                else:
+                    results.append((type(fraction.numerator), fraction.numerator, fraction.denominator))
+            return results
+
+        expected = outcomes()
+        Fraction.enable_interning()
+        self.addCleanup(Fraction.disable_interning)
+        self.assertEqual(outcomes(), expected, 'Fraction(numerator, denominator) with interning')
+        self.assertEqual(outcomes(), expected, 'Fraction(numerator, denominator) with the fractions interned')
+        self.assertEqual(expected[4:9], [TypeError] * 5, 'Fraction(numerator, denominator) with non-integer terms')
+        self.assertEqual(expected[9:], [ZeroDivisionError, ZeroDivisionError, TypeError],
+                         'Fraction(numerator, 0)')
+        if np is not None:
+            self.assertEqual(Fraction(np.int64(2), np.int64(-4)), Fraction(-1, 2),
+                             'Fraction(np.int64(2), np.int64(-4))')
+
+    def test_fraction_stats(self):
+        """
+        Test the instrumentation of the operations on fractions.
+        """
+        add = Fraction.__add__
+        Fraction.reset_stats()
+        with Fraction.instrumented():
+            self.assertIsNot(Fraction.__add__, add, 'Fraction.__add__ is instrumented')
+            total = Fraction(1, 3) + Fraction(1, 6)
+            abs(total - self.fract4)
+        self.assertIs(Fraction.__add__, add, 'Fraction.__add__ is restored')
+        self.assertEqual(total, Fraction(1, 2), 'Fraction(1, 3) + Fraction(1, 6) instrumented')
+
+        stats = Fraction.stats()
+        self.assertEqual(stats['calls'], {'__add__': 1, '__sub__': 1, '__abs__': 1},
+                         "Fraction.stats()['calls']")
+        self.assertEqual(stats['constructions']['__add__'], 1, "Fraction.stats()['constructions']['__add__']")
+        self.assertEqual(sum(stats['constructions'].values()), 5, "Fraction.stats()['constructions']")
+        self.assertEqual(stats['gcd_calls']['__add__'], 2, "Fraction.stats()['gcd_calls']['__add__']")
+        self.assertEqual(stats['denominator_bits']['__add__'], {2: 1}, "Fraction.stats()['denominator_bits']")
+        self.assertIn('calls __add__ 1\n', format_stats(stats), 'format_stats(Fraction.stats())')
+
+        Fraction.reset_stats()
+        self.assertEqual(Fraction.stats()['calls'], {}, 'Fraction.reset_stats()')
+
     def test_fraction_str(self):
         """
         Test the string method of the fraction class.
@@ -77,6 +174,81 @@ class FractionTestCase(unittest.TestCase):
         self.assertEqual(self.fract4.as_mixed_number(), '0 + 1/4', 'Fraction(-8, -32).as_mixed_number()')
         self.assertEqual(self.fract5.as_mixed_number(), '-1 + 1/4', 'Fraction(3, -4).as_mixed_number()')
 
+    def test_fraction_from_string(self):
+        """
+        Test to parse the textual representations of a fraction.
+        """
+        for fraction in (self.fract0, self.fract1, self.fract3, self.fract4, self.fract5):
+            self.assertEqual(Fraction.from_string(str(fraction)), fraction, f'Fraction.from_string({str(fraction)!r})')
+            self.assertEqual(Fraction.from_string(repr(fraction)), fraction, f'Fraction.from_string({fraction!r})')
+            self.assertEqual(Fraction.from_string(fraction.as_mixed_number()), fraction,
+                             f'Fraction.from_string({fraction.as_mixed_number()!r})')
+
+        self.assertEqual(Fraction.from_string(' -2.5 '), self.fract3, "Fraction.from_string(' -2.5 ')")
+        self.assertEqual(Fraction.from_string('25e-2'), self.fract4, "Fraction.from_string('25e-2')")
+        self.assertEqual(Fraction.from_string('6'), self.fract1, "Fraction.from_string('6')")
+
+        for text in ('', 'abc', '1/', '1.2.3', '1/0'):
+            with self.assertRaises(ValueError, msg=f'Fraction.from_string({text!r})'):
+                Fraction.from_string(text)
+
+    def test_parse_many(self):
+        """
+        Test to parse a file of fractions, one by line.
+        """
+        text = '-125/50\n\n<Fraction: 1/4>\r\n-1 + 1/4\n6\n'
+        expected = [self.fract3, self.fract4, self.fract5, self.fract1]
+        self.assertEqual(list(parse_many(io.StringIO(text), chunk_size=4)), expected, 'parse_many(text file)')
+        self.assertEqual(list(parse_many(io.BytesIO(text.encode()))), expected, 'parse_many(binary file)')
+        self.assertEqual(list(parse_many(io.StringIO(text), batch_size=3)), [([-5, 1, -3], [2, 4, 4]), ([6], [1])],
+                         'parse_many(text file, batch_size=3)')
+
+        with self.assertRaises(ValueError, msg='parse_many(invalid line 2)') as context:
+            list(parse_many(io.StringIO('1/2\n1/x\n')))
+        self.assertTrue(str(context.exception).startswith('Line 2:'), 'parse_many(invalid line 2) message')
+
+    def test_fraction_bytes(self):
+        """
+        Test the compact binary representation and the pickling of a fraction.
+        """
+        self.assertEqual(self.fract0.to_bytes(), b'\x00\x01', 'Fraction().to_bytes()')
+        self.assertEqual(self.fract3.to_bytes(), b'\x09\x02', 'Fraction(-125, 50).to_bytes()')
+        for fraction in (self.fract1, self.fract3, self.fract5, Fraction(-10 ** 100, 3 ** 50)):
+            self.assertEqual(Fraction.from_bytes(fraction.to_bytes()), fraction, f'Fraction.from_bytes({fraction!r})')
+            self.assertEqual(pickle.loads(pickle.dumps(fraction)), fraction, f'pickle of {fraction!r}')
+
+        for data in (b'\x09', b'\x09\x02\x00', b'\x09\x00', b'\x04\x04'):
+            with self.assertRaises(ValueError, msg=f'Fraction.from_bytes({data!r})'):
+                Fraction.from_bytes(data)
+        restore, _ = self.fract1.__reduce__()
+        self.assertRaises(ValueError, restore, 2, 4)
+        self.assertRaises(ValueError, restore, 1, -2)
+
+    def test_write_iter_fractions(self):
+        """
+        Test to write and read back blocks of fractions in the compact binary format.
+        """
+        fractions_list = [Fraction(k, 100) for k in range(-50, 50)] + [self.fract3, Fraction(10 ** 30, 7)]
+        for shared_denominator in (True, False):
+            file = io.BytesIO()
+            written = write_fractions(file, iter(fractions_list), block_size=16, shared_denominator=shared_denominator)
+            self.assertEqual(written, len(file.getvalue()), 'write_fractions(...) number of written bytes')
+            self.assertEqual(list(iter_fractions(file.getvalue())), fractions_list, 'iter_fractions(...)')
+
+        shared_size = write_fractions(io.BytesIO(), fractions_list[:100])
+        plain_size = write_fractions(io.BytesIO(), fractions_list[:100], shared_denominator=False)
+        self.assertLess(shared_size, plain_size, 'write_fractions(...) with a shared denominator')
+
+        with self.assertRaises(ValueError, msg='iter_fractions(truncated block)'):
+            list(iter_fractions(b'\x00\x02\x04\x01\x01'))
+        with self.assertRaises(ValueError, msg='iter_fractions(unreduced terms)'):
+            list(iter_fractions(b'\x00\x01\x02\x04\x04'))
+
+        # The lcm of distinct primes goes over the budget: the block is written without a shared denominator
+        primes = [Fraction(1, prime) for prime in (101, 103, 107, 109, 113, 127, 131)]
+        self.assertEqual(write_fractions(io.BytesIO(), primes), write_fractions(io.BytesIO(), primes,
+                         shared_denominator=False), 'write_fractions(...) over the lcm budget')
+
     def test_fraction_add(self):
         """
         Test to add of a fraction and another fraction or an integer.
@@ -86,8 +258,88 @@ class FractionTestCase(unittest.TestCase):
         self.assertEqual(self.fract4 + self.fract5, Fraction(-2, 4), 'Fraction(-8, -32) + Fraction(3, -4)')
         self.assertEqual(self.fract5 + 1, Fraction(1, 4), 'Fraction(3, -4) + 1')
 
-        with self.assertRaises(ValueError, msg='Fraction() + 1.2'):
-            self.fract0 + 1.2
+        with self.assertRaises(TypeError, msg="Fraction() + '1.2'"):
+            self.fract0 + '1.2'
+
+    def test_fraction_add_large_denominators(self):
+        """
+        Test long sums of fractions with shared and unrelated denominators.
+        """
+        harmonic = Fraction()
+        for k in range(1, 11):
+            harmonic = harmonic + Fraction(1, k)
+        self.assertEqual(harmonic, Fraction(7381, 2520), 'sum of Fraction(1, k) for k in 1..10')
+
+        self.assertEqual(Fraction(1, 6) + Fraction(1, 3), Fraction(1, 2), 'Fraction(1, 6) + Fraction(1, 3)')
+        self.assertEqual(Fraction(1, 6) - Fraction(1, 6), Fraction(), 'Fraction(1, 6) - Fraction(1, 6)')
+        self.assertEqual((Fraction(1, 6) + Fraction(1, 3)).denominator, 2, '(Fraction(1, 6) + Fraction(1, 3)).denominator')
+
+    def test_fraction_sum_prod(self):
+        """
+        Test the reductions of iterables of fractions and integers.
+        """
+        harmonic = Fraction()
+        for k in range(1, 2001):
+            harmonic = harmonic + Fraction(1, k)
+        self.assertEqual(Fraction.sum(Fraction(1, k) for k in range(1, 2001)), harmonic, 'Fraction.sum(1/k)')
+        self.assertEqual(Fraction.sum([self.fract3, 2, self.fract4]), Fraction(-1, 4), 'Fraction.sum([...])')
+        self.assertEqual(Fraction.sum([]), Fraction(), 'Fraction.sum([])')
+        self.assertEqual(sum([self.fract3, 2, self.fract4]), Fraction(-1, 4), 'sum([...])')
+
+        self.assertEqual(Fraction.prod(Fraction(k, k + 1) for k in range(1, 3001)), Fraction(1, 3001),
+                         'Fraction.prod(k/(k+1))')
+        self.assertEqual(Fraction.prod([self.fract3, -2, self.fract5]), Fraction(-15, 4), 'Fraction.prod([...])')
+        self.assertEqual(Fraction.prod([]), Fraction(1), 'Fraction.prod([])')
+
+        with self.assertRaises(ValueError, msg="Fraction.sum(['1.2'])"):
+            Fraction.sum(['1.2'])
+
+    def test_fraction_mixed_types(self):
+        """
+        Test the operators with integers, floats, stdlib fractions and decimals on both sides.
+        """
+        self.assertEqual(3 + self.fract5, Fraction(9, 4), '3 + Fraction(3, -4)')
+        self.assertEqual(3 - self.fract5, Fraction(15, 4), '3 - Fraction(3, -4)')
+        self.assertEqual(-2 * self.fract3, Fraction(5), '-2 * Fraction(-125, 50)')
+        self.assertEqual(1 / self.fract3, Fraction(-2, 5), '1 / Fraction(-125, 50)')
+        self.assertEqual(self.fract3 / -5, Fraction(1, 2), 'Fraction(-125, 50) / -5')
+        self.assertEqual(4 ** Fraction(1, 2), Fraction(2), '4 ** Fraction(1, 2)')
+
+        self.assertEqual(self.fract4 + 0.5, Fraction(3, 4), 'Fraction(-8, -32) + 0.5')
+        self.assertEqual(0.1 * self.fract1, Fraction(*(0.1).as_integer_ratio()) * 6, '0.1 * Fraction(6)')
+        self.assertEqual(self.fract4 - fractions.Fraction(1, 3), Fraction(-1, 12),
+                         'Fraction(-8, -32) - fractions.Fraction(1, 3)')
+        self.assertEqual(self.fract1 * Decimal('1.2'), Fraction(36, 5), "Fraction(6) * Decimal('1.2')")
+        self.assertTrue(self.fract4 < Decimal('0.3'), "Fraction(-8, -32) < Decimal('0.3')")
+        self.assertEqual(+self.fract3, self.fract3, '+Fraction(-125, 50)')
+
+        fraction = Fraction(1, 2)
+        fraction += 1
+        fraction *= Fraction(2, 3)
+        self.assertEqual(fraction, Fraction(1), 'Fraction(1, 2) += 1 *= Fraction(2, 3)')
+
+        with self.assertRaises(ValueError, msg="Fraction() + float('inf')"):
+            self.fract0 + float('inf')
+        with self.assertRaises(ZeroDivisionError, msg='1 / Fraction()'):
+            1 / self.fract0
+
+    def test_parallel_reduce(self):
+        """
+        Test the reduction of fractions by chunks in several processes.
+        """
+        terms = [Fraction(1, k * k + 1) for k in range(500)]
+        expected = Fraction.sum(terms)
+        for workers in (1, 2):
+            self.assertEqual(parallel_reduce(operator.add, iter(terms), workers=workers, chunk_size=37), expected,
+                             f'parallel_reduce(operator.add, ..., workers={workers})')
+
+        self.assertEqual(parallel_reduce(operator.mul, (Fraction(k, k + 1) for k in range(1, 100)), workers=1,
+                                         chunk_size=10), Fraction(1, 100), 'parallel_reduce(operator.mul, ...)')
+        self.assertEqual(parallel_reduce(operator.add, [], initial=self.fract3), self.fract3,
+                         'parallel_reduce(operator.add, [], initial=Fraction(-125, 50))')
+
+        with self.assertRaises(ValueError, msg='parallel_reduce(operator.add, [])'):
+            parallel_reduce(operator.add, [], workers=1)
 
     def test_fraction_sub(self):
         """
@@ -98,8 +350,8 @@ class FractionTestCase(unittest.TestCase):
         self.assertEqual(self.fract4 - self.fract5, Fraction(1, 1), 'Fraction(-8, -32) - Fraction(3, -4)')
         self.assertEqual(self.fract5 - 1, Fraction(-7, 4), 'Fraction(3, -4) - 1')
 
-        with self.assertRaises(ValueError, msg='Fraction() - 1.2'):
-            self.fract0 - 1.2
+        with self.assertRaises(TypeError, msg="Fraction() - '1.2'"):
+            self.fract0 - '1.2'
 
     def test_fraction_mul(self):
         """
@@ -110,8 +362,8 @@ class FractionTestCase(unittest.TestCase):
         self.assertEqual(self.fract4 * self.fract5, Fraction(-3, 16), 'Fraction(-8, -32) * Fraction(3, -4)')
         self.assertEqual(self.fract5 * 1, Fraction(3, -4), 'Fraction(3, -4) * 1')
 
-        with self.assertRaises(ValueError, msg='Fraction() * 1.2'):
-            self.fract0 * 1.2
+        with self.assertRaises(TypeError, msg="Fraction() * '1.2'"):
+            self.fract0 * '1.2'
 
     def test_fraction_truediv(self):
         """
@@ -124,16 +376,60 @@ class FractionTestCase(unittest.TestCase):
         with self.assertRaises(ZeroDivisionError, msg='Fraction(6) / Fraction(denominator=9)'):
             self.fract1 / self.fract2
 
-        with self.assertRaises(ValueError, msg='Fraction() / 1.2'):
-            self.fract0 / 1.2
+        with self.assertRaises(TypeError, msg="Fraction() / '1.2'"):
+            self.fract0 / '1.2'
 
     def test_fraction_pow(self):
         """
         Test to power a fraction with an integer.
         """
-        self.assertEqual(self.fract0 ** -1, Fraction(0, 1), 'Fraction() ** -1')
+        self.assertEqual(self.fract0 ** 3, Fraction(0, 1), 'Fraction() ** 3')
+        self.assertEqual(self.fract0 ** 0, Fraction(1), 'Fraction() ** 0')
         self.assertEqual(self.fract4 ** 3, Fraction(1, 64), 'Fraction(-8, -32) ** 3')
         self.assertEqual(self.fract5 ** -2, Fraction(16, 9), 'Fraction(3, -4) ** -2')
+        self.assertEqual(self.fract5 ** -3, Fraction(-64, 27), 'Fraction(3, -4) ** -3')
+
+        with self.assertRaises(ZeroDivisionError, msg='Fraction() ** -1'):
+            self.fract0 ** -1
+        with self.assertRaises(ZeroDivisionError, msg='Fraction() ** Fraction(-2, 3)'):
+            self.fract0 ** Fraction(-2, 3)
+
+    def test_fraction_pow_fraction(self):
+        """
+        Test to power a fraction with a fraction when the root is rational.
+        """
+        self.assertEqual(Fraction(-8, 27) ** Fraction(2, 3), Fraction(4, 9), 'Fraction(-8, 27) ** Fraction(2, 3)')
+        self.assertEqual(Fraction(16, 81) ** Fraction(-3, 4), Fraction(27, 8), 'Fraction(16, 81) ** Fraction(-3, 4)')
+        self.assertEqual(self.fract4 ** Fraction(-6, 3), Fraction(16), 'Fraction(-8, -32) ** Fraction(-6, 3)')
+        self.assertEqual(Fraction(3 ** 300, 7 ** 200) ** Fraction(1, 100), Fraction(27, 49),
+                         'Fraction(3**300, 7**200) ** Fraction(1, 100)')
+
+        with self.assertRaises(ValueError, msg='Fraction(2) ** Fraction(1, 2)'):
+            Fraction(2) ** Fraction(1, 2)
+        with self.assertRaises(ValueError, msg='Fraction(-125, 50) ** Fraction(1, 2)'):
+            self.fract3 ** Fraction(1, 2)
+
+    def test_fraction_pow_modulo(self):
+        """
+        Test the modular power of a fraction.
+        """
+        self.assertEqual(pow(self.fract5, 5, 7), (-3 ** 5) * pow(4 ** 5, -1, 7) % 7, 'pow(Fraction(3, -4), 5, 7)')
+        self.assertEqual(pow(self.fract3, -2, 11), pow(-5, -2, 11) * 4 % 11, 'pow(Fraction(-125, 50), -2, 11)')
+        self.assertEqual(pow(self.fract1, 0, 5), 1, 'pow(Fraction(6), 0, 5)')
+
+        with self.assertRaises(ValueError, msg='pow(Fraction(1, 7), 1, 7)'):
+            pow(Fraction(1, 7), 1, 7)
+
+    def test_fraction_pow_unsupported(self):
+        """
+        Test that the powers by unsupported exponents are left to the other operand.
+        """
+        self.assertIs(self.fract5.__pow__(0.5), NotImplemented, 'Fraction(3, -4).__pow__(0.5)')
+        self.assertIs(self.fract5.__pow__(Fraction(1), 7), NotImplemented, 'Fraction(3, -4).__pow__(Fraction(1), 7)')
+        with self.assertRaises(TypeError, msg="Fraction(3, -4) ** '2'"):
+            self.fract5 ** '2'
+        with self.assertRaises(TypeError, msg='pow(Fraction(3, -4), 2.0, 7)'):
+            pow(self.fract5, 2.0, 7)
 
     def test_fraction_float(self):
         """
@@ -146,6 +442,32 @@ class FractionTestCase(unittest.TestCase):
         self.assertEqual(float(self.fract4), 1/4, 'float(Fraction(-8, -32))')
         self.assertEqual(float(self.fract5), -3/4, 'float(Fraction(3, -4))')
 
+    def test_fraction_integer_conversions(self):
+        """
+        Test the truth value, the integer conversions and the rounding of fractions against the standard library.
+        """
+        terms = [(0, 1), (6, 1), (-6, 1), (7, 2), (-7, 2), (5, 2), (-5, 2), (1, 3), (-1, 3), (2, 3), (-2, 3),
+                 (-125, 50), (1234567, 1000), (-1234567, 1000), (3 ** 100 + 1, 2), (-(3 ** 100), 7 ** 40)]
+        for numerator, denominator in terms:
+            fraction = Fraction(numerator, denominator)
+            reference = fractions.Fraction(numerator, denominator)
+            message = f'Fraction({numerator}, {denominator})'
+            self.assertEqual(bool(fraction), bool(reference), f'bool({message})')
+            self.assertEqual(int(fraction), int(reference), f'int({message})')
+            self.assertEqual(math.trunc(fraction), math.trunc(reference), f'math.trunc({message})')
+            self.assertEqual(math.floor(fraction), math.floor(reference), f'math.floor({message})')
+            self.assertEqual(math.ceil(fraction), math.ceil(reference), f'math.ceil({message})')
+            self.assertEqual(round(fraction), round(reference), f'round({message})')
+            self.assertIsInstance(round(fraction), int, f'round({message}) is an int')
+            for ndigits in (-2, -1, 0, 1, 2, 5):
+                rounded = round(reference, ndigits)
+                self.assertEqual(round(fraction, ndigits), Fraction(rounded.numerator, rounded.denominator),
+                                 f'round({message}, {ndigits})')
+                self.assertIsInstance(round(fraction, ndigits), Fraction, f'round({message}, {ndigits}) is a fraction')
+
+        self.assertFalse(self.fract2, 'Fraction(denominator=9) is false')
+        self.assertTrue(self.fract5, 'Fraction(3, -4) is true')
+
     def test_fraction_abs(self):
         """
         Test the absolute value of a fraction.
@@ -157,6 +479,14 @@ class FractionTestCase(unittest.TestCase):
         self.assertEqual(abs(self.fract4), Fraction(8, 32), 'abs(Fraction(-8, -32))')
         self.assertEqual(abs(self.fract5), Fraction(3, 4), 'abs(Fraction(3, -4))')
 
+    def test_fraction_neg(self):
+        """
+        Test the opposite of a fraction.
+        """
+        self.assertEqual(-self.fract0, Fraction(), '-Fraction()')
+        self.assertEqual(-self.fract3, Fraction(5, 2), '-Fraction(-125, 50)')
+        self.assertEqual(-self.fract4, Fraction(-1, 4), '-Fraction(-8, -32)')
+
     def test_fraction_eq(self):
         """
         Test if the fraction is equal to another fraction, a float or an integer.
@@ -200,6 +530,36 @@ class FractionTestCase(unittest.TestCase):
         self.assertFalse(self.fract1 <= self.fract3, 'Fraction(6) <= Fraction(-125, 50)')
         self.assertFalse(self.fract4 <= self.fract5, 'Fraction(-8, -32) <= Fraction(3, -4)')
 
+    def test_fraction_compare_exact(self):
+        """
+        Test the exact comparison of fractions too close for floats, integers and floats.
+        """
+        big = 2 ** 60
+        self.assertTrue(Fraction(big + 1, big) > Fraction(big + 2, big + 1), 'Fraction(2**60 + 1, 2**60) > ...')
+        self.assertTrue(Fraction(big, 3) != Fraction(big + 1, 3), 'Fraction(2**60, 3) != Fraction(2**60 + 1, 3)')
+        self.assertTrue(Fraction(1, 3) < Fraction(2, 3), 'Fraction(1, 3) < Fraction(2, 3)')
+
+        self.assertTrue(self.fract1 == 6, 'Fraction(6) == 6')
+        self.assertTrue(self.fract3 < -2, 'Fraction(-125, 50) < -2')
+        self.assertTrue(self.fract3 == -2.5, 'Fraction(-125, 50) == -2.5')
+        self.assertTrue(self.fract4 <= 0.25, 'Fraction(-8, -32) <= 0.25')
+        self.assertTrue(self.fract5 > float('-inf'), "Fraction(3, -4) > float('-inf')")
+
+        self.assertFalse(Fraction(1, 3) == 1 / 3, 'Fraction(1, 3) == 1 / 3')
+        self.assertFalse(self.fract0 == float('nan'), "Fraction() == float('nan')")
+        self.assertFalse(self.fract0 == '0/1', "Fraction() == '0/1'")
+
+    def test_fraction_hash(self):
+        """
+        Test the hash of a fraction, consistent with integers and floats of same value.
+        """
+        self.assertEqual(hash(self.fract1), hash(6), 'hash(Fraction(6))')
+        self.assertEqual(hash(self.fract3), hash(-2.5), 'hash(Fraction(-125, 50))')
+        self.assertEqual(hash(self.fract0), hash(self.fract2), 'hash(Fraction()) == hash(Fraction(denominator=9))')
+        self.assertEqual(len({self.fract0, self.fract2, self.fract4, Fraction(2, 8)}), 2, 'set of fractions')
+        self.assertEqual(sorted([self.fract1, self.fract3, self.fract4, self.fract5]),
+                         [self.fract3, self.fract5, self.fract4, self.fract1], 'sorted fractions')
+
     def test_fraction_is_zero(self):
         """
         Test if the value of the fraction is null.
@@ -258,6 +618,161 @@ class FractionTestCase(unittest.TestCase):
         self.assertFalse(self.fract1.is_adjacent_to(self.fract2), 'Fraction(6).is_adjacent_to(Fraction(denominator=9))')
         self.assertFalse(self.fract0.is_adjacent_to(self.fract3), 'Fraction().is_adjacent_to(Fraction(-125, 50))')
 
+    def test_fraction_continued_fraction(self):
+        """
+        Test the continued fraction expansion of a fraction and its convergents.
+        """
+        self.assertEqual(list(Fraction(355, 113).continued_fraction()), [3, 7, 16],
+                         'Fraction(355, 113).continued_fraction()')
+        self.assertEqual(list(self.fract3.continued_fraction()), [-3, 2], 'Fraction(-125, 50).continued_fraction()')
+        self.assertEqual(list(Fraction(355, 113).convergents()), [Fraction(3), Fraction(22, 7), Fraction(355, 113)],
+                         'Fraction(355, 113).convergents()')
+        self.assertEqual(list(self.fract0.convergents()), [Fraction()], 'Fraction().convergents()')
+
+    def test_fraction_limit_denominator(self):
+        """
+        Test the closest fraction with a bounded denominator.
+        """
+        pi = Fraction(314159265358979, 100000000000000)
+        self.assertEqual(pi.limit_denominator(10), Fraction(22, 7), 'pi.limit_denominator(10)')
+        self.assertEqual(pi.limit_denominator(1000), Fraction(355, 113), 'pi.limit_denominator(1000)')
+        self.assertEqual((-pi).limit_denominator(100), Fraction(-311, 99), '(-pi).limit_denominator(100)')
+        self.assertEqual(Fraction(1, 4).limit_denominator(3), Fraction(1, 3), 'Fraction(1, 4).limit_denominator(3)')
+        self.assertIs(self.fract3.limit_denominator(2), self.fract3, 'Fraction(-125, 50).limit_denominator(2)')
+
+        with self.assertRaises(ValueError, msg='Fraction(1, 3).limit_denominator(0)'):
+            Fraction(1, 3).limit_denominator(0)
+
+    def test_fraction_bounded_denominator(self):
+        """
+        Test the bounding of the denominator of the results of the operators.
+        """
+        with Fraction.bounded_denominator(100):
+            total = Fraction()
+            for k in range(1, 50):
+                total += Fraction(1, k)
+                self.assertLessEqual(total.denominator, 100, 'sum of Fraction(1, k) bounded by 100')
+            self.assertEqual(Fraction(1, 3) * Fraction(1, 70), Fraction(1, 210).limit_denominator(100),
+                             'Fraction(1, 3) * Fraction(1, 70) bounded by 100')
+        self.assertEqual(Fraction(1, 3) * Fraction(1, 70), Fraction(1, 210), 'Fraction(1, 3) * Fraction(1, 70)')
+
+        # Only the results of the operators are bounded, the rebuilt values keep their exact terms
+        exact = Fraction(1, 101)
+        data, pickled = exact.to_bytes(), pickle.dumps(exact)
+        with Fraction.bounded_denominator(100):
+            self.assertEqual(pickle.loads(pickled).denominator, 101, 'pickle.loads(...) in a bounded context')
+            self.assertEqual(Fraction.from_bytes(data).denominator, 101, 'from_bytes(...) in a bounded context')
+            self.assertEqual(next(parse_many(io.StringIO('1/101\n'))).denominator, 101, 'parse_many(...) bounded')
+            self.assertEqual((exact + 0).denominator, 100, 'Fraction(1, 101) + 0 in a bounded context')
+
+    def test_fraction_digits(self):
+        """
+        Test the lazy digits of the expansion of a fraction in some base.
+        """
+        self.assertEqual(list(itertools.islice(Fraction(1, 7).digits(), 8)), [1, 4, 2, 8, 5, 7, 1, 4],
+                         'Fraction(1, 7).digits()')
+        self.assertEqual(list(self.fract3.digits()), [5], 'Fraction(-125, 50).digits()')
+        self.assertEqual(list(Fraction(5, 8).digits(2)), [1, 0, 1], 'Fraction(5, 8).digits(2)')
+        self.assertEqual(list(self.fract1.digits()), [], 'Fraction(6).digits()')
+
+        with self.assertRaises(ValueError, msg='Fraction(1, 3).digits(1)'):
+            next(Fraction(1, 3).digits(1))
+
+    def test_fraction_to_decimal_string(self):
+        """
+        Test the decimal expansion of a fraction with its repeating part.
+        """
+        self.assertEqual(Fraction(1, 6).to_decimal_string(), '0.1(6)', 'Fraction(1, 6).to_decimal_string()')
+        self.assertEqual(Fraction(-22, 7).to_decimal_string(), '-3.(142857)', 'Fraction(-22, 7).to_decimal_string()')
+        self.assertEqual(Fraction(1, 12).to_decimal_string(), '0.08(3)', 'Fraction(1, 12).to_decimal_string()')
+        self.assertEqual(self.fract3.to_decimal_string(), '-2.5', 'Fraction(-125, 50).to_decimal_string()')
+        self.assertEqual(self.fract1.to_decimal_string(), '6', 'Fraction(6).to_decimal_string()')
+        self.assertEqual(Fraction(1, 97).to_decimal_string(6), '0.010309...', 'Fraction(1, 97).to_decimal_string(6)')
+        self.assertEqual(Fraction(1, 7).to_decimal_string(6), '0.(142857)', 'Fraction(1, 7).to_decimal_string(6)')
+
+
+@unittest.skipIf(np is None, 'NumPy is not installed')
+class FractionArrayTestCase(unittest.TestCase):
+    """
+    Test the vectorized operations of the array of fractions against the fraction class.
+    """
+
+    fractions1 = [Fraction(), Fraction(6), Fraction(-125, 50), Fraction(-8, -32), Fraction(3, -4)]
+    fractions2 = [Fraction(1, 3), Fraction(-7, 2), Fraction(5, 4), Fraction(2 ** 70, 3), Fraction(-9, 4)]
+
+    def setUp(self):
+        self.array1 = FractionArray.from_fractions(self.fractions1)
+        self.array2 = FractionArray.from_fractions(self.fractions2)
+
+    def test_fraction_array_init(self):
+        """
+        Test the constructor and the conversions of the array of fractions.
+        """
+        array = FractionArray([0, 6, -125, -8, 3], [9, 1, 50, -32, -4])
+        self.assertEqual(array.to_fractions(), self.fractions1, 'FractionArray(...).to_fractions()')
+        self.assertEqual(list(array.denominators), [1, 1, 2, 4, 4], 'FractionArray(...).denominators')
+        self.assertEqual(array[2], Fraction(-5, 2), 'FractionArray(...)[2]')
+        self.assertEqual(len(array[1:3]), 2, 'len(FractionArray(...)[1:3])')
+        self.assertEqual(str(array[3:]), '[1/4, -3/4]', 'str(FractionArray(...)[3:])')
+
+        with self.assertRaises(ZeroDivisionError, msg='FractionArray([1, 2], [1, 0])'):
+            FractionArray([1, 2], [1, 0])
+
+    def test_fraction_array_operators(self):
+        """
+        Test the elementwise operators of the array of fractions, including int64 overflows.
+        """
+        pairs = list(zip(self.fractions1, self.fractions2))
+        self.assertEqual((self.array1 + self.array2).to_fractions(), [a + b for a, b in pairs], 'array1 + array2')
+        self.assertEqual((self.array1 - self.array2).to_fractions(), [a - b for a, b in pairs], 'array1 - array2')
+        self.assertEqual((self.array1 * self.array2).to_fractions(), [a * b for a, b in pairs], 'array1 * array2')
+        self.assertEqual((self.array1 / self.array2).to_fractions(), [a / b for a, b in pairs], 'array1 / array2')
+        self.assertEqual((self.array1 + 1).to_fractions(), [a + 1 for a in self.fractions1], 'array1 + 1')
+        self.assertEqual((self.array2 ** -3).to_fractions(), [a ** -3 for a in self.fractions2], 'array2 ** -3')
+        self.assertEqual((self.array1 ** 2).to_fractions(), [a ** 2 for a in self.fractions1], 'array1 ** 2')
+        self.assertEqual(abs(self.array1).to_fractions(), [abs(a) for a in self.fractions1], 'abs(array1)')
+
+        with self.assertRaises(ZeroDivisionError, msg='array2 / array1'):
+            self.array2 / self.array1
+        with self.assertRaises(ZeroDivisionError, msg='array1 ** -1'):
+            self.array1 ** -1
+
+        # The product of the denominators overflows int64 while the cross-products of the numerators fit
+        denominators1 = [2 ** 40, 3 * 2 ** 33, 10 ** 12 + 39]
+        denominators2 = [2 ** 40 + 1, 5 * 2 ** 33, 10 ** 12 + 61]
+        array1, array2 = FractionArray([1, 1, -7], denominators1), FractionArray([1, 1, 5], denominators2)
+        expected = [Fraction(1, 2 ** 40) + Fraction(1, 2 ** 40 + 1),
+                    Fraction(1, 3 * 2 ** 33) + Fraction(1, 5 * 2 ** 33),
+                    Fraction(-7, 10 ** 12 + 39) + Fraction(5, 10 ** 12 + 61)]
+        self.assertEqual((array1 + array2).to_fractions(), expected, 'array1 + array2 with large denominators')
+        self.assertEqual((array1 - -array2).to_fractions(), expected, 'array1 - -array2 with large denominators')
+
+    def test_fraction_array_comparisons(self):
+        """
+        Test the elementwise comparisons and the properties checking of the array of fractions.
+        """
+        pairs = list(zip(self.fractions1, self.fractions2))
+        self.assertEqual(list(self.array1 < self.array2), [a < b for a, b in pairs], 'array1 < array2')
+        self.assertEqual(list(self.array1 >= self.array2), [a >= b for a, b in pairs], 'array1 >= array2')
+        self.assertEqual(list(self.array1 == Fraction(6)), [a == 6 for a in self.fractions1], 'array1 == 6')
+        self.assertEqual(list(self.array1.is_zero()), [a.is_zero() for a in self.fractions1], 'array1.is_zero()')
+        self.assertEqual(list(self.array1.is_integer()), [a.is_integer() for a in self.fractions1],
+                         'array1.is_integer()')
+        self.assertEqual(list(self.array1.is_proper()), [a.is_proper() for a in self.fractions1],
+                         'array1.is_proper()')
+        self.assertEqual(list(self.array1.is_unit()), [a.is_unit() for a in self.fractions1], 'array1.is_unit()')
+
+    def test_fraction_array_reductions(self):
+        """
+        Test the reductions of the array of fractions.
+        """
+        self.assertEqual(self.array2.sum(), Fraction(2 ** 70 + 1, 3) - Fraction(9, 2), 'array2.sum()')
+        self.assertEqual(self.array2.prod(), Fraction(315 * 2 ** 70, 288), 'array2.prod()')
+        self.assertEqual(self.array1.min(), Fraction(-5, 2), 'array1.min()')
+        self.assertEqual(self.array2.max(), Fraction(2 ** 70, 3), 'array2.max()')
+        self.assertEqual(FractionArray([]).sum(), Fraction(), 'FractionArray([]).sum()')
+        self.assertEqual(FractionArray([]).prod(), Fraction(1), 'FractionArray([]).prod()')
+
 
 if __name__ == "__main__":
     unittest.main()